@@ -0,0 +1,40 @@
+"""tramitacao sequencia unica
+
+Revision ID: 3f9a1c2d7e10
+Revises: 828b077002b1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7e10'
+down_revision: Union[str, Sequence[str], None] = '828b077002b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remove duplicatas eventuais antes de criar a constraint (mantém o menor id)
+    op.execute(
+        """
+        DELETE FROM tramitacoes t
+        USING tramitacoes d
+        WHERE t.proposicao_id = d.proposicao_id
+          AND t.sequencia = d.sequencia
+          AND t.id > d.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_tramitacao_sequencia', 'tramitacoes', ['proposicao_id', 'sequencia']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_tramitacao_sequencia', 'tramitacoes', type_='unique')
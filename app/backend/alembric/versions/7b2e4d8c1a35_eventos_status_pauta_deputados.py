@@ -0,0 +1,66 @@
+"""eventos status, pauta e deputados
+
+Revision ID: 7b2e4d8c1a35
+Revises: 3f9a1c2d7e10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4d8c1a35'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d7e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for coluna in ('detalhado', 'participantes_importados', 'pauta_importada', 'votacoes_importadas'):
+        op.add_column('eventos', sa.Column(coluna, sa.Boolean(), server_default='false', nullable=False))
+    op.create_index(op.f('ix_eventos_detalhado'), 'eventos', ['detalhado'], unique=False)
+
+    op.create_table('eventos_deputados',
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['evento_id'], ['eventos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('evento_id', 'politico_id')
+    )
+    op.create_index(op.f('ix_eventos_deputados_politico_id'), 'eventos_deputados', ['politico_id'], unique=False)
+
+    op.create_table('eventos_pauta',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('ordem', sa.Integer(), nullable=True),
+    sa.Column('topico', sa.Text(), nullable=True),
+    sa.Column('regime', sa.String(length=150), nullable=True),
+    sa.Column('situacao_item', sa.Text(), nullable=True),
+    sa.Column('id_camara_proposicao', sa.Integer(), nullable=True),
+    sa.Column('proposicao_id', sa.Integer(), nullable=True),
+    sa.Column('uri_votacao', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['evento_id'], ['eventos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['proposicao_id'], ['proposicoes.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('evento_id', 'ordem', 'id_camara_proposicao', name='uq_evento_pauta_item', postgresql_nulls_not_distinct=True)
+    )
+    op.create_index(op.f('ix_eventos_pauta_evento_id'), 'eventos_pauta', ['evento_id'], unique=False)
+    op.create_index(op.f('ix_eventos_pauta_id_camara_proposicao'), 'eventos_pauta', ['id_camara_proposicao'], unique=False)
+    op.create_index(op.f('ix_eventos_pauta_proposicao_id'), 'eventos_pauta', ['proposicao_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_eventos_pauta_proposicao_id'), table_name='eventos_pauta')
+    op.drop_index(op.f('ix_eventos_pauta_id_camara_proposicao'), table_name='eventos_pauta')
+    op.drop_index(op.f('ix_eventos_pauta_evento_id'), table_name='eventos_pauta')
+    op.drop_table('eventos_pauta')
+    op.drop_index(op.f('ix_eventos_deputados_politico_id'), table_name='eventos_deputados')
+    op.drop_table('eventos_deputados')
+    op.drop_index(op.f('ix_eventos_detalhado'), table_name='eventos')
+    for coluna in ('votacoes_importadas', 'pauta_importada', 'participantes_importados', 'detalhado'):
+        op.drop_column('eventos', coluna)
@@ -0,0 +1,93 @@
+"""votacao placar
+
+Revision ID: a2f6c8d4e0b9
+Revises: f8d2b5a1c7e4
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f6c8d4e0b9'
+down_revision: Union[str, Sequence[str], None] = 'f8d2b5a1c7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('votacoes', sa.Column('placar_sim', sa.Integer(), nullable=True))
+    op.add_column('votacoes', sa.Column('placar_nao', sa.Integer(), nullable=True))
+    op.add_column('votacoes', sa.Column('placar_abstencao', sa.Integer(), nullable=True))
+    op.add_column('votacoes', sa.Column('placar_obstrucao', sa.Integer(), nullable=True))
+    op.add_column('votacoes', sa.Column('placar_outros', sa.Integer(), nullable=True))
+    op.add_column('votacoes', sa.Column('placar_total', sa.Integer(), nullable=True))
+    op.create_table('votacao_placar',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('votacao_id', sa.Integer(), nullable=False),
+    sa.Column('grupo', sa.String(length=10), nullable=False),
+    sa.Column('chave', sa.String(length=30), nullable=True),
+    sa.Column('sim', sa.Integer(), nullable=False),
+    sa.Column('nao', sa.Integer(), nullable=False),
+    sa.Column('abstencao', sa.Integer(), nullable=False),
+    sa.Column('obstrucao', sa.Integer(), nullable=False),
+    sa.Column('outros', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['votacao_id'], ['votacoes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_votacao_placar_votacao_id'), 'votacao_placar', ['votacao_id'], unique=False)
+    # Placar das votações já importadas (mesmas contagens de db_upsert.atualizar_placar):
+    # a importação só calcula o das votações cujos votos chegam depois
+    op.execute(
+        """
+        INSERT INTO votacao_placar (votacao_id, grupo, chave, sim, nao, abstencao, obstrucao, outros, total)
+        SELECT votacao_id,
+               CASE WHEN GROUPING(sigla_partido) = 0 THEN 'partido' ELSE 'uf' END,
+               CASE WHEN GROUPING(sigla_partido) = 0 THEN sigla_partido ELSE sigla_uf END,
+               count(id) FILTER (WHERE tipo_voto = 'Sim'),
+               count(id) FILTER (WHERE tipo_voto = 'Não'),
+               count(id) FILTER (WHERE tipo_voto = 'Abstenção'),
+               count(id) FILTER (WHERE tipo_voto = 'Obstrução'),
+               count(id) FILTER (WHERE tipo_voto IS NULL OR tipo_voto NOT IN ('Sim', 'Não', 'Abstenção', 'Obstrução')),
+               count(id)
+        FROM votos
+        GROUP BY GROUPING SETS ((votacao_id, sigla_partido), (votacao_id, sigla_uf))
+        """
+    )
+    op.execute(
+        """
+        UPDATE votacoes v
+        SET placar_sim = g.sim, placar_nao = g.nao, placar_abstencao = g.abstencao,
+            placar_obstrucao = g.obstrucao, placar_outros = g.outros, placar_total = g.total
+        FROM (
+            SELECT votacao_id,
+                   count(id) FILTER (WHERE tipo_voto = 'Sim')       AS sim,
+                   count(id) FILTER (WHERE tipo_voto = 'Não')       AS nao,
+                   count(id) FILTER (WHERE tipo_voto = 'Abstenção') AS abstencao,
+                   count(id) FILTER (WHERE tipo_voto = 'Obstrução') AS obstrucao,
+                   count(id) FILTER (WHERE tipo_voto IS NULL
+                                        OR tipo_voto NOT IN ('Sim', 'Não', 'Abstenção', 'Obstrução')) AS outros,
+                   count(id) AS total
+            FROM votos
+            GROUP BY votacao_id
+        ) g
+        WHERE v.id = g.votacao_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_votacao_placar_votacao_id'), table_name='votacao_placar')
+    op.drop_table('votacao_placar')
+    op.drop_column('votacoes', 'placar_total')
+    op.drop_column('votacoes', 'placar_outros')
+    op.drop_column('votacoes', 'placar_obstrucao')
+    op.drop_column('votacoes', 'placar_abstencao')
+    op.drop_column('votacoes', 'placar_nao')
+    op.drop_column('votacoes', 'placar_sim')
@@ -0,0 +1,34 @@
+"""discurso keywords
+
+Revision ID: a7d3e9b5c1f8
+Revises: f2c6a8e4d0b3
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b5c1f8'
+down_revision: Union[str, Sequence[str], None] = 'f2c6a8e4d0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('discurso_keywords',
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('keyword', sa.Text(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('politico_id', 'keyword')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('discurso_keywords')
@@ -0,0 +1,51 @@
+"""fornecedores
+
+Revision ID: b3e8f1a6d2c4
+Revises: a7d3e9b5c1f8
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1a6d2c4'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9b5c1f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fornecedores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('chave', sa.String(length=255), nullable=False),
+    sa.Column('cnpj', sa.String(length=20), nullable=True),
+    sa.Column('nome', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('chave')
+    )
+    op.create_table('fornecedor_totais',
+    sa.Column('fornecedor_id', sa.Integer(), nullable=False),
+    sa.Column('total_recebido', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_despesas', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['fornecedor_id'], ['fornecedores.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('fornecedor_id')
+    )
+    op.create_index('ix_fornecedor_totais_total', 'fornecedor_totais', ['total_recebido'], unique=False)
+    op.add_column('despesas', sa.Column('fornecedor_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_despesas_fornecedor_id'), 'despesas', ['fornecedor_id'], unique=False)
+    op.create_foreign_key(None, 'despesas', 'fornecedores', ['fornecedor_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('despesas_fornecedor_id_fkey', 'despesas', type_='foreignkey')
+    op.drop_index(op.f('ix_despesas_fornecedor_id'), table_name='despesas')
+    op.drop_column('despesas', 'fornecedor_id')
+    op.drop_index('ix_fornecedor_totais_total', table_name='fornecedor_totais')
+    op.drop_table('fornecedor_totais')
+    op.drop_table('fornecedores')
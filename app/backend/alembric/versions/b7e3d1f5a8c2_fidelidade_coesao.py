@@ -0,0 +1,75 @@
+"""fidelidade e coesao partidaria
+
+Revision ID: b7e3d1f5a8c2
+Revises: a2f6c8d4e0b9
+Create Date: 2026-10-20 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d1f5a8c2'
+down_revision: Union[str, Sequence[str], None] = 'a2f6c8d4e0b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Votações existentes entram como pendentes: a primeira execução calcula tudo
+    op.add_column('votacoes', sa.Column('fidelidade_calculada', sa.Boolean(), server_default=sa.false(), nullable=True))
+    op.add_column('politico_votos_feed', sa.Column('fiel', sa.Boolean(), nullable=True))
+    op.create_table('coesao_votacao',
+    sa.Column('votacao_id', sa.Integer(), nullable=False),
+    sa.Column('sigla_partido', sa.String(length=30), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('orientacao', sa.String(length=20), nullable=True),
+    sa.Column('votos', sa.Integer(), nullable=False),
+    sa.Column('sim', sa.Integer(), nullable=False),
+    sa.Column('nao', sa.Integer(), nullable=False),
+    sa.Column('votos_orientados', sa.Integer(), nullable=False),
+    sa.Column('votos_fieis', sa.Integer(), nullable=False),
+    sa.Column('rice', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['votacao_id'], ['votacoes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('votacao_id', 'sigla_partido')
+    )
+    op.create_index(op.f('ix_coesao_votacao_ano'), 'coesao_votacao', ['ano'], unique=False)
+    op.create_table('fidelidade_politico',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('votos_orientados', sa.Integer(), nullable=False),
+    sa.Column('votos_fieis', sa.Integer(), nullable=False),
+    sa.Column('fidelidade_pct', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('politico_id', 'ano', name='uq_fidelidade_politico', postgresql_nulls_not_distinct=True)
+    )
+    op.create_index('ix_fidelidade_politico_ano', 'fidelidade_politico', ['ano', 'fidelidade_pct'], unique=False)
+    op.create_table('coesao_partido',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sigla_partido', sa.String(length=30), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('votacoes', sa.Integer(), nullable=False),
+    sa.Column('coesao_pct', sa.Float(), nullable=True),
+    sa.Column('votos_orientados', sa.Integer(), nullable=False),
+    sa.Column('votos_fieis', sa.Integer(), nullable=False),
+    sa.Column('fidelidade_pct', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sigla_partido', 'ano', name='uq_coesao_partido', postgresql_nulls_not_distinct=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('coesao_partido')
+    op.drop_index('ix_fidelidade_politico_ano', table_name='fidelidade_politico')
+    op.drop_table('fidelidade_politico')
+    op.drop_index(op.f('ix_coesao_votacao_ano'), table_name='coesao_votacao')
+    op.drop_table('coesao_votacao')
+    op.drop_column('politico_votos_feed', 'fiel')
+    op.drop_column('votacoes', 'fidelidade_calculada')
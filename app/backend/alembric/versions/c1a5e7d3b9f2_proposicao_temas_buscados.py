@@ -0,0 +1,35 @@
+"""proposicao temas buscados
+
+Revision ID: c1a5e7d3b9f2
+Revises: b7e3d1f5a8c2
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1a5e7d3b9f2'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d1f5a8c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('proposicoes', sa.Column('temas_buscados_em', sa.DateTime(), nullable=True))
+    # Quem já tem tema já foi consultado; as demais são consultadas uma última vez
+    op.execute(
+        """
+        UPDATE proposicoes p SET temas_buscados_em = now()
+        WHERE EXISTS (SELECT 1 FROM proposicoes_temas pt WHERE pt.proposicao_id = p.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('proposicoes', 'temas_buscados_em')
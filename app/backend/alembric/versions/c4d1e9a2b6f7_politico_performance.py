@@ -0,0 +1,51 @@
+"""politico performance
+
+Revision ID: c4d1e9a2b6f7
+Revises: 7b2e4d8c1a35
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d1e9a2b6f7'
+down_revision: Union[str, Sequence[str], None] = '7b2e4d8c1a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('politico_performance',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('assiduidade_pct', sa.Float(), nullable=False),
+    sa.Column('pontos_producao', sa.Float(), nullable=False),
+    sa.Column('total_gasto', sa.Float(), nullable=False),
+    sa.Column('meses_mandato', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('nota_assiduidade', sa.Float(), nullable=False),
+    sa.Column('nota_producao', sa.Float(), nullable=False),
+    sa.Column('nota_economia', sa.Float(), nullable=False),
+    sa.Column('cota_mensal', sa.Float(), nullable=False),
+    sa.Column('cota_total', sa.Float(), nullable=False),
+    sa.Column('cota_utilizada_pct', sa.Float(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('politico_id', 'ano', name='uq_politico_performance_ano', postgresql_nulls_not_distinct=True)
+    )
+    op.create_index(op.f('ix_politico_performance_politico_id'), 'politico_performance', ['politico_id'], unique=False)
+    op.create_index('ix_politico_performance_ano_score', 'politico_performance', ['ano', 'score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_politico_performance_ano_score', table_name='politico_performance')
+    op.drop_index(op.f('ix_politico_performance_politico_id'), table_name='politico_performance')
+    op.drop_table('politico_performance')
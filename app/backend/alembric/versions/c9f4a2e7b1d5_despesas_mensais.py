@@ -0,0 +1,43 @@
+"""despesas mensais
+
+Revision ID: c9f4a2e7b1d5
+Revises: b3e8f1a6d2c4
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a2e7b1d5'
+down_revision: Union[str, Sequence[str], None] = 'b3e8f1a6d2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('despesas_mensais',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.Integer(), nullable=False),
+    sa.Column('tipo_despesa', sa.Text(), nullable=True),
+    sa.Column('fornecedor_id', sa.Integer(), nullable=True),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['fornecedor_id'], ['fornecedores.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('politico_id', 'ano', 'mes', 'tipo_despesa', 'fornecedor_id', name='uq_despesa_mensal', postgresql_nulls_not_distinct=True)
+    )
+    op.create_index('ix_despesas_mensais_ano', 'despesas_mensais', ['ano'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_despesas_mensais_ano', table_name='despesas_mensais')
+    op.drop_table('despesas_mensais')
@@ -0,0 +1,40 @@
+"""despesa top resumo
+
+Revision ID: d4b8e6c2a9f3
+Revises: c9f4a2e7b1d5
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8e6c2a9f3'
+down_revision: Union[str, Sequence[str], None] = 'c9f4a2e7b1d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('despesa_top_resumo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('tipo', sa.String(length=10), nullable=False),
+    sa.Column('posicao', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.Text(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('categoria_principal', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('politico_id', 'ano', 'tipo', 'posicao', name='uq_despesa_top_resumo', postgresql_nulls_not_distinct=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('despesa_top_resumo')
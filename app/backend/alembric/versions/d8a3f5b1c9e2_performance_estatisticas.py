@@ -0,0 +1,39 @@
+"""performance estatisticas
+
+Revision ID: d8a3f5b1c9e2
+Revises: c4d1e9a2b6f7
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a3f5b1c9e2'
+down_revision: Union[str, Sequence[str], None] = 'c4d1e9a2b6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('performance_estatisticas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=True),
+    sa.Column('grupo', sa.String(length=10), nullable=False),
+    sa.Column('chave', sa.String(length=50), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('media', sa.Float(), nullable=False),
+    sa.Column('mediana', sa.Float(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ano', 'grupo', 'chave', name='uq_performance_estatistica', postgresql_nulls_not_distinct=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('performance_estatisticas')
@@ -0,0 +1,64 @@
+"""presenca resumo
+
+Revision ID: e1c7a3f9d6b2
+Revises: d4b8e6c2a9f3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c7a3f9d6b2'
+down_revision: Union[str, Sequence[str], None] = 'd4b8e6c2a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('presenca_resumo',
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.Integer(), nullable=False),
+    sa.Column('sessoes', sa.Integer(), nullable=False),
+    sa.Column('presencas', sa.Integer(), nullable=False),
+    sa.Column('ausencias', sa.Integer(), nullable=False),
+    sa.Column('justificadas', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('politico_id', 'ano', 'mes')
+    )
+    op.create_index('ix_presenca_resumo_ano', 'presenca_resumo', ['ano'], unique=False)
+    # Contadores do histórico já importado (mesma classificação de injest_presenca_resumo):
+    # a ingestão diária só regrava o mês processado
+    op.execute(
+        """
+        INSERT INTO presenca_resumo (politico_id, ano, mes, sessoes, presencas, ausencias, justificadas)
+        SELECT politico_id, ano, mes,
+               count(*),
+               count(*) FILTER (WHERE presente),
+               count(*) FILTER (WHERE NOT presente AND NOT justificada),
+               count(*) FILTER (WHERE justificada)
+        FROM (
+            SELECT politico_id,
+                   CAST(EXTRACT(year FROM data) AS INTEGER)  AS ano,
+                   CAST(EXTRACT(month FROM data) AS INTEGER) AS mes,
+                   frequencia_sessao = 'Presença'            AS presente,
+                   frequencia_sessao != 'Presença'
+                       AND (frequencia_sessao ILIKE '%justificad%'
+                            OR coalesce(trim(justificativa), '') != '') AS justificada
+            FROM presencas
+            WHERE politico_id IS NOT NULL
+        ) p
+        GROUP BY politico_id, ano, mes
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_presenca_resumo_ano', table_name='presenca_resumo')
+    op.drop_table('presenca_resumo')
@@ -0,0 +1,40 @@
+"""politico performance posicoes
+
+Revision ID: e5b7c2d9f4a1
+Revises: d8a3f5b1c9e2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c2d9f4a1'
+down_revision: Union[str, Sequence[str], None] = 'd8a3f5b1c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('politico_performance', sa.Column('posicao', sa.Integer(), nullable=True))
+    op.add_column('politico_performance', sa.Column('percentil', sa.Float(), nullable=True))
+    op.add_column('politico_performance', sa.Column('total_ranking', sa.Integer(), nullable=True))
+    op.add_column('politico_performance', sa.Column('posicao_uf', sa.Integer(), nullable=True))
+    op.add_column('politico_performance', sa.Column('total_uf', sa.Integer(), nullable=True))
+    op.add_column('politico_performance', sa.Column('posicao_partido', sa.Integer(), nullable=True))
+    op.add_column('politico_performance', sa.Column('total_partido', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('politico_performance', 'total_partido')
+    op.drop_column('politico_performance', 'posicao_partido')
+    op.drop_column('politico_performance', 'total_uf')
+    op.drop_column('politico_performance', 'posicao_uf')
+    op.drop_column('politico_performance', 'total_ranking')
+    op.drop_column('politico_performance', 'percentil')
+    op.drop_column('politico_performance', 'posicao')
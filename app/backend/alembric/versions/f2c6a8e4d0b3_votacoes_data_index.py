@@ -0,0 +1,28 @@
+"""votacoes data index
+
+Revision ID: f2c6a8e4d0b3
+Revises: e5b7c2d9f4a1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8e4d0b3'
+down_revision: Union[str, Sequence[str], None] = 'e5b7c2d9f4a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_votacoes_data'), 'votacoes', ['data'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_votacoes_data'), table_name='votacoes')
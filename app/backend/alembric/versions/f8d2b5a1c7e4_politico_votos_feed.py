@@ -0,0 +1,47 @@
+"""politico votos feed
+
+Revision ID: f8d2b5a1c7e4
+Revises: e1c7a3f9d6b2
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8d2b5a1c7e4'
+down_revision: Union[str, Sequence[str], None] = 'e1c7a3f9d6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('politico_votos_feed',
+    sa.Column('politico_id', sa.Integer(), nullable=False),
+    sa.Column('votacao_id', sa.Integer(), nullable=False),
+    sa.Column('data', sa.Date(), nullable=True),
+    sa.Column('tipo_voto', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['politico_id'], ['politicos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['votacao_id'], ['votacoes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('politico_id', 'votacao_id')
+    )
+    op.create_index('ix_politico_votos_feed_data', 'politico_votos_feed', ['politico_id', 'data', 'votacao_id'], unique=False)
+    # Votos já importados (mesmo SELECT de injest_votos_feed): a importação só alimenta as votações novas
+    op.execute(
+        """
+        INSERT INTO politico_votos_feed (politico_id, votacao_id, data, tipo_voto)
+        SELECT v.politico_id, v.votacao_id, vt.data, v.tipo_voto
+        FROM votos v
+        JOIN votacoes vt ON vt.id = v.votacao_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_politico_votos_feed_data', table_name='politico_votos_feed')
+    op.drop_table('politico_votos_feed')
@@ -9,7 +9,9 @@ def politico_key_builder(func, namespace, request=None, response=None, args=None
     kwargs = kwargs or {}
     
     # 3. Filtramos o DB e outros objetos
-    ignored_keys = {"db", "request", "response", "self", "session"}
+    # (services injetados via Depends têm repr com endereço de memória:
+    #  se entrassem na chave, cada requisição geraria uma chave nova)
+    ignored_keys = {"db", "request", "response", "self", "session", "service"}
     
     # Pegamos apenas o que importa dos kwargs
     cache_params = [
@@ -29,6 +29,7 @@ from backend.schemas import (
     PoliticoDespesaResumoCompleto,
     PoliticoEstatisticasResponse,
     PoliticoResponse,
+    PoliticoSimilar,
     PoliticoVoto,
     ProposicaoParaPolitico,
 )
@@ -246,6 +247,32 @@ async def timeline(
     logger.info("Timeline | político id=%s", politico_id)
     return await service.get_politico_timeline_service(politico_id)
 
+@router.get(
+    "/{politico_id}/similares",
+    response_model=list[PoliticoSimilar],
+    summary="Parlamentares que mais votam como o político",
+    description=(
+        "Compara os votos nominais do político com os de todos os outros deputados "
+        "e retorna os `k` com maior percentual de votos iguais nas votações em que "
+        "ambos votaram (mínimo `min_comuns`). Abstenção e obstrução contam como o mesmo voto; "
+        "ausência e Art. 17 não entram na comparação."
+    ),
+    responses={
+        404: {"description": "Político não encontrado"},
+        503: {"description": "Matriz de votos ainda não gerada pela ingestão"},
+    },
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def similares(
+    politico_id: PoliticoIdPath,
+    k: Annotated[int, Query(ge=1, le=50, description="Quantidade de parlamentares")] = 10,
+    min_comuns: Annotated[int, Query(ge=1, le=5000, description="Mínimo de votações em comum")] = 20,
+    service: PoliticoService = Depends(_politico_service),
+):
+    logger.info("Similares | político id=%s k=%s min_comuns=%s", politico_id, k, min_comuns)
+    return await service.get_politico_similares_service(politico_id, k=k, min_comuns=min_comuns)
+
+
 @router.get(
     "/{politico_id}/proposicoes",
     response_model=list[ProposicaoParaPolitico],
@@ -19,6 +19,7 @@ Endpoints expostos:
   GET /proposicoes/{id}/votacoes        → votações vinculadas a uma proposição
   GET /votacoes/                        → lista votações (filtros + paginação)
   GET /votacoes/{id}                    → detalhe + orientações por partido
+  GET /votacoes/{id}/votos              → votos individuais (filtros + cursor)
 """
 
 import logging
@@ -33,6 +34,7 @@ from backend.schemas import (
     ProposicaoResponse,
     VotacaoDetalhe,
     VotacaoResponse,
+    VotosVotacaoResponse,
 )
 from backend.services.proposicao_service import ProposicaoService
 from fastapi_cache.decorator import cache
@@ -214,8 +216,8 @@ async def listar_votacoes(
     - **aprovacao**: `1` (aprovada), `0` (rejeitada), `-1` (indefinido)
     - **sigla_tipo**: filtra pelo tipo da proposição votada (`PL`, `PEC`...)
 
-    Inclui os dados da proposição vinculada diretamente na resposta,
-    sem necessidade de um segundo request.
+    Inclui os dados da proposição vinculada e o **placar** geral
+    diretamente na resposta, sem necessidade de um segundo request.
 
     Retorna lista vazia se nenhum resultado for encontrado.
     """
@@ -247,11 +249,71 @@ async def get_votacao(
     Retorna o detalhe completo de uma votação.
 
     Inclui:
-    - Todos os campos da listagem (proposição vinculada, resultado, tipo...)
+    - Todos os campos da listagem (proposição vinculada, resultado, tipo, placar...)
     - **orientacoes**: como cada partido/bloco parlamentar orientou o voto
       de seus membros (`Sim`, `Não`, `Libera`, `Obstrução`)
+    - **placar_por_partido** / **placar_por_uf**: como os deputados de fato
+      votaram, pré-calculado na ingestão
 
     Lança `404` se o ID não existir.
     """
     logger.info("Detalhe da votação id=%s", votacao_id)
-    return await service.get_votacao_service(votacao_id)
\ No newline at end of file
+    return await service.get_votacao_service(votacao_id)
+
+
+@router_votacoes.get(
+    "/{votacao_id}/votos",
+    response_model=VotosVotacaoResponse,
+    summary="Lista como cada deputado votou em uma votação",
+    responses={
+        400: {"description": "Cursor `apos` não votou nesta votação"},
+        404: {"description": "Votação não encontrada"},
+    },
+)
+async def listar_votos_votacao(
+    votacao_id: VotacaoIdPath,
+    partido: Annotated[
+        str | None,
+        Query(max_length=30, description="Partido no momento do voto: PT, PL..."),
+    ] = None,
+    uf: Annotated[
+        str | None,
+        Query(min_length=2, max_length=2, description="UF do deputado: SP, RJ..."),
+    ] = None,
+    tipo_voto: Annotated[
+        str | None,
+        Query(max_length=20, description="Sim, Não, Abstenção, Obstrução, Art. 17..."),
+    ] = None,
+    apos: Annotated[
+        int | None,
+        Query(gt=0, description="Cursor: `proximo_cursor` da página anterior"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(ge=1, le=513, description="Máximo de votos por página"),
+    ] = 100,
+    service: ProposicaoService = Depends(_proposicao_service),
+):
+    """
+    Retorna o voto de cada deputado em uma votação, ordenado pelo nome.
+
+    Filtros opcionais e combináveis:
+    - **partido**: sigla do partido no momento do voto
+    - **uf**: UF do deputado
+    - **tipo_voto**: `Sim`, `Não`, `Abstenção`, `Obstrução`, `Art. 17`...
+
+    Paginação por cursor: repita a chamada com `apos=<proximo_cursor>` até
+    `proximo_cursor` vir `null`. Com `limit=513` a votação inteira vem numa página.
+
+    Votações com votos importados não mudam — a resposta fica em cache por 24h
+    (no serviço; votações ainda sem votos não são cacheadas).
+    Lança `404` se o ID não existir e `400` se `apos` não for um cursor desta votação.
+    """
+    return await service.listar_votos_votacao_service(
+        votacao_id,
+        sigla_partido=partido,
+        sigla_uf=uf,
+        tipo_voto=tipo_voto,
+        apos=apos,
+        limit=limit,
+    )
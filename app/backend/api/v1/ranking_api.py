@@ -10,14 +10,26 @@ Seguranca (OWASP):
 """
 
 import logging
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.v1.keybuilder import politico_key_builder
 from backend.database import get_db
-from backend.schemas import RankingDespesaPolitico, RankingDiscursoPolitico, RankingEmpresaLucro
+from backend.schemas import (
+    RankingAssiduidadePolitico,
+    RankingAutoriaPolitico,
+    RankingCoesaoPartido,
+    RankingDespesaCategoria,
+    RankingDespesaPolitico,
+    RankingDiscursoPolitico,
+    RankingEmpresaLucro,
+    RankingFidelidadePolitico,
+    RankingParticipacaoVotacoes,
+    RankingSimulacaoResponse,
+    TimelineMatrizResponse,
+)
 from backend.services.ranking_service import RankingService
 from fastapi_cache.decorator import cache
 
@@ -29,6 +41,16 @@ logger = logging.getLogger(__name__)
 LimitRankingQuery = Annotated[int, Query(ge=1, le=100, description="Maximo de itens por pagina")]
 LimitDiscursoQuery = Annotated[int, Query(ge=1, le=500, description="Maximo de discursos por pagina")]
 OffsetQuery = Annotated[int, Query(ge=0, description="Deslocamento para paginacao")]
+PesoQuery = Annotated[float, Query(ge=0, le=100, description="Peso relativo (normalizado pela soma dos pesos)")]
+LimitPerformanceQuery = Annotated[int | None, Query(ge=1, le=100, description="Maximo de itens (omitido = lista inteira)")]
+AnoQuery = Annotated[int | None, Query(ge=2000, le=2100, description="Filtro por ano")]
+UfQuery = Annotated[str | None, Query(min_length=2, max_length=2, description="Sigla do estado")]
+PartidoQuery = Annotated[str | None, Query(min_length=1, max_length=20, description="Sigla do partido")]
+OrderQuery = Annotated[Literal["desc", "asc"], Query(description="desc = melhores primeiro")]
+MinVotosQuery = Annotated[int, Query(ge=1, le=10000, description="Minimo de votos com orientacao do partido")]
+MinVotacoesQuery = Annotated[int, Query(ge=1, le=10000, description="Minimo de votacoes nominais no periodo")]
+SiglaTipoQuery = Annotated[str | None, Query(min_length=1, max_length=10, description="Tipo da proposicao (PL, PEC...)")]
+MetaProducaoQuery = Annotated[float, Query(gt=0, le=50, description="Pontos de producao por mes para nota maxima")]
 
 router = APIRouter(
     prefix="/ranking",
@@ -67,6 +89,174 @@ async def ranking_despesas_politicos(
     return await service.get_ranking_despesas_politicos(q=q, uf=uf, limit=limit, offset=offset)
 
 
+@router.get(
+    "/assiduidade",
+    response_model=list[RankingAssiduidadePolitico],
+    summary="Ranking de politicos por assiduidade nas sessoes",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_assiduidade(
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    ano: AnoQuery = None,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    order: OrderQuery = "desc",
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna politicos ordenados pelo percentual de presenca nas sessoes
+    (mandato inteiro ou ano), com sessoes, presencas, ausencias e justificadas.
+    """
+    logger.info(
+        "Ranking assiduidade | uf=%s partido=%s ano=%s limit=%s offset=%s order=%s",
+        uf, partido, ano, limit, offset, order,
+    )
+    return await service.get_ranking_assiduidade(
+        uf=uf, partido=partido, ano=ano, limit=limit, offset=offset, order=order,
+    )
+
+
+@router.get(
+    "/fidelidade",
+    response_model=list[RankingFidelidadePolitico],
+    summary="Ranking de politicos por fidelidade a orientacao do partido",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_fidelidade(
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    ano: AnoQuery = None,
+    min_votos: MinVotosQuery = 10,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    order: OrderQuery = "desc",
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna politicos ordenados pelo percentual de votos que seguiram a orientacao
+    do proprio partido (mandato inteiro ou ano). Orientacao "Libera" e votos
+    Art. 17 nao contam. Quem tem menos de `min_votos` votos orientados fica de fora.
+    """
+    logger.info(
+        "Ranking fidelidade | uf=%s partido=%s ano=%s min_votos=%s limit=%s offset=%s order=%s",
+        uf, partido, ano, min_votos, limit, offset, order,
+    )
+    return await service.get_ranking_fidelidade(
+        uf=uf, partido=partido, ano=ano, min_votos=min_votos, limit=limit, offset=offset, order=order,
+    )
+
+
+@router.get(
+    "/coesao_partidos",
+    response_model=list[RankingCoesaoPartido],
+    summary="Ranking de partidos por coesao nas votacoes",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_coesao_partidos(
+    ano: AnoQuery = None,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    order: OrderQuery = "desc",
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna partidos ordenados pela coesao media (indice de Rice: 100 = bancada
+    sempre unanime entre Sim e Nao), com a fidelidade media dos membros a orientacao.
+    """
+    logger.info("Ranking coesao | ano=%s limit=%s offset=%s order=%s", ano, limit, offset, order)
+    return await service.get_ranking_coesao_partidos(ano=ano, limit=limit, offset=offset, order=order)
+
+
+@router.get(
+    "/despesas_categoria",
+    response_model=list[RankingDespesaCategoria],
+    summary="Ranking dos tipos de despesa da cota parlamentar",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_despesas_categoria(
+    ano: AnoQuery = None,
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna os tipos de despesa ordenados pelo total gasto, com numero de
+    documentos e de parlamentares. Calculado sobre o snapshot analitico (503 se
+    ainda nao exportado).
+    """
+    logger.info(
+        "Ranking despesas por categoria | ano=%s uf=%s partido=%s limit=%s offset=%s",
+        ano, uf, partido, limit, offset,
+    )
+    return await service.get_ranking_despesas_categoria(
+        ano=ano, uf=uf, partido=partido, limit=limit, offset=offset,
+    )
+
+
+@router.get(
+    "/autoria",
+    response_model=list[RankingAutoriaPolitico],
+    summary="Ranking de politicos por proposicoes de sua autoria",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_autoria(
+    ano: AnoQuery = None,
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    sigla_tipo: SiglaTipoQuery = None,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna politicos ordenados pelo numero de proposicoes de que sao autores ou
+    coautores (ano de apresentacao), com quantas assinam em primeiro lugar.
+    Calculado sobre o snapshot analitico (503 se ainda nao exportado).
+    """
+    logger.info(
+        "Ranking autoria | ano=%s uf=%s partido=%s sigla_tipo=%s limit=%s offset=%s",
+        ano, uf, partido, sigla_tipo, limit, offset,
+    )
+    return await service.get_ranking_autoria(
+        ano=ano, uf=uf, partido=partido, sigla_tipo=sigla_tipo, limit=limit, offset=offset,
+    )
+
+
+@router.get(
+    "/participacao_votacoes",
+    response_model=list[RankingParticipacaoVotacoes],
+    summary="Ranking de politicos por participacao nas votacoes nominais",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def ranking_participacao_votacoes(
+    ano: AnoQuery = None,
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    min_votacoes: MinVotacoesQuery = 10,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    order: OrderQuery = "desc",
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Retorna politicos ordenados pelo percentual de votacoes nominais em que
+    registraram voto, contando so as votacoes entre o primeiro e o ultimo voto
+    de cada um no periodo. Calculado sobre o snapshot analitico (503 se ainda
+    nao exportado).
+    """
+    logger.info(
+        "Ranking participacao | ano=%s uf=%s partido=%s min_votacoes=%s limit=%s offset=%s order=%s",
+        ano, uf, partido, min_votacoes, limit, offset, order,
+    )
+    return await service.get_ranking_participacao_votacoes(
+        ano=ano, uf=uf, partido=partido, min_votacoes=min_votacoes,
+        limit=limit, offset=offset, order=order,
+    )
+
+
 @router.get(
     "/lucro_empresas",
     response_model=list[RankingEmpresaLucro],
@@ -105,14 +295,77 @@ async def ranking_discursos(
 )
 @cache(expire=86400, namespace="quem-vota-cache", key_builder=politico_key_builder)
 async def ranking_performance_politicos(
+    uf: UfQuery = None,
+    partido: PartidoQuery = None,
+    ano: AnoQuery = None,
+    limit: LimitPerformanceQuery = None,
+    offset: OffsetQuery = 0,
+    order: OrderQuery = "desc",
     service: RankingService = Depends(_ranking_service),
 ):
     """
     Retorna o ranking de performance calculado a partir de assiduidade (15%),
-    economia (40%) e producao legislativa (45%).
+    economia (40%) e producao legislativa (45%), com posicao e percentil.
+    Filtros por UF/partido nao alteram a posicao (relativa a Camara inteira).
+    """
+    logger.info(
+        "Ranking performance | uf=%s partido=%s ano=%s limit=%s offset=%s order=%s",
+        uf, partido, ano, limit, offset, order,
+    )
+    return await service.listar_ranking_performance(
+        uf=uf, partido=partido, ano=ano, limit=limit, offset=offset, order=order,
+    )
+
+
+@router.get(
+    "/performance_politicos/simulacao",
+    response_model=RankingSimulacaoResponse,
+    summary="Simulacao do ranking de performance com pesos personalizados",
+)
+async def simular_ranking_performance(
+    peso_assiduidade: PesoQuery = 15,
+    peso_economia: PesoQuery = 40,
+    peso_producao: PesoQuery = 45,
+    meta_producao_mes: MetaProducaoQuery = 2.0,
+    limit: LimitRankingQuery = 100,
+    offset: OffsetQuery = 0,
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Recalcula o ranking com os pesos e a meta de producao informados.
+    Sem cache HTTP: o calculo roda em memoria sobre um snapshot residente,
+    entao qualquer combinacao de parametros custa o mesmo.
     """
-    logger.info("Ranking performance parlamentar solicitado")
-    return await service.get_ranking_performance_politicos()
+    logger.info(
+        "Simulacao performance | pesos=%s/%s/%s meta=%s limit=%s offset=%s",
+        peso_assiduidade, peso_economia, peso_producao, meta_producao_mes, limit, offset,
+    )
+    return await service.simular_ranking_performance(
+        peso_assiduidade=peso_assiduidade,
+        peso_economia=peso_economia,
+        peso_producao=peso_producao,
+        meta_producao_mes=meta_producao_mes,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get(
+    "/timeline_matrix",
+    response_model=TimelineMatrizResponse,
+    summary="Score anual de todos os parlamentares (formato colunar)",
+)
+@cache(expire=86400, key_builder=politico_key_builder)
+async def timeline_matrix(
+    service: RankingService = Depends(_ranking_service),
+):
+    """
+    Score e notas de cada parlamentar em cada ano, como arrays paralelos:
+    `score[i][j]` e o score de `ids[i]` em `anos[j]` (null = sem dados no ano).
+    Substitui N chamadas a /politicos/{id}/timeline nos paineis comparativos.
+    """
+    logger.info("Timeline matrix solicitada")
+    return await service.get_timeline_matriz()
 
 
 @router.get(
@@ -125,14 +378,4 @@ async def get_stats_geral(
 ):
     """Retorna media global, total de parlamentares e top 50 do ranking de performance."""
     logger.info("Stats gerais solicitadas")
-    ranking_completo = await service.get_ranking_performance_politicos()
-
-    scores = [p["score"] for p in ranking_completo]
-    total = len(scores)
-    media = sum(scores) / total if total > 0 else 0.0
-
-    return {
-        "media_global": round(media, 2),
-        "total_parlamentares": total,
-        "top_3": ranking_completo[:50],
-    }
\ No newline at end of file
+    return await service.get_stats_performance()
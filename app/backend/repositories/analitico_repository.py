@@ -0,0 +1,202 @@
+"""
+Repositório Analítico — Consultas ao snapshot Parquet com DuckDB.
+
+Lê os arquivos exportados por injest_banco/injest_analitico.py (views
+despesas, votos, presencas, proposicoes_autores e politicos), não o Postgres.
+
+Segurança (OWASP):
+  - A01 / SQL Injection: filtros via parâmetros nomeados do DuckDB; a ordenação
+    só alterna entre dois trechos fixos.
+  - A03 / Sensitive Data Exposure: nenhum dado sensível é logado ou exposto.
+  - A04 / Insecure Design: limites máximos aplicados como defesa em profundidade.
+"""
+
+import logging
+
+import duckdb
+
+from backend.schemas import RankingAutoriaPolitico, RankingDespesaCategoria, RankingParticipacaoVotacoes
+from backend.services.analitico import consultar
+
+logger = logging.getLogger(__name__)
+
+_MAX_LIMIT_RANKING = 100
+
+
+def _filtros_politico(uf: str | None, partido: str | None, parametros: dict) -> str:
+    """Condições sobre a dimensão `p` (politicos), como nos demais rankings."""
+    condicoes = ""
+    if uf:
+        condicoes += " AND p.uf = $uf"
+        parametros["uf"] = uf.upper()[:2]
+    if partido:
+        condicoes += " AND upper(p.partido_sigla) = $partido"
+        parametros["partido"] = partido.upper()
+    return condicoes
+
+
+class AnaliticoRepository:
+    """Rankings e agregados sobre o snapshot colunar. Todas as consultas são parametrizadas."""
+
+    @staticmethod
+    async def _consultar(sql: str, parametros: dict, descricao: str) -> list[dict]:
+        try:
+            return await consultar(sql, parametros)
+        except duckdb.Error:
+            logger.exception("Erro ao consultar snapshot analitico: %s", descricao)
+            raise
+
+    # ------------------------------------------------------------------
+    # Despesas por categoria
+    # ------------------------------------------------------------------
+
+    async def get_ranking_despesas_categoria(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[RankingDespesaCategoria]:
+        """Tipos de despesa da cota parlamentar ordenados pelo total (valor líquido)."""
+        parametros = {"limit": min(abs(limit), _MAX_LIMIT_RANKING), "offset": max(offset, 0)}
+        where = "d.valor_liquido IS NOT NULL"
+        if ano is not None:
+            where += " AND d.ano = $ano"
+            parametros["ano"] = ano
+        where += _filtros_politico(uf, partido, parametros)
+
+        linhas = await self._consultar(
+            f"""
+            SELECT coalesce(d.tipo_despesa, 'NÃO INFORMADO') AS tipo_despesa,
+                   sum(d.valor_liquido)                    AS total_gasto,
+                   count(*)                                AS documentos,
+                   count(DISTINCT d.politico_id)           AS parlamentares
+            FROM despesas d
+            JOIN politicos p ON p.id = d.politico_id
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY total_gasto DESC, tipo_despesa
+            LIMIT $limit OFFSET $offset
+            """,
+            parametros,
+            "despesas por categoria",
+        )
+        return [
+            RankingDespesaCategoria(
+                tipo_despesa=r["tipo_despesa"],
+                total_gasto=float(r["total_gasto"]),
+                documentos=r["documentos"],
+                parlamentares=r["parlamentares"],
+            )
+            for r in linhas
+        ]
+
+    # ------------------------------------------------------------------
+    # Autoria de proposições
+    # ------------------------------------------------------------------
+
+    async def get_ranking_autoria(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        sigla_tipo: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[RankingAutoriaPolitico]:
+        """
+        Parlamentares ordenados pelo número de proposições de que são autores
+        (ano de apresentação). Empates: mais como primeiro autor, depois o id.
+        """
+        parametros = {"limit": min(abs(limit), _MAX_LIMIT_RANKING), "offset": max(offset, 0)}
+        where = "TRUE"
+        if ano is not None:
+            where += " AND a.ano = $ano"
+            parametros["ano"] = ano
+        if sigla_tipo:
+            where += " AND a.sigla_tipo = $sigla_tipo"
+            parametros["sigla_tipo"] = sigla_tipo.upper()
+        where += _filtros_politico(uf, partido, parametros)
+
+        linhas = await self._consultar(
+            f"""
+            SELECT p.id AS politico_id, p.nome, p.uf, p.partido_sigla, p.url_foto,
+                   count(DISTINCT a.proposicao_id)                                   AS proposicoes,
+                   count(DISTINCT a.proposicao_id) FILTER (WHERE a.ordem_assinatura = 1) AS como_primeiro_autor
+            FROM proposicoes_autores a
+            JOIN politicos p ON p.id = a.politico_id
+            WHERE {where}
+            GROUP BY ALL
+            ORDER BY proposicoes DESC, como_primeiro_autor DESC, politico_id
+            LIMIT $limit OFFSET $offset
+            """,
+            parametros,
+            "autoria de proposicoes",
+        )
+        return [RankingAutoriaPolitico(**r) for r in linhas]
+
+    # ------------------------------------------------------------------
+    # Participação nas votações nominais
+    # ------------------------------------------------------------------
+
+    async def get_ranking_participacao_votacoes(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        min_votacoes: int = 1,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ) -> list[RankingParticipacaoVotacoes]:
+        """
+        Parlamentares ordenados pelo % das votações nominais em que registraram
+        voto. O denominador são as votações entre o primeiro e o último voto do
+        parlamentar no período, para não penalizar quem assumiu ou saiu no meio.
+        """
+        parametros = {
+            "limit": min(abs(limit), _MAX_LIMIT_RANKING),
+            "offset": max(offset, 0),
+            "min_votacoes": max(min_votacoes, 1),
+        }
+        periodo = "TRUE"
+        if ano is not None:
+            periodo = "ano = $ano"
+            parametros["ano"] = ano
+        filtros = _filtros_politico(uf, partido, parametros)
+        ordem = "ASC" if order == "asc" else "DESC"
+
+        linhas = await self._consultar(
+            f"""
+            WITH votacoes AS (
+                SELECT DISTINCT votacao_id, data FROM votos WHERE {periodo}
+            ),
+            por_politico AS (
+                SELECT politico_id, count(DISTINCT votacao_id) AS votos, min(data) AS inicio, max(data) AS fim
+                FROM votos
+                WHERE {periodo}
+                GROUP BY politico_id
+            ),
+            participacao AS (
+                SELECT pp.politico_id, pp.votos, count(v.votacao_id) AS votacoes
+                FROM por_politico pp
+                JOIN votacoes v ON v.data BETWEEN pp.inicio AND pp.fim
+                GROUP BY pp.politico_id, pp.votos
+            )
+            SELECT p.id AS politico_id, p.nome, p.uf, p.partido_sigla, p.url_foto,
+                   pa.votacoes, pa.votos,
+                   round(pa.votos * 100.0 / pa.votacoes, 2) AS participacao_pct
+            FROM participacao pa
+            JOIN politicos p ON p.id = pa.politico_id
+            WHERE pa.votacoes >= $min_votacoes{filtros}
+            ORDER BY participacao_pct {ordem}, pa.votacoes DESC, politico_id
+            LIMIT $limit OFFSET $offset
+            """,
+            parametros,
+            "participacao em votacoes",
+        )
+        return [RankingParticipacaoVotacoes(**r) for r in linhas]
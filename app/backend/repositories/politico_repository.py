@@ -10,6 +10,7 @@ Segurança (OWASP):
 """
 
 import logging
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import case, desc, func, select, String
 from sqlalchemy.exc import SQLAlchemyError
@@ -30,7 +31,10 @@ from backend.schemas import (
 )
 from backend.models import (
     Despesa,
+    DespesaMensal,
+    DespesaTopResumo,
     Politico,
+    PoliticoVotoFeed,
     Presenca,
     ProposicaoAutor,
     Proposicao,
@@ -113,27 +117,44 @@ class PoliticoRepository:
     ) -> list[PoliticoVoto]:
         safe_limit = min(abs(limit), _MAX_LIMIT_VOTACOES)
 
+        # Página lida de politico_votos_feed em ordem de data (índice
+        # politico_id, data); a proposição só é buscada para as linhas da página.
+        pagina = (
+            select(PoliticoVotoFeed.votacao_id, PoliticoVotoFeed.data, PoliticoVotoFeed.tipo_voto)
+            .join(Votacao, Votacao.id == PoliticoVotoFeed.votacao_id)
+            .where(
+                PoliticoVotoFeed.politico_id == politico_id,
+                Votacao.proposicao_id.is_not(None),
+            )
+            .order_by(PoliticoVotoFeed.data.desc(), PoliticoVotoFeed.votacao_id.desc())
+            .limit(safe_limit)
+        )
+        if ano is not None:
+            pagina = (
+                pagina
+                .join(Proposicao, Proposicao.id == Votacao.proposicao_id)
+                .where(Proposicao.ano == ano)
+            )
+        pagina = pagina.subquery("pagina")
+
         stmt = (
             select(
-                Votacao.id.label("id_votacao"),
-                Votacao.data,
+                pagina.c.votacao_id.label("id_votacao"),
+                pagina.c.data,
                 Proposicao.sigla_tipo.label("proposicao_sigla"),
                 Proposicao.numero.label("proposicao_numero"),
                 Proposicao.ano.label("proposicao_ano"),
                 Proposicao.ementa,
-                Voto.tipo_voto.label("voto"),
+                pagina.c.tipo_voto.label("voto"),
                 Votacao.descricao.label("resultado_da_votacao"),
                 Votacao.tipo_votacao,
                 Votacao.uri,
             )
-            .join(Voto, Voto.votacao_id == Votacao.id)
+            .select_from(pagina)
+            .join(Votacao, Votacao.id == pagina.c.votacao_id)
             .join(Proposicao, Votacao.proposicao_id == Proposicao.id)
-            .where(Voto.politico_id == politico_id)
-            .order_by(desc(Votacao.data))
-            .limit(safe_limit)
+            .order_by(pagina.c.data.desc(), pagina.c.votacao_id.desc())
         )
-        if ano is not None:
-            stmt = stmt.where(Proposicao.ano == ano)
 
         try:
             result = await self.db.execute(stmt)
@@ -211,18 +232,18 @@ class PoliticoRepository:
     ) -> list[PoliticoDespesaResumo]:
         stmt = (
             select(
-                Despesa.ano,
-                Despesa.mes,
-                func.sum(Despesa.valor_liquido).label("total_gasto"),
-                func.count(Despesa.id).label("qtd_despesas"),
+                DespesaMensal.ano,
+                DespesaMensal.mes,
+                func.sum(DespesaMensal.total).label("total_gasto"),
+                func.sum(DespesaMensal.quantidade).label("qtd_despesas"),
             )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(Despesa.ano, Despesa.mes)
-            .order_by(Despesa.ano.desc(), Despesa.mes.desc())
+            .where(DespesaMensal.politico_id == politico_id)
+            .group_by(DespesaMensal.ano, DespesaMensal.mes)
+            .order_by(DespesaMensal.ano.desc(), DespesaMensal.mes.desc())
         )
 
         if ano is not None:
-            stmt = stmt.where(Despesa.ano == ano)
+            stmt = stmt.where(DespesaMensal.ano == ano)
         if limit is not None:
             stmt = stmt.limit(min(abs(limit), _MAX_LIMIT_RESUMO))
 
@@ -257,103 +278,48 @@ class PoliticoRepository:
         # ── Histórico mensal ──────────────────────────────────────────
         stmt_historico = (
             select(
-                Despesa.ano,
-                Despesa.mes,
-                func.sum(Despesa.valor_liquido).label("total_gasto"),
-                func.count(Despesa.id).label("qtd_despesas"),
+                DespesaMensal.ano,
+                DespesaMensal.mes,
+                func.sum(DespesaMensal.total).label("total_gasto"),
+                func.sum(DespesaMensal.quantidade).label("qtd_despesas"),
             )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(Despesa.ano, Despesa.mes)
-            .order_by(Despesa.ano.desc(), Despesa.mes.desc())
+            .where(DespesaMensal.politico_id == politico_id)
+            .group_by(DespesaMensal.ano, DespesaMensal.mes)
+            .order_by(DespesaMensal.ano.desc(), DespesaMensal.mes.desc())
         )
         if ano is not None:
-            stmt_historico = stmt_historico.where(Despesa.ano == ano)
+            stmt_historico = stmt_historico.where(DespesaMensal.ano == ano)
         if safe_limit:
             stmt_historico = stmt_historico.limit(safe_limit)
 
-        # ── Top fornecedores ─────────────────────────────────────────
+        # ── Top fornecedores e categorias ─────────────────────────────
         #
-        # Para cada fornecedor, além do total gasto, buscamos a
-        # `categoria_principal` — o tipo_despesa mais frequente nas
-        # notas fiscais daquele fornecedor para este parlamentar.
+        # Pré-calculados na ingestão (despesa_top_resumo, com a categoria
+        # principal de cada fornecedor): leitura pela chave (politico, ano).
         #
-        # Estratégia: subquery que ranqueia cada (fornecedor, tipo_despesa)
-        # por contagem decrescente e filtra apenas o rank = 1 (modo).
-        #
-        # Compatível com PostgreSQL, SQLite e MySQL via window function.
-        #
-        fornecedor_rank_sq = (
+        stmt_tops = (
             select(
-                Despesa.nome_fornecedor,
-                Despesa.tipo_despesa,
-                func.count(Despesa.id).label("qtd"),
-                func.rank()
-                .over(
-                    partition_by=Despesa.nome_fornecedor,
-                    order_by=func.count(Despesa.id).desc(),
-                )
-                .label("rnk"),
+                DespesaTopResumo.tipo,
+                DespesaTopResumo.nome,
+                DespesaTopResumo.total,
+                DespesaTopResumo.categoria_principal,
             )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(Despesa.nome_fornecedor, Despesa.tipo_despesa)
-        )
-        if ano is not None:
-            fornecedor_rank_sq = fornecedor_rank_sq.where(Despesa.ano == ano)
-        fornecedor_rank_sq = fornecedor_rank_sq.subquery("fornecedor_rank")
-
-        # Categoria predominante por fornecedor (rank = 1)
-        categoria_principal_sq = (
-            select(
-                fornecedor_rank_sq.c.nome_fornecedor,
-                fornecedor_rank_sq.c.tipo_despesa.label("categoria_principal"),
+            .where(
+                DespesaTopResumo.politico_id == politico_id,
+                DespesaTopResumo.ano == ano if ano is not None else DespesaTopResumo.ano.is_(None),
             )
-            .where(fornecedor_rank_sq.c.rnk == 1)
-            .subquery("categoria_principal")
+            .order_by(DespesaTopResumo.tipo, DespesaTopResumo.posicao)
         )
 
-        stmt_empresas = (
-            select(
-                Despesa.nome_fornecedor.label("nome"),
-                func.sum(Despesa.valor_liquido).label("total"),
-                categoria_principal_sq.c.categoria_principal,
-            )
-            .join(
-                categoria_principal_sq,
-                Despesa.nome_fornecedor == categoria_principal_sq.c.nome_fornecedor,
-            )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(
-                Despesa.nome_fornecedor,
-                categoria_principal_sq.c.categoria_principal,
-            )
-            .order_by(desc("total"))
-            .limit(10)
-        )
-        if ano is not None:
-            stmt_empresas = stmt_empresas.where(Despesa.ano == ano)
-
-        # ── Top categorias ────────────────────────────────────────────
-        stmt_categorias = (
-            select(
-                Despesa.tipo_despesa.label("nome"),
-                func.sum(Despesa.valor_liquido).label("total"),
-            )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(Despesa.tipo_despesa)
-            .order_by(desc("total"))
-            .limit(10)
-        )
-        if ano is not None:
-            stmt_categorias = stmt_categorias.where(Despesa.ano == ano)
-
         try:
             res_h = await self.db.execute(stmt_historico)
-            res_e = await self.db.execute(stmt_empresas)
-            res_c = await self.db.execute(stmt_categorias)
+            res_t = await self.db.execute(stmt_tops)
         except SQLAlchemyError:
             logger.exception("Erro ao buscar resumo completo do político id=%s", politico_id)
             raise
 
+        tops = res_t.mappings().all()
+
         return PoliticoDespesaResumoCompleto(
             historico_mensal=[
                 PoliticoDespesaResumo(
@@ -367,14 +333,16 @@ class PoliticoRepository:
             top_fornecedores=[
                 ItemRankingFornecedor(
                     nome=row.nome,
-                    total=float(row.total or 0),
+                    total=float(row.total),
                     categoria_principal=row.categoria_principal,
                 )
-                for row in res_e.mappings()
+                for row in tops
+                if row.tipo == "fornecedor"
             ],
             top_categorias=[
-                ItemRanking(nome=row.nome, total=float(row.total or 0))
-                for row in res_c.mappings()
+                ItemRanking(nome=row.nome, total=float(row.total))
+                for row in tops
+                if row.tipo == "categoria"
             ],
         )
 
@@ -404,19 +372,19 @@ class PoliticoRepository:
             stmt_votos = (
                 stmt_votos
                 .join(Votacao, Votacao.id == Voto.votacao_id)
-                .where(func.extract("year", Votacao.data) == ano)
+                .where(Votacao.data.between(date(ano, 1, 1), date(ano, 12, 31)))
             )
 
         # --- Despesas ---
         stmt_despesas = select(
-            func.count(Despesa.id),
-            func.coalesce(func.sum(Despesa.valor_liquido), 0),
-            func.min(Despesa.ano),
-            func.max(Despesa.ano),
-        ).where(Despesa.politico_id == politico_id)
+            func.sum(DespesaMensal.quantidade),
+            func.coalesce(func.sum(DespesaMensal.total), 0),
+            func.min(DespesaMensal.ano),
+            func.max(DespesaMensal.ano),
+        ).where(DespesaMensal.politico_id == politico_id)
 
         if ano is not None:
-            stmt_despesas = stmt_despesas.where(Despesa.ano == ano)
+            stmt_despesas = stmt_despesas.where(DespesaMensal.ano == ano)
 
         try:
             res_votos    = await self.db.execute(stmt_votos)
@@ -431,8 +399,8 @@ class PoliticoRepository:
         # Quando filtrado por ano, meses = meses distintos com despesa naquele ano
         if ano is not None:
             stmt_meses = select(
-                func.count(func.distinct(Despesa.mes))
-            ).where(Despesa.politico_id == politico_id, Despesa.ano == ano)
+                func.count(func.distinct(DespesaMensal.mes))
+            ).where(DespesaMensal.politico_id == politico_id, DespesaMensal.ano == ano)
             try:
                 res_meses    = await self.db.execute(stmt_meses)
                 total_meses  = res_meses.scalar() or 1
@@ -584,8 +552,9 @@ class PoliticoRepository:
         """
         Retorna (lista_de_votações, total_count) para o político.
 
-        O total_count é calculado numa subquery separada para suportar
-        paginação correta sem carregar todos os registros em memória.
+        Lê de politico_votos_feed: a página e o total_count saem do índice
+        (politico_id, data), sem juntar todos os votos do parlamentar antes do
+        limit; votação e proposição são buscadas só para as linhas da página.
 
         Args:
             politico_id: ID interno do parlamentar.
@@ -601,41 +570,45 @@ class PoliticoRepository:
         safe_limit  = min(abs(limit), 100)
         safe_offset = max(offset, 0)
 
-        # ── Query base compartilhada por dados e count ─────────────────────
-        base_filter = [Voto.politico_id == politico_id]
+        # ── Filtro compartilhado por dados e count (politico_votos_feed) ───
+        base_filter = [PoliticoVotoFeed.politico_id == politico_id]
         if ano is not None:
-            base_filter.append(func.extract("year", Votacao.data) == ano)
+            base_filter.append(PoliticoVotoFeed.data.between(date(ano, 1, 1), date(ano, 12, 31)))
 
-        # ── Count total (sem limit/offset) ─────────────────────────────────
+        # ── Count total (sem limit/offset): só o índice (politico_id, data) ─
         stmt_count = (
             select(func.count())
-            .select_from(Voto)
-            .join(Votacao, Votacao.id == Voto.votacao_id)
+            .select_from(PoliticoVotoFeed)
             .where(*base_filter)
         )
 
-        # ── Dados paginados ────────────────────────────────────────────────
+        # ── Dados paginados: página pelo índice, detalhes só das linhas dela ─
+        pagina = (
+            select(PoliticoVotoFeed.votacao_id, PoliticoVotoFeed.data, PoliticoVotoFeed.tipo_voto)
+            .where(*base_filter)
+            .order_by(PoliticoVotoFeed.data.desc(), PoliticoVotoFeed.votacao_id.desc())
+            .limit(safe_limit)
+            .offset(safe_offset)
+        ).subquery("pagina")
+
         stmt_data = (
             select(
-                Votacao.id.label("id_votacao"),
-                Votacao.data,
+                pagina.c.votacao_id.label("id_votacao"),
+                pagina.c.data,
                 Votacao.proposicao_id,
                 Proposicao.sigla_tipo.label("proposicao_sigla"),
                 Proposicao.numero.label("proposicao_numero"),
                 Proposicao.ano.label("proposicao_ano"),
                 Proposicao.ementa.label("proposicao_ementa"),
-                Voto.tipo_voto.label("voto"),
+                pagina.c.tipo_voto.label("voto"),
                 Votacao.aprovacao,
                 Votacao.tipo_votacao,
                 Votacao.sigla_orgao,
             )
-            .select_from(Voto)
-            .join(Votacao, Votacao.id == Voto.votacao_id)
+            .select_from(pagina)
+            .join(Votacao, Votacao.id == pagina.c.votacao_id)
             .outerjoin(Proposicao, Proposicao.id == Votacao.proposicao_id)
-            .where(*base_filter)
-            .order_by(desc(Votacao.data))
-            .limit(safe_limit)
-            .offset(safe_offset)
+            .order_by(pagina.c.data.desc(), pagina.c.votacao_id.desc())
         )
 
         try:
@@ -788,4 +761,26 @@ class PoliticoRepository:
             for p in proposicoes_orm
         ]
 
-        return proposicoes, total
\ No newline at end of file
+        return proposicoes, total
+
+    # ------------------------------------------------------------------
+    # Similaridade de votos
+    # ------------------------------------------------------------------
+
+    async def get_politicos_resumo_repo(self, politico_ids: list[int]) -> dict[int, dict]:
+        """`{id: {nome, uf, partido_sigla, url_foto}}` dos políticos informados."""
+        if not politico_ids:
+            return {}
+        stmt = (
+            select(Politico.id, Politico.nome, Politico.uf, Politico.partido_sigla, Politico.url_foto)
+            .where(Politico.id.in_(politico_ids))
+        )
+        try:
+            result = await self.db.execute(stmt)
+            return {
+                r.id: {"nome": r.nome, "uf": r.uf, "partido_sigla": r.partido_sigla, "url_foto": r.url_foto}
+                for r in result
+            }
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar resumo de políticos")
+            raise
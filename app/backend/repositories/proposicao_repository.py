@@ -11,28 +11,36 @@ Segurança (OWASP):
 """
 
 import logging
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import desc, func, select
+from sqlalchemy import desc, select, tuple_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
 from backend.models import (
     OrientacaoVotacao,
+    Politico,
     Proposicao,
     ProposicaoAutor,
     Tema,
     Tramitacao,
     Votacao,
+    VotacaoPlacar,
+    Voto,
 )
 from backend.schemas import (
     AutorResumo,
     OrientacaoPartido,
+    Placar,
+    PlacarGrupo,
     ProposicaoDetalhe,
     ProposicaoResponse,
     TemaResumo,
     TramitacaoItem,
     VotacaoDetalhe,
     VotacaoResponse,
+    VotoParlamentar,
+    VotosVotacaoResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,6 +48,17 @@ logger = logging.getLogger(__name__)
 # Limites máximos — defesa em profundidade (serviço também limita)
 _MAX_LIMIT_PROPOSICOES = 100
 _MAX_LIMIT_VOTACOES    = 100
+_MAX_LIMIT_VOTOS       = 513   # uma página cobre a Câmara inteira
+
+# Placar geral pré-calculado (colunas de votacoes) — entra em todo SELECT de votação
+_COLUNAS_PLACAR = (
+    Votacao.placar_sim,
+    Votacao.placar_nao,
+    Votacao.placar_abstencao,
+    Votacao.placar_obstrucao,
+    Votacao.placar_outros,
+    Votacao.placar_total,
+)
 
 
 class ProposicaoRepository:
@@ -85,6 +104,20 @@ class ProposicaoRepository:
             ],
         )
 
+    @staticmethod
+    def _build_placar(row) -> Placar | None:
+        """Placar geral a partir das colunas placar_* (None = sem votos nominais)."""
+        if row.placar_total is None:
+            return None
+        return Placar(
+            sim=row.placar_sim,
+            nao=row.placar_nao,
+            abstencao=row.placar_abstencao,
+            obstrucao=row.placar_obstrucao,
+            outros=row.placar_outros,
+            total=row.placar_total,
+        )
+
     @staticmethod
     def _build_votacao_response(row) -> VotacaoResponse:
         """
@@ -106,6 +139,7 @@ class ProposicaoRepository:
             proposicao_numero=row.proposicao_numero,
             proposicao_ano=row.proposicao_ano,
             proposicao_ementa=row.proposicao_ementa,
+            placar=ProposicaoRepository._build_placar(row),
         )
 
     # ------------------------------------------------------------------
@@ -276,6 +310,7 @@ class ProposicaoRepository:
                 Votacao.descricao,
                 Votacao.aprovacao,
                 Votacao.sigla_orgao,
+                *_COLUNAS_PLACAR,
                 # Campos da proposição (desnormalizados para o response)
                 Proposicao.id.label("proposicao_id"),
                 Proposicao.sigla_tipo.label("proposicao_sigla"),
@@ -335,6 +370,7 @@ class ProposicaoRepository:
                 Votacao.descricao,
                 Votacao.aprovacao,
                 Votacao.sigla_orgao,
+                *_COLUNAS_PLACAR,
                 Proposicao.id.label("proposicao_id"),
                 Proposicao.sigla_tipo.label("proposicao_sigla"),
                 Proposicao.numero.label("proposicao_numero"),
@@ -348,7 +384,7 @@ class ProposicaoRepository:
         )
 
         if ano is not None:
-            stmt = stmt.where(func.extract("year", Votacao.data) == ano)
+            stmt = stmt.where(Votacao.data.between(date(ano, 1, 1), date(ano, 12, 31)))
         if aprovacao is not None:
             stmt = stmt.where(Votacao.aprovacao == aprovacao)
         if sigla_tipo:
@@ -376,10 +412,12 @@ class ProposicaoRepository:
         Inclui:
           - Todos os campos de VotacaoResponse
           - orientacoes: como cada partido/bloco orientou o voto
+          - placar_por_partido / placar_por_uf: como os deputados votaram
 
-        Usa duas queries separadas:
-          1. SELECT na votacao + JOIN proposicao (para os campos desnormalizados)
-          2. SELECT nas orientacoes_votacao (para não gerar produto cartesiano)
+        Usa três queries separadas (para não gerar produto cartesiano):
+          1. SELECT na votacao + JOIN proposicao (campos desnormalizados e placar geral)
+          2. SELECT nas orientacoes_votacao
+          3. SELECT no votacao_placar (placar por partido e por UF, pré-calculado)
 
         Retorna None se não encontrado (o serviço lança 404).
         """
@@ -394,6 +432,7 @@ class ProposicaoRepository:
                 Votacao.descricao,
                 Votacao.aprovacao,
                 Votacao.sigla_orgao,
+                *_COLUNAS_PLACAR,
                 Proposicao.id.label("proposicao_id"),
                 Proposicao.sigla_tipo.label("proposicao_sigla"),
                 Proposicao.numero.label("proposicao_numero"),
@@ -415,9 +454,17 @@ class ProposicaoRepository:
             .order_by(OrientacaoVotacao.sigla_partido_bloco)
         )
 
+        # ── Query 3: placar por partido / UF ────────────────────────────
+        stmt_placar = (
+            select(VotacaoPlacar)
+            .where(VotacaoPlacar.votacao_id == votacao_id)
+            .order_by(VotacaoPlacar.grupo, VotacaoPlacar.total.desc(), VotacaoPlacar.chave)
+        )
+
         try:
             res_v = await self.db.execute(stmt_votacao)
             res_o = await self.db.execute(stmt_orientacoes)
+            res_p = await self.db.execute(stmt_placar)
         except SQLAlchemyError:
             logger.exception("Erro ao buscar votação id=%s", votacao_id)
             raise
@@ -435,6 +482,20 @@ class ProposicaoRepository:
             for o in res_o.mappings()
         ]
 
+        placar_por_grupo: dict[str, list[PlacarGrupo]] = {"partido": [], "uf": []}
+        for p in res_p.scalars():
+            placar_por_grupo.setdefault(p.grupo, []).append(
+                PlacarGrupo(
+                    sigla=p.chave,
+                    sim=p.sim,
+                    nao=p.nao,
+                    abstencao=p.abstencao,
+                    obstrucao=p.obstrucao,
+                    outros=p.outros,
+                    total=p.total,
+                )
+            )
+
         return VotacaoDetalhe(
             id=row.id,
             id_camara=row.id_camara,
@@ -450,4 +511,97 @@ class ProposicaoRepository:
             proposicao_ano=row.proposicao_ano,
             proposicao_ementa=row.proposicao_ementa,
             orientacoes=orientacoes,
-        )
\ No newline at end of file
+            placar=self._build_placar(row),
+            placar_por_partido=placar_por_grupo["partido"],
+            placar_por_uf=placar_por_grupo["uf"],
+        )
+
+    # ------------------------------------------------------------------
+    # Votações — votos individuais
+    # ------------------------------------------------------------------
+
+    async def get_votos_importados_repo(self, votacao_id: int) -> bool | None:
+        """`votos_importados` da votação (None se ela não existir)."""
+        try:
+            votacao = (
+                await self.db.execute(select(Votacao.votos_importados).where(Votacao.id == votacao_id))
+            ).first()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar votação id=%s", votacao_id)
+            raise
+        return None if votacao is None else bool(votacao.votos_importados)
+
+    async def politico_votou_repo(self, votacao_id: int, politico_id: int) -> bool:
+        """Se o político tem voto registrado na votação (valida o cursor `apos`)."""
+        try:
+            voto = await self.db.scalar(
+                select(Voto.id).where(Voto.votacao_id == votacao_id, Voto.politico_id == politico_id)
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao validar cursor da votação id=%s", votacao_id)
+            raise
+        return voto is not None
+
+    async def listar_votos_votacao_repo(
+        self,
+        votacao_id: int,
+        *,
+        sigla_partido: str | None = None,
+        sigla_uf: str | None = None,
+        tipo_voto: str | None = None,
+        apos: int | None = None,
+        limit: int = 100,
+    ) -> VotosVotacaoResponse | None:
+        """
+        Votos individuais de uma votação, ordenados por (nome, politico_id).
+
+        Paginação por keyset: `apos` é o politico_id do último item da página
+        anterior; a próxima página começa logo depois de (nome, id) dele. O custo
+        não cresce com a página, ao contrário do OFFSET.
+
+        Busca `limit + 1` linhas para saber se há próxima página sem COUNT.
+        Retorna None se a votação não existir (o serviço lança 404). O serviço
+        valida antes que `apos` votou nesta votação (politico_votou_repo).
+        """
+        safe_limit = min(limit, _MAX_LIMIT_VOTOS)
+
+        stmt = (
+            select(
+                Voto.politico_id,
+                Politico.nome,
+                Politico.url_foto,
+                Voto.sigla_partido,
+                Voto.sigla_uf,
+                Voto.tipo_voto,
+            )
+            .join(Politico, Politico.id == Voto.politico_id)
+            .where(Voto.votacao_id == votacao_id)
+        )
+
+        if sigla_partido:
+            stmt = stmt.where(Voto.sigla_partido == sigla_partido)
+        if sigla_uf:
+            stmt = stmt.where(Voto.sigla_uf == sigla_uf)
+        if tipo_voto:
+            stmt = stmt.where(Voto.tipo_voto == tipo_voto)
+        if apos is not None:
+            nome_cursor = select(Politico.nome).where(Politico.id == apos).scalar_subquery()
+            stmt = stmt.where(tuple_(Politico.nome, Politico.id) > tuple_(nome_cursor, apos))
+
+        stmt = stmt.order_by(Politico.nome, Politico.id).limit(safe_limit + 1)
+
+        try:
+            existe = await self.db.scalar(select(Votacao.id).where(Votacao.id == votacao_id))
+            if existe is None:
+                return None
+            rows = (await self.db.execute(stmt)).mappings().all()
+        except SQLAlchemyError:
+            logger.exception("Erro ao listar votos da votação id=%s", votacao_id)
+            raise
+
+        itens = [VotoParlamentar(**r) for r in rows[:safe_limit]]
+        return VotosVotacaoResponse(
+            votacao_id=votacao_id,
+            itens=itens,
+            proximo_cursor=itens[-1].politico_id if len(rows) > safe_limit else None,
+        )
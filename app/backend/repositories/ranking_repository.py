@@ -8,82 +8,58 @@ Segurança (OWASP):
 """
 
 import logging
-from collections import Counter, defaultdict
+from collections import defaultdict
 
-from sqlalchemy import Float, Integer, Numeric, String, case, cast, desc, extract, func, select, text
+from sqlalchemy import Float, Integer, Numeric, String, case, cast, desc, extract, func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import Despesa, Discurso, Politico, Presenca, Proposicao, ProposicaoAutor, Voto, Votacao
-from backend.schemas import KeywordInfo, RankingDespesaPolitico, RankingDiscursoPolitico, RankingEmpresaLucro
+from backend.models import CoesaoPartido, DespesaMensal, Discurso, DiscursoKeyword, FidelidadePolitico, Fornecedor, FornecedorTotal, PerformanceEstatistica, Politico, PoliticoPerformance, PresencaResumo, Proposicao, ProposicaoAutor, Voto, Votacao
+from backend.schemas import KeywordInfo, RankingAssiduidadePolitico, RankingCoesaoPartido, RankingDespesaPolitico, RankingDiscursoPolitico, RankingEmpresaLucro, RankingFidelidadePolitico
 
 logger = logging.getLogger(__name__)
 
 _MAX_LIMIT_RANKING   = 100
 _MAX_LIMIT_DISCURSOS = 500
-
-_BLACKLIST_KEYWORDS: frozenset = frozenset({
-    "ORIENTACAO DE BANCADA", "REQUERIMENTO DE URGENCIA", "ENCAMINHAMENTO DE VOTACAO",
-    "DISCUSSAO", "QUESTAO DE ORDEM", "VOTO FAVORAVEL", "VOTO CONTRARIO",
-    "FAVORAVEL", "CONTRARIO", "REQUERIMENTO DE DESTAQUE DE VOTACAO EM SEPARADO",
-    "SUBSTITUTIVO", "SEGUNDO TURNO", "PAUTA (PROCESSO LEGISLATIVO)", "DISPOSITIVO LEGAL",
-    "EMENDA DE PLENARIO", "PARECER (PROPOSICAO LEGISLATIVA)", "PARECER DO RELATOR",
-    "RELATOR", "PROJETO DE LEI DE CONVERSAO", "REQUERIMENTO", "APROVACAO", "ALTERACAO",
-    "PROPOSTA DE EMENDA A CONSTITUICAO", "PROJETO DE LEI COMPLEMENTAR",
-    "PROJETO DE LEI ORDINARIA", "MEDIDA PROVISORIA", "PROJETO DE LEI DO CONGRESSO NACIONAL",
-    "MPV 1095/2021", "DEPUTADO FEDERAL", "PRESIDENTE DA REPUBLICA",
-    "EX-PRESIDENTE DA REPUBLICA", "GOVERNO FEDERAL", "GOVERNO", "GOVERNO ESTADUAL",
-    "GOVERNADOR", "CONGRESSO NACIONAL", "SENADO FEDERAL", "SUPREMO TRIBUNAL FEDERAL (STF)",
-    "PODER JUDICIARIO", "BASE DE APOIO POLITICO", "MINORIA PARLAMENTAR",
-    "MAIORIA PARLAMENTAR", "OPOSICAO POLITICA", "VEREADOR",
-    "PARTIDO LIBERAL (PL)", "PARTIDO DOS TRABALHADORES (PT)", "PARTIDO NOVO (NOVO)",
-    "FEDERACAO PSOL REDE", "FEDERACAO BRASIL DA ESPERANCA (FE BRASIL)", "BLOCO PARLAMENTAR",
-    "CRITICA", "DEFESA", "HOMENAGEM", "MANIFESTACAO", "ATUACAO",
-    "ATUACAO PARLAMENTAR", "ANIVERSARIO DE EMANCIPACAO POLITICA", "CRIACAO",
-})
-
-_FORNECEDOR_DATA_FIX: dict = {
-    "TAM":                     {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
-    "LATAM AIRLINES BRASIL":   {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
-    "LATAM LINHAS AEREAS S.A": {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
-    "CIA AEREA - TAM":         {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
-    "GOL":                     {"cnpj": "07575651000159", "nome": "GOL"},
-    "GOL LINHAS AEREAS":       {"cnpj": "07575651000159", "nome": "GOL"},
-    "AZUL":                    {"cnpj": "09296295000160", "nome": "AZUL"},
-    "AZUL LINHAS AEREAS":      {"cnpj": "09296295000160", "nome": "AZUL"},
-}
+_TOP_KEYWORDS_DISCURSOS = 20
 
 # ---------------------------------------------------------------------------
 # Helpers internos — subqueries reutilizáveis
 # ---------------------------------------------------------------------------
 
+def _nota_assiduidade():
+    """
+    % de sessões com presença (2 casas; 0 sem sessões), agregado sobre presenca_resumo.
+    Mesma expressão do cálculo antigo sobre `presencas`, agora a partir dos contadores.
+    """
+    return func.coalesce(
+        func.round(
+            cast(
+                (
+                    func.sum(PresencaResumo.presencas).cast(Float)
+                    / func.nullif(func.sum(PresencaResumo.sessoes), 0)
+                )
+                * 100,
+                Numeric,
+            ),
+            2,
+        ),
+        0,
+    )
+
+
 def _sub_presenca(politico_id: int, ano: int | None = None):
     """Subquery de assiduidade, filtrável por ano."""
     q = (
         select(
-            Presenca.politico_id,
-            func.coalesce(
-                func.round(
-                    cast(
-                        (
-                            func.count(Presenca.id)
-                            .filter(Presenca.frequencia_sessao == "Presença")
-                            .cast(Float)
-                            / func.nullif(func.count(Presenca.id), 0)
-                        )
-                        * 100,
-                        Numeric,
-                    ),
-                    2,
-                ),
-                0,
-            ).label("nota_assiduidade"),
+            PresencaResumo.politico_id,
+            _nota_assiduidade().label("nota_assiduidade"),
         )
-        .where(Presenca.politico_id == politico_id)
+        .where(PresencaResumo.politico_id == politico_id)
     )
     if ano is not None:
-        q = q.where(extract("year", Presenca.data) == ano)
-    return q.group_by(Presenca.politico_id).subquery()
+        q = q.where(PresencaResumo.ano == ano)
+    return q.group_by(PresencaResumo.politico_id).subquery()
 
 
 def _sub_producao(politico_id: int, ano: int | None = None):
@@ -114,20 +90,20 @@ def _sub_producao(politico_id: int, ano: int | None = None):
 
 
 def _sub_gastos(politico_id: int, ano: int | None = None):
-    """Subquery de gastos e meses ativos, filtrável por ano."""
+    """Subquery de gastos e meses ativos, filtrável por ano (lida do rollup mensal)."""
     q = (
         select(
-            Despesa.politico_id,
-            func.sum(Despesa.valor_liquido).label("total_gasto"),
+            DespesaMensal.politico_id,
+            func.sum(DespesaMensal.total).label("total_gasto"),
             func.count(
-                func.distinct(Despesa.ano.cast(String) + "-" + Despesa.mes.cast(String))
+                func.distinct(DespesaMensal.ano.cast(String) + "-" + DespesaMensal.mes.cast(String))
             ).label("meses_mandato"),
         )
-        .where(Despesa.politico_id == politico_id)
+        .where(DespesaMensal.politico_id == politico_id)
     )
     if ano is not None:
-        q = q.where(Despesa.ano == ano)
-    return q.group_by(Despesa.politico_id).subquery()
+        q = q.where(DespesaMensal.ano == ano)
+    return q.group_by(DespesaMensal.politico_id).subquery()
 
 
 class RankingRepository:
@@ -155,9 +131,9 @@ class RankingRepository:
             select(
                 Politico.id.label("politico_id"),
                 Politico.nome,
-                func.coalesce(func.sum(Despesa.valor_liquido), 0).label("total_gasto"),
+                func.coalesce(func.sum(DespesaMensal.total), 0).label("total_gasto"),
             )
-            .join(Despesa, Despesa.politico_id == Politico.id)
+            .join(DespesaMensal, DespesaMensal.politico_id == Politico.id)
         )
 
         if uf:
@@ -186,6 +162,176 @@ class RankingRepository:
             logger.exception("Erro ao buscar ranking de despesas por politico")
             raise
 
+    # ------------------------------------------------------------------
+    # Ranking de assiduidade
+    # ------------------------------------------------------------------
+
+    async def get_ranking_assiduidade(
+        self,
+        *,
+        uf: str | None = None,
+        partido: str | None = None,
+        ano: int | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ) -> list[RankingAssiduidadePolitico]:
+        """
+        Parlamentares ordenados pelo % de presença nas sessões (mandato ou ano),
+        somando os contadores de presenca_resumo. Sem sessões no período, fica de fora.
+        Empates: mais sessões primeiro, depois o id.
+        """
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+
+        assiduidade = _nota_assiduidade()
+        sessoes = func.sum(PresencaResumo.sessoes)
+
+        stmt = (
+            select(
+                Politico.id.label("politico_id"),
+                Politico.nome,
+                Politico.uf,
+                Politico.partido_sigla,
+                Politico.url_foto,
+                sessoes.label("sessoes"),
+                func.sum(PresencaResumo.presencas).label("presencas"),
+                func.sum(PresencaResumo.ausencias).label("ausencias"),
+                func.sum(PresencaResumo.justificadas).label("justificadas"),
+                assiduidade.label("assiduidade_pct"),
+            )
+            .join(PresencaResumo, PresencaResumo.politico_id == Politico.id)
+        )
+
+        if uf:
+            stmt = stmt.where(Politico.uf == uf.upper()[:2])
+        if partido:
+            stmt = stmt.where(func.upper(Politico.partido_sigla) == partido.upper())
+        if ano is not None:
+            stmt = stmt.where(PresencaResumo.ano == ano)
+
+        ordem = assiduidade.asc() if order == "asc" else assiduidade.desc()
+        stmt = (
+            stmt.group_by(Politico.id)
+            .having(sessoes > 0)
+            .order_by(ordem, sessoes.desc(), Politico.id)
+            .limit(safe_limit)
+            .offset(safe_offset)
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar ranking de assiduidade")
+            raise
+
+        return [
+            RankingAssiduidadePolitico(**{**r, "assiduidade_pct": float(r["assiduidade_pct"])})
+            for r in result.mappings()
+        ]
+
+    # ------------------------------------------------------------------
+    # Fidelidade partidária e coesão
+    # ------------------------------------------------------------------
+
+    async def get_ranking_fidelidade(
+        self,
+        *,
+        uf: str | None = None,
+        partido: str | None = None,
+        ano: int | None = None,
+        min_votos: int = 1,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ) -> list[RankingFidelidadePolitico]:
+        """
+        Parlamentares ordenados pelo % de votos que seguiram a orientação do
+        partido (mandato ou ano), lidos de fidelidade_politico. `min_votos`
+        descarta quem votou pouco com orientação. Empates: mais votos orientados, depois o id.
+        """
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+
+        stmt = (
+            select(
+                Politico.id.label("politico_id"),
+                Politico.nome,
+                Politico.uf,
+                Politico.partido_sigla,
+                Politico.url_foto,
+                FidelidadePolitico.votos_orientados,
+                FidelidadePolitico.votos_fieis,
+                FidelidadePolitico.fidelidade_pct,
+            )
+            .join(FidelidadePolitico, FidelidadePolitico.politico_id == Politico.id)
+            .where(
+                FidelidadePolitico.ano == ano if ano is not None else FidelidadePolitico.ano.is_(None),
+                FidelidadePolitico.votos_orientados >= min_votos,
+            )
+        )
+
+        if uf:
+            stmt = stmt.where(Politico.uf == uf.upper()[:2])
+        if partido:
+            stmt = stmt.where(func.upper(Politico.partido_sigla) == partido.upper())
+
+        fidelidade = FidelidadePolitico.fidelidade_pct
+        ordem = fidelidade.asc() if order == "asc" else fidelidade.desc()
+        stmt = (
+            stmt.order_by(ordem, FidelidadePolitico.votos_orientados.desc(), Politico.id)
+            .limit(safe_limit)
+            .offset(safe_offset)
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar ranking de fidelidade partidaria")
+            raise
+
+        return [RankingFidelidadePolitico(**r) for r in result.mappings()]
+
+    async def get_ranking_coesao_partidos(
+        self,
+        *,
+        ano: int | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ) -> list[RankingCoesaoPartido]:
+        """
+        Partidos ordenados pela coesão média nas votações (mandato ou ano),
+        lidos de coesao_partido. Empates: mais votações, depois a sigla.
+        """
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+
+        coesao = CoesaoPartido.coesao_pct
+        ordem = coesao.asc().nulls_last() if order == "asc" else coesao.desc().nulls_last()
+        stmt = (
+            select(
+                CoesaoPartido.sigla_partido,
+                CoesaoPartido.votacoes,
+                CoesaoPartido.coesao_pct,
+                CoesaoPartido.votos_orientados,
+                CoesaoPartido.votos_fieis,
+                CoesaoPartido.fidelidade_pct,
+            )
+            .where(CoesaoPartido.ano == ano if ano is not None else CoesaoPartido.ano.is_(None))
+            .order_by(ordem, CoesaoPartido.votacoes.desc(), CoesaoPartido.sigla_partido)
+            .limit(safe_limit)
+            .offset(safe_offset)
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar ranking de coesao dos partidos")
+            raise
+
+        return [RankingCoesaoPartido(**r) for r in result.mappings()]
+
     # ------------------------------------------------------------------
     # Rankings de discursos
     # ------------------------------------------------------------------
@@ -224,10 +370,24 @@ class RankingRepository:
         if not politicos_ranking:
             return []
 
+        # Top 20 keywords por parlamentar, já normalizadas na ingestão (discurso_keywords)
         politico_ids = [r["politico_id"] for r in politicos_ranking]
-        stmt_kw = select(Discurso.politico_id, Discurso.keywords).where(
-            Discurso.politico_id.in_(politico_ids),
-            Discurso.keywords.is_not(None),
+        ordem_kw = (
+            func.row_number()
+            .over(
+                partition_by=DiscursoKeyword.politico_id,
+                order_by=(DiscursoKeyword.count.desc(), DiscursoKeyword.keyword),
+            )
+            .label("ordem")
+        )
+        sub_kw = (
+            select(DiscursoKeyword.politico_id, DiscursoKeyword.keyword, DiscursoKeyword.count, ordem_kw)
+            .where(DiscursoKeyword.politico_id.in_(politico_ids))
+        ).subquery()
+        stmt_kw = (
+            select(sub_kw.c.politico_id, sub_kw.c.keyword, sub_kw.c.count)
+            .where(sub_kw.c.ordem <= _TOP_KEYWORDS_DISCURSOS)
+            .order_by(sub_kw.c.politico_id, sub_kw.c.ordem)
         )
 
         try:
@@ -236,15 +396,11 @@ class RankingRepository:
             logger.exception("Erro ao buscar keywords dos discursos")
             raise
 
-        keywords_por_politico: dict[int, Counter] = {pid: Counter() for pid in politico_ids}
+        keywords_por_politico: dict[int, list[KeywordInfo]] = defaultdict(list)
         for row in kw_result:
-            tags = [
-                t.strip().upper()
-                for t in row.keywords.replace(";", ",").split(",")
-                if t.strip()
-            ]
-            tags_limpas = [t for t in tags if t not in _BLACKLIST_KEYWORDS and len(t) > 3]
-            keywords_por_politico[row.politico_id].update(tags_limpas)
+            keywords_por_politico[row.politico_id].append(
+                KeywordInfo(keyword=row.keyword, frequencia=row.count)
+            )
 
         return [
             RankingDiscursoPolitico(
@@ -253,10 +409,7 @@ class RankingRepository:
                 sigla_partido=r["sigla_partido"],
                 sigla_uf=r["sigla_uf"],
                 total_discursos=r["total_discursos"],
-                temas_mais_discutidos=[
-                    KeywordInfo(keyword=kw, frequencia=count)
-                    for kw, count in keywords_por_politico[r["politico_id"]].most_common(20)
-                ],
+                temas_mais_discutidos=keywords_por_politico[r["politico_id"]],
             )
             for r in politicos_ranking
         ]
@@ -273,25 +426,10 @@ class RankingRepository:
         """
         sub_presenca = (
             select(
-                Presenca.politico_id,
-                func.coalesce(
-                    func.round(
-                        cast(
-                            (
-                                func.count(Presenca.id)
-                                .filter(Presenca.frequencia_sessao == "Presença")
-                                .cast(Float)
-                                / func.nullif(func.count(Presenca.id), 0)
-                            )
-                            * 100,
-                            Numeric,
-                        ),
-                        2,
-                    ),
-                    0,
-                ).label("nota_assiduidade"),
+                PresencaResumo.politico_id,
+                _nota_assiduidade().label("nota_assiduidade"),
             )
-            .group_by(Presenca.politico_id)
+            .group_by(PresencaResumo.politico_id)
         ).subquery()
 
         sub_producao = (
@@ -315,15 +453,16 @@ class RankingRepository:
             .group_by(ProposicaoAutor.politico_id)
         ).subquery()
 
+        # Gastos do rollup mensal (escala com meses, não com notas fiscais)
         sub_gastos = (
             select(
-                Despesa.politico_id,
-                func.sum(Despesa.valor_liquido).label("total_gasto"),
+                DespesaMensal.politico_id,
+                func.sum(DespesaMensal.total).label("total_gasto"),
                 func.count(
-                    func.distinct(Despesa.ano.cast(String) + "-" + Despesa.mes.cast(String))
+                    func.distinct(DespesaMensal.ano.cast(String) + "-" + DespesaMensal.mes.cast(String))
                 ).label("meses_mandato"),
             )
-            .group_by(Despesa.politico_id)
+            .group_by(DespesaMensal.politico_id)
         ).subquery()
 
         stmt = (
@@ -350,6 +489,201 @@ class RankingRepository:
             logger.exception("Erro ao buscar dados de performance dos politicos")
             raise
 
+    # ------------------------------------------------------------------
+    # Performance — Câmara inteira por ano (matriz parlamentar × ano)
+    # ------------------------------------------------------------------
+
+    async def get_performance_anual_agrupada(self, anos: list[int] | None = None) -> dict[str, list]:
+        """
+        Dados brutos anuais de todos os parlamentares em uma passagem por dimensão:
+        presença, produção e gastos agrupados por (politico_id, ano).
+
+        Substitui N chamadas a get_performance_data_by_id(ano=...). A montagem
+        da matriz densa fica com performance_calc.MatrizAnual.
+
+        Returns:
+            {"politicos": [...], "presenca": [...], "producao": [...], "gastos": [...]}
+            — linhas de presença/produção/gastos com `politico_id` e `ano`.
+        """
+        stmt_presenca = (
+            select(
+                PresencaResumo.politico_id,
+                PresencaResumo.ano,
+                _nota_assiduidade().label("nota_assiduidade"),
+            )
+            .group_by(PresencaResumo.politico_id, PresencaResumo.ano)
+        )
+
+        stmt_producao = (
+            select(
+                ProposicaoAutor.politico_id,
+                Proposicao.ano.label("ano"),
+                func.sum(
+                    case(
+                        (
+                            Proposicao.sigla_tipo.in_(["PEC", "PL", "PLC", "PLP"]),
+                            case((ProposicaoAutor.proponente == True, 1.0), else_=0.2),
+                        ),
+                        (
+                            Proposicao.sigla_tipo.in_(["PDC", "PRC", "MPV"]),
+                            case((ProposicaoAutor.proponente == True, 0.5), else_=0.1),
+                        ),
+                        else_=case((ProposicaoAutor.proponente == True, 0.05), else_=0.01),
+                    )
+                ).label("pontos_producao"),
+            )
+            .select_from(ProposicaoAutor)
+            .join(Proposicao, Proposicao.id == ProposicaoAutor.proposicao_id)
+            .where(ProposicaoAutor.politico_id.is_not(None), Proposicao.ano.is_not(None))
+            .group_by(ProposicaoAutor.politico_id, Proposicao.ano)
+        )
+
+        stmt_gastos = (
+            select(
+                DespesaMensal.politico_id,
+                DespesaMensal.ano.label("ano"),
+                func.sum(DespesaMensal.total).label("total_gasto"),
+                func.count(func.distinct(DespesaMensal.mes)).label("meses_mandato"),
+            )
+            .group_by(DespesaMensal.politico_id, DespesaMensal.ano)
+        )
+
+        if anos:
+            stmt_presenca = stmt_presenca.where(PresencaResumo.ano.in_(anos))
+            stmt_producao = stmt_producao.where(Proposicao.ano.in_(anos))
+            stmt_gastos   = stmt_gastos.where(DespesaMensal.ano.in_(anos))
+
+        stmt_politicos = select(
+            Politico.id, Politico.nome, Politico.uf, Politico.partido_sigla, Politico.url_foto
+        ).order_by(Politico.id)
+
+        try:
+            politicos = (await self.db.execute(stmt_politicos)).mappings().all()
+            presenca  = (await self.db.execute(stmt_presenca)).mappings().all()
+            producao  = (await self.db.execute(stmt_producao)).mappings().all()
+            gastos    = (await self.db.execute(stmt_gastos)).mappings().all()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar performance anual agrupada")
+            raise
+
+        return {"politicos": politicos, "presenca": presenca, "producao": producao, "gastos": gastos}
+
+    # ------------------------------------------------------------------
+    # Performance — tabela pré-calculada (politico_performance)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _stmt_performance_precalculada(ano: int | None):
+        """SELECT base: linha pré-calculada + metadados atuais do parlamentar."""
+        stmt = (
+            select(
+                Politico.id,
+                Politico.nome,
+                Politico.uf,
+                Politico.partido_sigla,
+                Politico.url_foto,
+                PoliticoPerformance.score,
+                PoliticoPerformance.nota_assiduidade,
+                PoliticoPerformance.nota_producao,
+                PoliticoPerformance.nota_economia,
+                PoliticoPerformance.cota_mensal,
+                PoliticoPerformance.cota_total,
+                PoliticoPerformance.total_gasto,
+                PoliticoPerformance.meses_mandato,
+                PoliticoPerformance.cota_utilizada_pct,
+                # Entradas brutas (usadas pelo snapshot da simulação)
+                PoliticoPerformance.assiduidade_pct,
+                PoliticoPerformance.pontos_producao,
+                # Índice de posições
+                PoliticoPerformance.posicao,
+                PoliticoPerformance.percentil,
+                PoliticoPerformance.total_ranking,
+                PoliticoPerformance.posicao_uf,
+                PoliticoPerformance.total_uf,
+                PoliticoPerformance.posicao_partido,
+                PoliticoPerformance.total_partido,
+            )
+            .join(PoliticoPerformance, PoliticoPerformance.politico_id == Politico.id)
+        )
+        if ano is None:
+            return stmt.where(PoliticoPerformance.ano.is_(None))
+        return stmt.where(PoliticoPerformance.ano == ano)
+
+    async def get_ranking_performance_precalculado(self, *, ano: int | None = None) -> list:
+        """
+        Ranking já calculado pela ingestão, ordenado por score.
+        Lista vazia = tabela ainda não populada (o serviço cai no cálculo ao vivo).
+        """
+        stmt = (
+            self._stmt_performance_precalculada(ano)
+            .order_by(PoliticoPerformance.score.desc(), Politico.id)
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+            return result.mappings().all()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar performance pré-calculada")
+            raise
+
+    async def get_performance_precalculada_by_id(
+        self,
+        politico_id: int,
+        *,
+        ano: int | None = None,
+    ):
+        """Linha pré-calculada de um parlamentar (mandato ou ano), ou None."""
+        stmt = self._stmt_performance_precalculada(ano).where(Politico.id == politico_id)
+
+        try:
+            result = await self.db.execute(stmt)
+            return result.mappings().first()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar performance pré-calculada do político id=%s", politico_id)
+            raise
+
+    async def get_estatisticas_performance(self, *, ano: int | None = None) -> list:
+        """
+        Estatísticas pré-calculadas (geral, por UF e por partido) do mandato ou de um ano.
+        Lista vazia = tabela ainda não populada.
+        """
+        stmt = select(
+            PerformanceEstatistica.grupo,
+            PerformanceEstatistica.chave,
+            PerformanceEstatistica.total,
+            PerformanceEstatistica.media,
+            PerformanceEstatistica.mediana,
+        )
+        stmt = stmt.where(
+            PerformanceEstatistica.ano.is_(None) if ano is None else PerformanceEstatistica.ano == ano
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+            return result.mappings().all()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar estatísticas de performance")
+            raise
+
+    async def get_estatistica_geral_performance(self, *, ano: int | None = None):
+        """Linha "geral" (média/mediana da Câmara inteira) — uma única linha via índice único."""
+        stmt = select(
+            PerformanceEstatistica.total,
+            PerformanceEstatistica.media,
+            PerformanceEstatistica.mediana,
+        ).where(
+            PerformanceEstatistica.grupo == "geral",
+            PerformanceEstatistica.chave.is_(None),
+            PerformanceEstatistica.ano.is_(None) if ano is None else PerformanceEstatistica.ano == ano,
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+            return result.mappings().first()
+        except SQLAlchemyError:
+            logger.exception("Erro ao buscar estatística geral de performance")
+            raise
+
     # ------------------------------------------------------------------
     # Performance — parlamentar individual (com ou sem filtro de ano)
     # ------------------------------------------------------------------
@@ -419,49 +753,30 @@ class RankingRepository:
           - total_votacoes int  — votações participadas naquele ano
           - total_despesas int  — número de registros de despesa naquele ano
 
-        A query é feita em uma única passagem ao banco por dimensão
-        (presença, produção, gastos, votações) — sem N+1.
+        Uma única instrução (CTEs por dimensão, já unidas por ano) e uma única
+        ida ao banco — inclusive os metadados do parlamentar.
         """
-        # --- Anos disponíveis (âncora da timeline) ---
-        # Usa despesas como fonte principal de anos ativos; complementa com
-        # anos de presença para parlamentares sem despesas em algum período.
-        stmt_anos = (
-            select(Despesa.ano.label("ano"))
-            .where(Despesa.politico_id == politico_id)
+        # --- Anos disponíveis (âncora da timeline): anos com despesa ---
+        cte_anos = (
+            select(DespesaMensal.ano.label("ano"))
+            .where(DespesaMensal.politico_id == politico_id)
             .distinct()
-            .order_by(Despesa.ano)
-        )
+        ).cte("anos")
 
         # --- Assiduidade por ano ---
-        _ano_presenca = extract("year", Presenca.data).cast(Integer).label("ano")
-        stmt_presenca = (
+        cte_presenca = (
             select(
-                _ano_presenca,
-                func.coalesce(
-                    func.round(
-                        cast(
-                            (
-                                func.count(Presenca.id)
-                                .filter(Presenca.frequencia_sessao == "Presença")
-                                .cast(Float)
-                                / func.nullif(func.count(Presenca.id), 0)
-                            )
-                            * 100,
-                            Numeric,
-                        ),
-                        2,
-                    ),
-                    0,
-                ).label("nota_assiduidade"),
+                PresencaResumo.ano,
+                _nota_assiduidade().label("nota_assiduidade"),
             )
-            .where(Presenca.politico_id == politico_id)
-            .group_by(_ano_presenca)
-        )
+            .where(PresencaResumo.politico_id == politico_id)
+            .group_by(PresencaResumo.ano)
+        ).cte("presenca")
 
         # --- Produção ponderada por ano ---
         # select_from(ProposicaoAutor) é obrigatório: o lado esquerdo do JOIN
         # é ProposicaoAutor, mas o SELECT começa com Proposicao.ano.
-        stmt_producao = (
+        cte_producao = (
             select(
                 Proposicao.ano.label("ano"),
                 func.sum(
@@ -482,87 +797,86 @@ class RankingRepository:
             .join(Proposicao, Proposicao.id == ProposicaoAutor.proposicao_id)
             .where(ProposicaoAutor.politico_id == politico_id)
             .group_by(Proposicao.ano)
-        )
+        ).cte("producao")
 
-        # --- Gastos, meses ativos e total de despesas por ano ---
-        stmt_gastos = (
+        # --- Gastos, meses ativos e total de despesas por ano (rollup mensal) ---
+        cte_gastos = (
             select(
-                Despesa.ano.label("ano"),
-                func.sum(Despesa.valor_liquido).label("total_gasto"),
-                func.count(func.distinct(Despesa.mes)).label("meses_ativos"),
-                func.count(Despesa.id).label("total_despesas"),
+                DespesaMensal.ano.label("ano"),
+                func.sum(DespesaMensal.total).label("total_gasto"),
+                func.count(func.distinct(DespesaMensal.mes)).label("meses_ativos"),
+                func.sum(DespesaMensal.quantidade).label("total_despesas"),
             )
-            .where(Despesa.politico_id == politico_id)
-            .group_by(Despesa.ano)
-        )
+            .where(DespesaMensal.politico_id == politico_id)
+            .group_by(DespesaMensal.ano)
+        ).cte("gastos")
 
         # --- Votações por ano ---
         # select_from(Voto) garante que o JOIN parte da tabela correta.
-        _ano_voto = extract("year", Votacao.data).cast(Integer).label("ano")
-        stmt_votos = (
+        _ano_voto = extract("year", Votacao.data).cast(Integer)
+        cte_votos = (
             select(
-                _ano_voto,
+                _ano_voto.label("ano"),
                 func.count(Voto.id).label("total_votacoes"),
             )
             .select_from(Voto)
             .join(Votacao, Votacao.id == Voto.votacao_id)
             .where(Voto.politico_id == politico_id)
             .group_by(_ano_voto)
+        ).cte("votos")
+
+        # --- Merge por ano + metadados do parlamentar (uf, partido, foto) ---
+        stmt = (
+            select(
+                cte_anos.c.ano,
+                Politico.id,
+                Politico.nome,
+                Politico.uf,
+                Politico.partido_sigla,
+                Politico.url_foto,
+                func.coalesce(cte_presenca.c.nota_assiduidade, 0).label("nota_assiduidade"),
+                func.coalesce(cte_producao.c.pontos_producao,  0).label("pontos_producao"),
+                func.coalesce(cte_gastos.c.total_gasto,        0).label("total_gasto"),
+                func.coalesce(cte_gastos.c.meses_ativos,       1).label("meses_ativos"),
+                func.coalesce(cte_gastos.c.total_despesas,     0).label("total_despesas"),
+                func.coalesce(cte_votos.c.total_votacoes,      0).label("total_votacoes"),
+            )
+            .select_from(cte_anos)
+            .join(Politico, Politico.id == politico_id)
+            .outerjoin(cte_presenca, cte_presenca.c.ano == cte_anos.c.ano)
+            .outerjoin(cte_producao, cte_producao.c.ano == cte_anos.c.ano)
+            .outerjoin(cte_gastos,   cte_gastos.c.ano   == cte_anos.c.ano)
+            .outerjoin(cte_votos,    cte_votos.c.ano    == cte_anos.c.ano)
+            .order_by(cte_anos.c.ano)
         )
 
         try:
-            res_anos     = await self.db.execute(stmt_anos)
-            res_presenca = await self.db.execute(stmt_presenca)
-            res_producao = await self.db.execute(stmt_producao)
-            res_gastos   = await self.db.execute(stmt_gastos)
-            res_votos    = await self.db.execute(stmt_votos)
+            result = await self.db.execute(stmt)
+            rows = result.mappings().all()
         except SQLAlchemyError:
             logger.exception("Erro ao buscar timeline do político id=%s", politico_id)
             raise
 
-        # Busca metadados do parlamentar (uf, partido, foto) — necessários para calcular_score
-        politico = await self.db.get(Politico, politico_id)
-        if not politico:
-            return []
-
-        # Indexa por ano para merge O(1)
-        presenca_por_ano  = {int(r.ano): float(r.nota_assiduidade) for r in res_presenca}
-        producao_por_ano  = {int(r.ano): float(r.pontos_producao)  for r in res_producao}
-        gastos_por_ano    = {
-            int(r.ano): {
-                "total_gasto":    float(r.total_gasto or 0),
-                "meses_ativos":   int(r.meses_ativos or 1),
-                "total_despesas": int(r.total_despesas or 0),
-            }
-            for r in res_gastos
-        }
-        votos_por_ano = {int(r.ano): int(r.total_votacoes) for r in res_votos}
-
-        anos = sorted({int(r.ano) for r in res_anos})
-
-        resultado = []
-        for ano in anos:
-            gastos    = gastos_por_ano.get(ano, {"total_gasto": 0.0, "meses_ativos": 1, "total_despesas": 0})
-            raw_entry = {
-                "id":              politico.id,
-                "nome":            politico.nome,
-                "uf":              politico.uf,
-                "partido_sigla":   politico.partido_sigla,
-                "url_foto":        politico.url_foto,
-                "nota_assiduidade": presenca_por_ano.get(ano, 0.0),
-                "pontos_producao":  producao_por_ano.get(ano, 0.0),
-                "total_gasto":      gastos["total_gasto"],
-                # meses_mandato aqui = meses com despesa naquele ano (1–12)
-                "meses_mandato":    gastos["meses_ativos"],
+        return [
+            {
+                "ano": int(r["ano"]),
+                "raw": {
+                    "id":               r["id"],
+                    "nome":             r["nome"],
+                    "uf":               r["uf"],
+                    "partido_sigla":    r["partido_sigla"],
+                    "url_foto":         r["url_foto"],
+                    "nota_assiduidade": float(r["nota_assiduidade"]),
+                    "pontos_producao":  float(r["pontos_producao"]),
+                    "total_gasto":      float(r["total_gasto"]),
+                    # meses_mandato aqui = meses com despesa naquele ano (1–12)
+                    "meses_mandato":    int(r["meses_ativos"]),
+                },
+                "total_votacoes": int(r["total_votacoes"]),
+                "total_despesas": int(r["total_despesas"]),
             }
-            resultado.append({
-                "ano":             ano,
-                "raw":             raw_entry,
-                "total_votacoes":  votos_por_ano.get(ano, 0),
-                "total_despesas":  gastos["total_despesas"],
-            })
-
-        return resultado
+            for r in rows
+        ]
 
     # ------------------------------------------------------------------
     # Empresas
@@ -577,15 +891,18 @@ class RankingRepository:
         safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
         safe_offset = max(offset, 0)
 
+        # Agregado pré-calculado na ingestão (injest_fornecedores): leitura indexada,
+        # paginação exata no banco
         stmt = (
             select(
-                func.coalesce(Despesa.cnpj_cpf_fornecedor, "").label("cnpj"),
-                func.upper(func.trim(Despesa.nome_fornecedor)).label("nome_bruto"),
-                func.sum(Despesa.valor_liquido).label("total"),
+                func.coalesce(Fornecedor.cnpj, "").label("cnpj"),
+                Fornecedor.nome.label("nome_fornecedor"),
+                FornecedorTotal.total_recebido,
             )
-            .group_by(text("cnpj"), text("nome_bruto"))
-            .order_by(desc("total"))
-            .limit(safe_limit * 3)
+            .join(Fornecedor, Fornecedor.id == FornecedorTotal.fornecedor_id)
+            .order_by(FornecedorTotal.total_recebido.desc(), Fornecedor.id)
+            .limit(safe_limit)
+            .offset(safe_offset)
         )
 
         try:
@@ -594,38 +911,11 @@ class RankingRepository:
             logger.exception("Erro ao buscar ranking de empresas")
             raise
 
-        processed_data: dict[str, float] = defaultdict(float)
-        names_map: dict[str, dict]       = {}
-
-        for r in result.mappings():
-            nome_bruto: str = r["nome_bruto"]
-            cnpj_db: str    = r["cnpj"]
-
-            fix = _FORNECEDOR_DATA_FIX.get(nome_bruto)
-            if fix:
-                cnpj_final = fix["cnpj"]
-                nome_final = fix["nome"]
-            else:
-                cnpj_final = cnpj_db
-                nome_final = nome_bruto
-
-            key = cnpj_final if cnpj_final else f"NOCNPJ_{nome_final}"
-            processed_data[key] += float(r["total"])
-
-            if key not in names_map:
-                names_map[key] = {"cnpj": cnpj_final, "nome": nome_final}
-
-        ranking = sorted(
-            [
-                RankingEmpresaLucro(
-                    cnpj=info["cnpj"],
-                    nome_fornecedor=info["nome"],
-                    total_recebido=processed_data[key],
-                )
-                for key, info in names_map.items()
-            ],
-            key=lambda x: x.total_recebido,
-            reverse=True,
-        )
-
-        return ranking[safe_offset : safe_offset + safe_limit]
\ No newline at end of file
+        return [
+            RankingEmpresaLucro(
+                cnpj=r["cnpj"],
+                nome_fornecedor=r["nome_fornecedor"],
+                total_recebido=float(r["total_recebido"]),
+            )
+            for r in result.mappings()
+        ]
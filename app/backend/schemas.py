@@ -54,6 +54,17 @@ class PoliticoVoto(BaseModel):
     class Config:
         from_attributes = True
 
+class PoliticoSimilar(BaseModel):
+    """Parlamentar que vota como outro (GET /politicos/{id}/similares)."""
+    politico_id: int
+    nome: str
+    uf: str | None = None
+    partido_sigla: str | None = None
+    url_foto: str | None = None
+    votacoes_comuns: int        # votações nominais em que ambos votaram
+    votos_iguais: int
+    concordancia_pct: float     # votos_iguais / votacoes_comuns × 100
+
 class ItemRanking(BaseModel):
     nome: str
     total: float
@@ -123,6 +134,62 @@ class RankingDespesaPolitico(BaseModel):
     nome: str
     total_gasto: float
 
+class RankingAssiduidadePolitico(BaseModel):
+    politico_id: int
+    nome: str
+    uf: str | None = None
+    partido_sigla: str | None = None
+    url_foto: str | None = None
+    sessoes: int
+    presencas: int
+    ausencias: int
+    justificadas: int
+    assiduidade_pct: float
+
+class RankingFidelidadePolitico(BaseModel):
+    politico_id: int
+    nome: str
+    uf: str | None = None
+    partido_sigla: str | None = None
+    url_foto: str | None = None
+    votos_orientados: int
+    votos_fieis: int
+    fidelidade_pct: float
+
+class RankingCoesaoPartido(BaseModel):
+    sigla_partido: str
+    votacoes: int
+    coesao_pct: float | None = None       # média do índice de Rice (0-100)
+    votos_orientados: int
+    votos_fieis: int
+    fidelidade_pct: float | None = None   # % dos votos dos membros que seguiram a orientação
+
+# Rankings do snapshot analítico (Parquet + DuckDB)
+class RankingDespesaCategoria(BaseModel):
+    tipo_despesa: str
+    total_gasto: float
+    documentos: int
+    parlamentares: int
+
+class RankingAutoriaPolitico(BaseModel):
+    politico_id: int
+    nome: str
+    uf: str | None = None
+    partido_sigla: str | None = None
+    url_foto: str | None = None
+    proposicoes: int                # proposições de que é autor ou coautor
+    como_primeiro_autor: int        # das quais assina em primeiro lugar
+
+class RankingParticipacaoVotacoes(BaseModel):
+    politico_id: int
+    nome: str
+    uf: str | None = None
+    partido_sigla: str | None = None
+    url_foto: str | None = None
+    votacoes: int                   # votações nominais entre o primeiro e o último voto dele no período
+    votos: int                      # das quais registrou voto
+    participacao_pct: float         # votos / votacoes × 100
+
 class RankingEmpresaLucro(BaseModel):
     cnpj: str
     nome_fornecedor: str
@@ -141,6 +208,57 @@ class RankingDiscursoPolitico(BaseModel):
     temas_mais_discutidos: List[KeywordInfo]
 
 
+class NotasPerformance(BaseModel):
+    assiduidade: float
+    producao: float
+    economia: float
+
+
+class PesosSimulacao(BaseModel):
+    # Pesos efetivamente usados (normalizados para somar 1)
+    assiduidade: float
+    economia: float
+    producao: float
+
+
+class RankingSimulacaoItem(BaseModel):
+    posicao: int
+    percentil: float
+    id: int
+    nome: str
+    uf: Optional[str] = None
+    partido: Optional[str] = None
+    foto: Optional[str] = None
+    score: float
+    notas: NotasPerformance
+
+
+class RankingSimulacaoResponse(BaseModel):
+    pesos: PesosSimulacao
+    meta_producao_mes: float
+    total: int
+    limit: int
+    offset: int
+    itens: List[RankingSimulacaoItem]
+
+
+class NotasTimelineMatriz(BaseModel):
+    # Linhas alinhadas com `ids`, colunas alinhadas com `anos`
+    assiduidade: List[List[Optional[float]]]
+    producao: List[List[Optional[float]]]
+    economia: List[List[Optional[float]]]
+
+
+class TimelineMatrizResponse(BaseModel):
+    anos: List[int]
+    ids: List[int]
+    nomes: List[str]
+    ufs: List[Optional[str]]
+    partidos: List[Optional[str]]
+    score: List[List[Optional[float]]]   # null = sem despesa no ano (âncora da timeline)
+    notas: NotasTimelineMatriz
+
+
 # =============================================================================
 # SCHEMAS — Proposições e Votações
 # =============================================================================
@@ -298,6 +416,24 @@ class OrientacaoPartido(BaseModel):
         from_attributes = True
 
 
+class Placar(BaseModel):
+    """
+    Contagem de votos nominais de uma votação (calculada na ingestão).
+    `outros` reúne Art. 17 e demais tipos de voto.
+    """
+    sim: int = 0
+    nao: int = 0
+    abstencao: int = 0
+    obstrucao: int = 0
+    outros: int = 0
+    total: int = 0
+
+
+class PlacarGrupo(Placar):
+    """Placar de um partido ou UF (sigla do voto no momento da votação)."""
+    sigla: Optional[str] = None
+
+
 class VotacaoResponse(BaseModel):
     """
     Schema de listagem de votações.
@@ -326,6 +462,9 @@ class VotacaoResponse(BaseModel):
     proposicao_ano: Optional[int] = None
     proposicao_ementa: Optional[str] = None
 
+    # Placar geral (None = votação sem votos nominais)
+    placar: Optional[Placar] = None
+
     class Config:
         from_attributes = True
 
@@ -333,16 +472,51 @@ class VotacaoResponse(BaseModel):
 class VotacaoDetalhe(VotacaoResponse):
     """
     Schema de detalhe de uma votação.
-    Retornado por GET /votacoes/{id} — inclui orientações por partido.
+    Retornado por GET /votacoes/{id} — inclui orientações e placar por partido.
 
     Herda todos os campos de VotacaoResponse e adiciona:
-      - orientacoes: como cada partido/bloco orientou o voto dos seus membros
+      - orientacoes:        como cada partido/bloco orientou o voto dos seus membros
+      - placar_por_partido: como os deputados de cada partido efetivamente votaram
+      - placar_por_uf:      idem, por UF
     """
     orientacoes: List[OrientacaoPartido] = []
+    placar_por_partido: List[PlacarGrupo] = []
+    placar_por_uf: List[PlacarGrupo] = []
 
     class Config:
         from_attributes = True
 
+
+class VotoParlamentar(BaseModel):
+    """
+    Voto de um deputado em uma votação, com o resumo do político.
+    Retornado por GET /votacoes/{id}/votos.
+
+    `sigla_partido` / `sigla_uf` são os registrados no voto (momento da votação),
+    não os atuais do político.
+    """
+    politico_id: int
+    nome: str
+    url_foto: Optional[str] = None
+    sigla_partido: Optional[str] = None
+    sigla_uf: Optional[str] = None
+    tipo_voto: Optional[str] = None           # "Sim", "Não", "Abstenção", "Obstrução", "Art. 17"...
+
+    class Config:
+        from_attributes = True
+
+
+class VotosVotacaoResponse(BaseModel):
+    """
+    Página de votos individuais de uma votação (ordem: nome do político).
+
+    Paginação por cursor (keyset): para a próxima página, repita a requisição
+    com `apos=<proximo_cursor>`. `proximo_cursor` é None na última página.
+    """
+    votacao_id: int
+    itens: List[VotoParlamentar] = []
+    proximo_cursor: Optional[int] = None
+
 class ProposicaoAutorResumo(BaseModel):
     politico_id: Optional[int] = None
     nome: str
@@ -0,0 +1,127 @@
+"""
+analitico.py — Snapshot analítico em Parquet consultado com DuckDB embutido.
+
+A ingestão (injest_banco/injest_analitico.py) exporta as tabelas grandes para
+Parquet particionado por ano em PASTA_ANALITICO:
+
+    despesas/ano=2025/*.parquet       votos/ano=2025/*.parquet
+    presencas/ano=2025/*.parquet      proposicoes_autores/ano=2025/*.parquet
+    politicos.parquet                 manifesto.json
+
+A API abre esses arquivos com um DuckDB em memória, por processo: varreduras e
+agregações pesadas rodam sobre arquivos colunares locais, fora do Postgres que
+atende as leituras pontuais. Filtro por ano lê só a partição correspondente.
+
+Segurança (OWASP):
+  - A01 / SQL Injection: consultas com parâmetros nomeados ($nome); só o caminho
+    da pasta (configuração do servidor) entra no texto das views.
+  - A04 / Insecure Design: threads e memória do DuckDB limitadas por configuração;
+    troca de versão serializada por lock.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+# Pasta do snapshot (relativa ao diretório de execução, como app/)
+PASTA_ANALITICO = os.getenv("ANALITICO_DIR", "dados/analitico")
+
+# Limites do DuckDB por processo da API
+_THREADS = int(os.getenv("ANALITICO_THREADS", "2"))
+_MEMORIA = os.getenv("ANALITICO_MEMORIA", "512MB")
+
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Tabelas particionadas por ano (cada uma vira uma view de mesmo nome)
+TABELAS_PARTICIONADAS = ("despesas", "votos", "presencas", "proposicoes_autores")
+# Dimensão pequena, arquivo único
+TABELA_POLITICOS = "politicos"
+
+
+class SnapshotIndisponivel(Exception):
+    """O snapshot ainda não foi exportado (ou está incompleto)."""
+
+
+def versao(pasta: str = PASTA_ANALITICO) -> int | None:
+    """mtime (ns) do manifesto — gravado por último na exportação (None se não existe)."""
+    try:
+        return os.stat(os.path.join(pasta, ARQUIVO_MANIFESTO)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def manifesto(pasta: str = PASTA_ANALITICO) -> dict | None:
+    """Conteúdo do manifesto (data da exportação e linhas por tabela)."""
+    try:
+        with open(os.path.join(pasta, ARQUIVO_MANIFESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Conexão DuckDB residente
+# ---------------------------------------------------------------------------
+
+_conexao: duckdb.DuckDBPyConnection | None = None
+_versao: int | None = None
+_lock = threading.Lock()
+
+
+def _literal(caminho: str) -> str:
+    return "'" + caminho.replace("'", "''") + "'"
+
+
+def _abrir(pasta: str) -> duckdb.DuckDBPyConnection:
+    """Conexão em memória com uma view por tabela do snapshot."""
+    con = duckdb.connect(database=":memory:")
+    con.execute(f"SET threads = {_THREADS}")
+    con.execute(f"SET memory_limit = {_literal(_MEMORIA)}")
+
+    for tabela in TABELAS_PARTICIONADAS:
+        arquivos = os.path.join(pasta, tabela, "*", "*.parquet")
+        con.execute(
+            f"CREATE VIEW {tabela} AS "
+            f"SELECT * FROM read_parquet({_literal(arquivos)}, hive_partitioning = true)"
+        )
+    arquivo = os.path.join(pasta, f"{TABELA_POLITICOS}.parquet")
+    con.execute(f"CREATE VIEW {TABELA_POLITICOS} AS SELECT * FROM read_parquet({_literal(arquivo)})")
+    return con
+
+
+def _obter_conexao() -> duckdb.DuckDBPyConnection:
+    """Conexão da versão atual do snapshot; reabre quando a ingestão exporta outra."""
+    global _conexao, _versao
+
+    atual = versao()
+    if atual is None:
+        raise SnapshotIndisponivel(PASTA_ANALITICO)
+
+    with _lock:
+        if _conexao is None or _versao != atual:
+            _conexao = _abrir(PASTA_ANALITICO)
+            _versao = atual
+            logger.info("Snapshot analitico aberto: %s", manifesto() or PASTA_ANALITICO)
+        return _conexao
+
+
+def _executar(sql: str, parametros: dict) -> list[dict]:
+    # Cursor = conexão própria sobre o mesmo banco: seguro entre threads
+    with _obter_conexao().cursor() as cur:
+        cur.execute(sql, parametros)
+        colunas = [c[0] for c in cur.description]
+        return [dict(zip(colunas, linha)) for linha in cur.fetchall()]
+
+
+async def consultar(sql: str, parametros: dict | None = None) -> list[dict]:
+    """
+    Executa a consulta numa thread (DuckDB é síncrono) e retorna as linhas como dicts.
+    Levanta SnapshotIndisponivel se a exportação ainda não rodou.
+    """
+    return await asyncio.to_thread(_executar, sql, parametros or {})
@@ -0,0 +1,98 @@
+"""
+fidelidade_calc.py — Motor vetorizado de fidelidade partidária e coesão.
+
+Importado por injest_banco/injest_fidelidade.py, que grava o resultado em
+politico_votos_feed.fiel e coesao_votacao; a API só lê as tabelas agregadas.
+
+Votos e orientações viram códigos int8 (VOTO_*), então um lote com todos os
+votos de centenas de votações cabe em poucos arrays e o cálculo é feito
+sem laço Python:
+
+  - fidelidade: o voto seguiu a orientação do próprio partido naquela votação?
+    Só conta quando há orientação Sim/Não/Abstenção/Obstrução ("Libera" e
+    ausência de orientação ficam de fora) e o voto é um desses quatro tipos
+    (Art. 17 — presidente da sessão — e demais também ficam de fora);
+  - coesão: índice de Rice |sim - não| / (sim + não) de cada partido em cada
+    votação — 1 = bancada unânime, 0 = dividida ao meio.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Códigos de voto/orientação (int8)
+# ---------------------------------------------------------------------------
+VOTO_OUTRO      = 0   # Art. 17, "Libera", vazio...
+VOTO_SIM        = 1
+VOTO_NAO        = 2
+VOTO_ABSTENCAO  = 3
+VOTO_OBSTRUCAO  = 4
+
+_CODIGOS: dict[str, int] = {
+    "SIM":        VOTO_SIM,
+    "NÃO":        VOTO_NAO,
+    "NAO":        VOTO_NAO,
+    "ABSTENÇÃO":  VOTO_ABSTENCAO,
+    "ABSTENCAO":  VOTO_ABSTENCAO,
+    "OBSTRUÇÃO":  VOTO_OBSTRUCAO,
+    "OBSTRUCAO":  VOTO_OBSTRUCAO,
+}
+
+# Resultado de calcular_fidelidade
+SEM_ORIENTACAO = -1
+
+
+def codigo_voto(valor: str | None) -> int:
+    """Código int8 de um tipo de voto ou orientação ("Sim", "Não"...)."""
+    return _CODIGOS.get((valor or "").strip().upper(), VOTO_OUTRO)
+
+
+def codificar(valores: Sequence[str | None]) -> np.ndarray:
+    """Array int8 com o código de cada voto/orientação."""
+    return np.fromiter((codigo_voto(v) for v in valores), dtype=np.int8, count=len(valores))
+
+
+def siglas_orientacao(sigla_partido_bloco: str | None) -> list[str]:
+    """
+    Partidos a que uma orientação se aplica: a própria sigla ou, para
+    federações ("Fdr PT-PCdoB-PV"), cada partido membro. Blocos e lideranças
+    (Governo, Maioria...) não batem com a sigla de nenhum voto e são ignorados.
+    """
+    sigla = (sigla_partido_bloco or "").strip().upper()
+    if sigla.startswith("FDR "):
+        return [p.strip() for p in sigla[4:].split("-") if p.strip()]
+    return [sigla] if sigla else []
+
+
+def calcular_fidelidade(voto: np.ndarray, orientacao: np.ndarray) -> np.ndarray:
+    """
+    Para cada voto (alinhado com a orientação do partido do votante):
+    1 = seguiu, 0 = não seguiu, SEM_ORIENTACAO = não se aplica.
+    """
+    fiel = (voto == orientacao).astype(np.int8)
+    fiel[(orientacao == VOTO_OUTRO) | (voto == VOTO_OUTRO)] = SEM_ORIENTACAO
+    return fiel
+
+
+def calcular_coesao(grupo: np.ndarray, voto: np.ndarray, fiel: np.ndarray, n_grupos: int) -> dict[str, np.ndarray]:
+    """
+    Contadores por grupo (votação × partido, índices 0..n_grupos-1) com bincount.
+    `rice` é NaN nos grupos sem votos Sim/Não.
+    """
+    def contar(mascara: np.ndarray) -> np.ndarray:
+        return np.bincount(grupo[mascara], minlength=n_grupos)
+
+    sim = contar(voto == VOTO_SIM)
+    nao = contar(voto == VOTO_NAO)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rice = np.abs(sim - nao) / (sim + nao)
+
+    return {
+        "votos":            contar(voto != VOTO_OUTRO),
+        "sim":              sim,
+        "nao":              nao,
+        "votos_orientados": contar(fiel != SEM_ORIENTACAO),
+        "votos_fieis":      contar(fiel == 1),
+        "rice":             rice,
+    }
@@ -0,0 +1,214 @@
+"""
+matriz_votos.py — Matriz parlamentar × votação com votos em 2 bits.
+
+Cada voto nominal vira um código de 2 bits (4 votos por byte):
+
+    0 = não votou / Art. 17    1 = Sim    2 = Não    3 = Abstenção ou Obstrução
+
+Com ~600 parlamentares e ~10 mil votações a matriz inteira ocupa ~1,5 MB,
+então "quem vota como X" é uma comparação de X contra todas as linhas de uma
+vez, com operações bit a bit e contagem de bits por tabela (sem SQL sobre `votos`).
+
+Persistência: `.npy` em MATRIZ_VOTOS_DIR, gravado pela ingestão
+(injest_banco/injest_matriz_votos.py) e aberto pela API com memory-map —
+os processos da API compartilham as páginas do arquivo em vez de copiar a matriz.
+Novas votações viram colunas novas (acrescentar); as existentes não são relidas.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.services.fidelidade_calc import codificar
+
+logger = logging.getLogger(__name__)
+
+# Pasta dos arquivos da matriz (relativa ao diretório de execução, como app/)
+PASTA_MATRIZ = os.getenv("MATRIZ_VOTOS_DIR", "dados/matriz_votos")
+
+_ARQUIVO_BITS = "votos_bits.npy"
+_ARQUIVO_IDS  = "votos_ids.npz"
+
+VOTOS_POR_BYTE = 4
+_MASCARA_BAIXA = np.uint8(0b01010101)  # bit menos significativo de cada campo de 2 bits
+
+# Bits ligados de cada byte (contagem por tabela — np.bitwise_count só existe no NumPy 2)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def codigos_2bits(tipos_voto: list[str | None]) -> np.ndarray:
+    """Tipos de voto ("Sim", "Não"...) → códigos 0-3 (Abstenção e Obstrução juntas no 3)."""
+    return np.minimum(codificar(tipos_voto), 3).astype(np.uint8)
+
+
+@dataclass
+class MatrizVotos:
+    """
+    `bits[i]` é a linha do parlamentar `politico_ids[i]`; a coluna j (votação
+    `votacao_ids[j]`) fica no byte j // 4, bits 2·(j % 4) e 2·(j % 4) + 1.
+    """
+
+    politico_ids: np.ndarray   # int64, ordem de inclusão
+    votacao_ids: np.ndarray    # int64, ordem de inclusão (= ordem das colunas)
+    bits: np.ndarray           # uint8, (n_politicos, ceil(n_votacoes / 4))
+
+    @classmethod
+    def vazia(cls) -> "MatrizVotos":
+        return cls(
+            politico_ids=np.empty(0, dtype=np.int64),
+            votacao_ids=np.empty(0, dtype=np.int64),
+            bits=np.zeros((0, 0), dtype=np.uint8),
+        )
+
+    @property
+    def n_votacoes(self) -> int:
+        return len(self.votacao_ids)
+
+    def linha(self, politico_id: int) -> int | None:
+        """Índice da linha do parlamentar (None se ele não tem votos na matriz)."""
+        idx = np.flatnonzero(self.politico_ids == politico_id)
+        return int(idx[0]) if len(idx) else None
+
+    # ------------------------------------------------------------------
+    # Construção incremental
+    # ------------------------------------------------------------------
+
+    def acrescentar(self, votacao_ids: np.ndarray, politico_ids: np.ndarray, codigos: np.ndarray) -> int:
+        """
+        Acrescenta votos (arrays alinhados: um voto por posição) de votações
+        ainda ausentes da matriz, in-place. Votos de votações já presentes são
+        ignorados. Retorna quantas colunas novas foram criadas.
+        """
+        votacao_ids = np.asarray(votacao_ids, dtype=np.int64)
+        politico_ids = np.asarray(politico_ids, dtype=np.int64)
+        codigos = np.asarray(codigos, dtype=np.uint8)
+
+        novos = ~np.isin(votacao_ids, self.votacao_ids)
+        votacao_ids, politico_ids, codigos = votacao_ids[novos], politico_ids[novos], codigos[novos]
+        if not len(votacao_ids):
+            return 0
+
+        # Colunas: votações novas no fim, em ordem de id
+        colunas_novas = np.unique(votacao_ids)
+        self.votacao_ids = np.concatenate([self.votacao_ids, colunas_novas])
+
+        # Linhas: parlamentares que ainda não votaram em nada entram no fim
+        linhas_novas = np.setdiff1d(np.unique(politico_ids), self.politico_ids)
+        self.politico_ids = np.concatenate([self.politico_ids, linhas_novas])
+
+        largura = -(-self.n_votacoes // VOTOS_POR_BYTE)
+        extra_linhas = len(self.politico_ids) - self.bits.shape[0]
+        extra_bytes = largura - self.bits.shape[1]
+        if extra_linhas or extra_bytes:
+            self.bits = np.pad(np.asarray(self.bits), ((0, extra_linhas), (0, extra_bytes)))
+
+        ordem_linhas = np.argsort(self.politico_ids)
+        linha = ordem_linhas[np.searchsorted(self.politico_ids, politico_ids, sorter=ordem_linhas)]
+        coluna = (self.n_votacoes - len(colunas_novas)) + np.searchsorted(colunas_novas, votacao_ids)
+
+        deslocamento = ((coluna % VOTOS_POR_BYTE) * 2).astype(np.uint8)
+        # .at: vários votos caem no mesmo byte; um OR com buffer perderia os anteriores
+        np.bitwise_or.at(self.bits, (linha, coluna // VOTOS_POR_BYTE), codigos << deslocamento)
+        return len(colunas_novas)
+
+    # ------------------------------------------------------------------
+    # Concordância
+    # ------------------------------------------------------------------
+
+    def concordancia(self, linha: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compara a linha informada com todas as linhas de uma vez.
+        Retorna (votações em que ambos votaram, votações com o mesmo voto), por linha.
+        """
+        a = self.bits[linha]
+        b = self.bits
+
+        votou_a = (a | (a >> 1)) & _MASCARA_BAIXA
+        votou_b = (b | (b >> 1)) & _MASCARA_BAIXA
+        ambos = votou_a & votou_b
+
+        diferenca = a ^ b
+        iguais = ~(diferenca | (diferenca >> 1)) & ambos
+
+        return (
+            _POPCOUNT[ambos].sum(axis=1, dtype=np.int64),
+            _POPCOUNT[iguais].sum(axis=1, dtype=np.int64),
+        )
+
+    def similares(self, politico_id: int, *, k: int = 10, min_comuns: int = 1) -> list[dict] | None:
+        """
+        Top-k parlamentares com maior % de votos iguais ao de `politico_id`
+        (sobre as votações em que ambos votaram, mínimo `min_comuns`).
+        Empates: mais votações em comum, depois o id. None se ele não está na matriz.
+        """
+        linha = self.linha(politico_id)
+        if linha is None:
+            return None
+
+        comuns, iguais = self.concordancia(linha)
+        validos = comuns >= max(min_comuns, 1)
+        validos[linha] = False
+
+        idx = np.flatnonzero(validos)
+        pct = iguais[idx] / comuns[idx]
+        ordem = np.lexsort((self.politico_ids[idx], -comuns[idx], -pct))[:k]
+
+        return [
+            {
+                "politico_id":      int(self.politico_ids[idx[i]]),
+                "votacoes_comuns":  int(comuns[idx[i]]),
+                "votos_iguais":     int(iguais[idx[i]]),
+                "concordancia_pct": round(float(pct[i]) * 100, 2),
+            }
+            for i in ordem
+        ]
+
+    # ------------------------------------------------------------------
+    # Disco
+    # ------------------------------------------------------------------
+
+    def salvar(self, pasta: str = PASTA_MATRIZ) -> None:
+        """
+        Grava os ids e a matriz em arquivos temporários e troca com os.replace:
+        quem já tem o arquivo antigo mapeado continua lendo a versão anterior.
+        """
+        os.makedirs(pasta, exist_ok=True)
+        for nome, gravar in (
+            (_ARQUIVO_IDS, lambda f: np.savez(f, politico_ids=self.politico_ids, votacao_ids=self.votacao_ids)),
+            (_ARQUIVO_BITS, lambda f: np.save(f, np.ascontiguousarray(self.bits))),
+        ):
+            destino = os.path.join(pasta, nome)
+            with open(destino + ".tmp", "wb") as f:
+                gravar(f)
+            os.replace(destino + ".tmp", destino)
+
+    @classmethod
+    def carregar(cls, pasta: str = PASTA_MATRIZ, *, mmap: bool = True) -> "MatrizVotos | None":
+        """
+        Abre a matriz gravada (memory-map somente leitura por padrão).
+        None se não existe ou se ids e matriz estão de versões diferentes
+        (gravação em andamento) — quem chama tenta de novo depois.
+        """
+        caminho_bits = os.path.join(pasta, _ARQUIVO_BITS)
+        caminho_ids = os.path.join(pasta, _ARQUIVO_IDS)
+        if not (os.path.exists(caminho_bits) and os.path.exists(caminho_ids)):
+            return None
+
+        with np.load(caminho_ids) as ids:
+            politico_ids, votacao_ids = ids["politico_ids"], ids["votacao_ids"]
+        bits = np.load(caminho_bits, mmap_mode="r" if mmap else None)
+
+        if bits.shape != (len(politico_ids), -(-len(votacao_ids) // VOTOS_POR_BYTE)):
+            logger.warning("Matriz de votos inconsistente em %s (gravação em andamento?)", pasta)
+            return None
+        return cls(politico_ids=politico_ids, votacao_ids=votacao_ids, bits=bits)
+
+    @staticmethod
+    def versao(pasta: str = PASTA_MATRIZ) -> float | None:
+        """mtime do arquivo da matriz (None se não existe) — indica quando recarregar."""
+        try:
+            return os.stat(os.path.join(pasta, _ARQUIVO_BITS)).st_mtime
+        except FileNotFoundError:
+            return None
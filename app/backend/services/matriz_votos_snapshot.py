@@ -0,0 +1,58 @@
+"""
+matriz_votos_snapshot.py — Matriz de votos (2 bits) residente por processo.
+
+Abre com memory-map o arquivo gravado pela ingestão e reabre quando ele muda
+(mtime). Sem arquivo (ex: ambiente novo, ingestão ainda não rodou) levanta
+MatrizIndisponivel — o serviço responde 503; a API nunca monta a matriz a
+partir de `votos`.
+
+Segurança (OWASP):
+  - A04 / Insecure Design: nenhuma requisição varre a tabela de votos; a troca
+    de versão só reabre o arquivo (memory-map) e é feita por uma corrotina.
+"""
+
+import asyncio
+import logging
+
+from backend.services.matriz_votos import PASTA_MATRIZ, MatrizVotos
+
+logger = logging.getLogger(__name__)
+
+_matriz: MatrizVotos | None = None
+_versao: float | None = None      # mtime do arquivo aberto
+_lock = asyncio.Lock()
+
+
+class MatrizIndisponivel(Exception):
+    """A matriz de votos ainda não foi gravada pela ingestão."""
+
+
+async def obter_matriz_votos() -> MatrizVotos:
+    """
+    Retorna a matriz residente, reabrindo o arquivo se a ingestão gravou uma
+    versão nova. Levanta MatrizIndisponivel se o arquivo não existe.
+    """
+    global _matriz, _versao
+
+    versao = MatrizVotos.versao()
+    if _matriz is not None and versao == _versao:
+        return _matriz
+
+    async with _lock:
+        versao = MatrizVotos.versao()
+        if _matriz is not None and versao == _versao:
+            return _matriz
+
+        matriz = MatrizVotos.carregar() if versao is not None else None
+        if matriz is None:
+            if _matriz is not None:
+                # Arquivo em troca: segue com a versão anterior até a próxima requisição
+                return _matriz
+            raise MatrizIndisponivel(PASTA_MATRIZ)
+
+        _matriz, _versao = matriz, versao
+        logger.info(
+            "Matriz de votos carregada: %s parlamentares × %s votações",
+            len(matriz.politico_ids), matriz.n_votacoes,
+        )
+        return matriz
@@ -14,8 +14,16 @@ Dados brutos esperados (dict ou Mapping):
   - pontos_producao  float   — soma ponderada de proposições (calculada no SQL/repo)
   - total_gasto      float
   - meses_mandato    int     — meses distintos com despesa registrada
+
+calcular_scores_lote() faz o mesmo cálculo vetorizado (NumPy) para a Câmara
+inteira de uma vez, com resultados idênticos a calcular_score() linha a linha.
+MatrizAnual organiza os dados brutos anuais como matriz parlamentar × ano.
 """
 
+from dataclasses import dataclass
+
+import numpy as np
+
 # ---------------------------------------------------------------------------
 # Cotas mensais por UF — fonte: Câmara dos Deputados 2025
 # ---------------------------------------------------------------------------
@@ -112,4 +120,360 @@ def calcular_score(p: dict, meses_override: int | None = None) -> dict:
             "meses_mandato":      meses,
             "cota_utilizada_pct": round((gasto / cota_total) * 100, 2) if cota_total > 0 else 0.0,
         },
-    }
\ No newline at end of file
+    }
+
+def resultado_de_registro(r) -> dict:
+    """
+    Reconstrói a saída de calcular_score() a partir de uma linha da tabela
+    politico_performance (join com politicos para nome/uf/partido/foto).
+
+    A tabela guarda exatamente os valores devolvidos por calcular_score()
+    na ingestão, então ranking pré-calculado e cálculo ao vivo são idênticos.
+    """
+    return {
+        "id":      r["id"],
+        "nome":    r["nome"],
+        "uf":      r.get("uf"),
+        "partido": r["partido_sigla"],
+        "foto":    r.get("url_foto"),
+        "score":   r["score"],
+        "notas": {
+            "assiduidade": r["nota_assiduidade"],
+            "producao":    r["nota_producao"],
+            "economia":    r["nota_economia"],
+        },
+        "_meta": {
+            "cota_mensal":        r["cota_mensal"],
+            "cota_total":         r["cota_total"],
+            "total_gasto":        r["total_gasto"],
+            "meses_mandato":      r["meses_mandato"],
+            "cota_utilizada_pct": r["cota_utilizada_pct"],
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Versão vetorizada (NumPy) — Câmara inteira em uma chamada
+# ---------------------------------------------------------------------------
+
+def _round2(valores: np.ndarray) -> np.ndarray:
+    """
+    round(x, 2) do Python, vetorizado.
+
+    np.round calcula rint(x * 100) / 100, que só diverge do round() do Python
+    (arredondamento exato da representação decimal) quando x * 100 cai muito
+    perto de .5. Esses poucos casos são refeitos com round() nativo.
+    """
+    escalado = valores * 100
+    resultado = np.rint(escalado) / 100
+    duvidosos = np.flatnonzero(np.abs(np.abs(escalado - np.floor(escalado)) - 0.5) < 1e-6)
+    for i in duvidosos:
+        resultado[i] = round(float(valores[i]), 2)
+    return resultado
+
+
+def posicoes_e_percentis(score) -> tuple[np.ndarray, np.ndarray]:
+    """
+    posicao   — 1 = maior score (empates mantêm a ordem de entrada)
+    percentil — % de parlamentares com score menor ou igual (0–100)
+    """
+    score = np.asarray(score, dtype=np.float64)
+    n = len(score)
+    ordem = np.argsort(-score, kind="stable")
+    posicao = np.empty(n, dtype=np.int64)
+    posicao[ordem] = np.arange(1, n + 1)
+    percentil = (
+        _round2(np.searchsorted(np.sort(score), score, side="right") / n * 100)
+        if n else np.empty(0)
+    )
+    return posicao, percentil
+
+
+def calcular_scores_lote(
+    assiduidade,
+    pontos_producao,
+    total_gasto,
+    meses_mandato,
+    ufs,
+    *,
+    pesos: tuple[float, float, float] = (_PESO_ASSIDUIDADE, _PESO_ECONOMIA, _PESO_PRODUCAO),
+    meta_producao_mes: float = _META_PRODUCAO_MES,
+) -> dict[str, np.ndarray]:
+    """
+    Calcula notas, score, posição e percentil de N parlamentares de uma vez.
+
+    Recebe colunas (sequências de mesmo tamanho) com os mesmos dados brutos de
+    calcular_score(). As operações seguem exatamente a mesma ordem de ponto
+    flutuante da versão escalar, então cada linha bate com calcular_score().
+
+    `pesos` (assiduidade, economia, produção) e `meta_producao_mes` permitem
+    simular rankings com outras prioridades; os padrões são os da fórmula oficial.
+
+    Retorna um dict de arrays:
+      score, nota_assiduidade, nota_producao, nota_economia,
+      cota_mensal, cota_total, total_gasto, meses_mandato, cota_utilizada_pct,
+      posicao   — 1 = maior score (empates mantêm a ordem de entrada)
+      percentil — % de parlamentares com score menor ou igual (0–100)
+    """
+    nota_assiduidade = np.asarray(assiduidade, dtype=np.float64)
+    pontos           = np.asarray(pontos_producao, dtype=np.float64)
+    gasto            = np.asarray(total_gasto, dtype=np.float64)
+    meses            = np.maximum(np.asarray(meses_mandato, dtype=np.int64), 1)
+
+    # --- Produção (0–100, capped) ---
+    meta_producao = meses * meta_producao_mes
+    nota_producao = np.minimum((pontos / meta_producao) * 100, 100.0)
+
+    # --- Economia (0–100) ---
+    cota_mensal   = np.fromiter((resolve_cota_mensal(uf) for uf in ufs), dtype=np.float64, count=len(meses))
+    cota_total    = cota_mensal * meses
+    nota_economia = np.maximum(0.0, ((cota_total - gasto) / cota_total) * 100)
+
+    peso_assiduidade, peso_economia, peso_producao = pesos
+    score_final = (
+        nota_assiduidade * peso_assiduidade
+        + nota_economia   * peso_economia
+        + nota_producao   * peso_producao
+    )
+    score = _round2(score_final)
+
+    # --- Posição e percentil (sobre o score arredondado, como no ranking) ---
+    posicao, percentil = posicoes_e_percentis(score)
+
+    return {
+        "score":              score,
+        "nota_assiduidade":   _round2(nota_assiduidade),
+        "nota_producao":      _round2(nota_producao),
+        "nota_economia":      _round2(nota_economia),
+        "cota_mensal":        cota_mensal,
+        "cota_total":         cota_total,
+        "total_gasto":        gasto,
+        "meses_mandato":      meses,
+        "cota_utilizada_pct": _round2((gasto / cota_total) * 100),
+        "posicao":            posicao,
+        "percentil":          percentil,
+    }
+
+
+def calcular_ranking(raws: list) -> list[dict]:
+    """
+    Ranking completo a partir dos dados brutos do repositório.
+
+    Equivale a `sorted(map(calcular_score, raws), key=score, reverse=True)`,
+    mas calcula tudo em uma passada vetorizada e monta os dicts já na ordem.
+    """
+    if not raws:
+        return []
+
+    lote = calcular_scores_lote(
+        [p["nota_assiduidade"] for p in raws],
+        [p["pontos_producao"] for p in raws],
+        [p["total_gasto"] for p in raws],
+        [int(p["meses_mandato"]) for p in raws],
+        [p.get("uf") for p in raws],
+    )
+
+    ordem = np.argsort(lote["posicao"])
+    colunas = {k: v.tolist() for k, v in lote.items()}
+
+    return [
+        {
+            "id":      raws[i]["id"],
+            "nome":    raws[i]["nome"],
+            "uf":      raws[i].get("uf"),
+            "partido": raws[i]["partido_sigla"],
+            "foto":    raws[i].get("url_foto"),
+            "score":   colunas["score"][i],
+            "notas": {
+                "assiduidade": colunas["nota_assiduidade"][i],
+                "producao":    colunas["nota_producao"][i],
+                "economia":    colunas["nota_economia"][i],
+            },
+            "_meta": {
+                "cota_mensal":        colunas["cota_mensal"][i],
+                "cota_total":         colunas["cota_total"][i],
+                "total_gasto":        colunas["total_gasto"][i],
+                "meses_mandato":      colunas["meses_mandato"][i],
+                "cota_utilizada_pct": colunas["cota_utilizada_pct"][i],
+            },
+        }
+        for i in ordem.tolist()
+    ]
+
+
+
+def posicoes_por_grupo(score, ids, grupos) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Posição de cada parlamentar dentro do seu grupo (ano, UF, partido...).
+
+    1 = maior score; empates desempatados pelo id, como no ranking
+    (ORDER BY score DESC, id). Retorna (posicao, total_do_grupo).
+    """
+    score = np.asarray(score, dtype=np.float64)
+    ids   = np.asarray(ids, dtype=np.int64)
+    n = len(score)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    _, codigos = np.unique(np.asarray([str(g) for g in grupos]), return_inverse=True)
+    ordem = np.lexsort((ids, -score, codigos))
+
+    # Início de cada grupo na ordem ordenada → posição = índice - início + 1
+    inicios = np.r_[0, np.flatnonzero(np.diff(codigos[ordem])) + 1]
+    tamanhos = np.diff(np.r_[inicios, n])
+    posicao_ordenada = np.arange(n) - np.repeat(inicios, tamanhos) + 1
+
+    posicao = np.empty(n, dtype=np.int64)
+    posicao[ordem] = posicao_ordenada
+    total = np.empty(n, dtype=np.int64)
+    total[ordem] = np.repeat(tamanhos, tamanhos)
+    return posicao, total
+
+
+def calcular_estatisticas(scores, ufs, partidos) -> list[dict]:
+    """
+    Total, média e mediana dos scores: geral, por UF e por partido.
+
+    Retorna linhas `{"grupo", "chave", "total", "media", "mediana"}` no formato
+    da tabela performance_estatisticas (grupo "geral" tem chave None).
+    A média é a mesma soma/len usada antes pelo cálculo sobre o ranking completo.
+    """
+    scores = [float(s) for s in scores]
+
+    grupos: dict[tuple[str, str | None], list[float]] = {}
+    if scores:
+        grupos[("geral", None)] = scores
+    for grupo, chaves in (("uf", ufs), ("partido", partidos)):
+        for chave, score in zip(chaves, scores):
+            if chave:
+                grupos.setdefault((grupo, chave), []).append(score)
+
+    return [
+        {
+            "grupo":   grupo,
+            "chave":   chave,
+            "total":   len(valores),
+            "media":   sum(valores) / len(valores),
+            "mediana": float(np.median(valores)),
+        }
+        for (grupo, chave), valores in grupos.items()
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Matriz anual (parlamentar × ano) — ranking de um ano sem N+1
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MatrizAnual:
+    """
+    Dados brutos anuais da Câmara inteira em arrays (n_politicos, n_anos).
+
+    `tem_dados` marca as células com alguma presença, produção ou despesa —
+    o ranking de um ano considera só esses parlamentares (como a ingestão).
+    `tem_gastos` marca as células com despesa (âncora da timeline).
+    `meses_mandato` = meses com despesa naquele ano (1 quando não há).
+    """
+
+    politicos: list
+    anos: list[int]
+    assiduidade: np.ndarray
+    pontos_producao: np.ndarray
+    total_gasto: np.ndarray
+    meses_mandato: np.ndarray
+    tem_dados: np.ndarray
+    tem_gastos: np.ndarray
+
+    @classmethod
+    def montar(cls, politicos, presenca, producao, gastos) -> "MatrizAnual":
+        """Monta a matriz a partir das linhas agrupadas por (politico_id, ano)."""
+        anos = sorted({int(r["ano"]) for linhas in (presenca, producao, gastos) for r in linhas})
+        linha = {p["id"]: i for i, p in enumerate(politicos)}
+        coluna = {ano: j for j, ano in enumerate(anos)}
+        forma = (len(politicos), len(anos))
+
+        assiduidade = np.zeros(forma)
+        pontos      = np.zeros(forma)
+        gasto       = np.zeros(forma)
+        meses       = np.ones(forma, dtype=np.int64)
+        tem_dados   = np.zeros(forma, dtype=bool)
+        tem_gastos  = np.zeros(forma, dtype=bool)
+
+        def celulas(linhas):
+            for r in linhas:
+                i = linha.get(r["politico_id"])
+                if i is not None:
+                    tem_dados[i, coluna[int(r["ano"])]] = True
+                    yield i, coluna[int(r["ano"])], r
+
+        for i, j, r in celulas(presenca):
+            assiduidade[i, j] = float(r["nota_assiduidade"] or 0)
+        for i, j, r in celulas(producao):
+            pontos[i, j] = float(r["pontos_producao"] or 0)
+        for i, j, r in celulas(gastos):
+            gasto[i, j] = float(r["total_gasto"] or 0)
+            meses[i, j] = int(r["meses_mandato"] or 1)
+            tem_gastos[i, j] = True
+
+        return cls(list(politicos), anos, assiduidade, pontos, gasto, meses, tem_dados, tem_gastos)
+
+    def ancorada_em_despesas(self) -> "MatrizAnual":
+        """
+        Mesma regra da timeline de um parlamentar (get_timeline_data_by_id):
+        só anos com despesa, e em cada ano só quem teve despesa nele.
+        """
+        colunas = np.flatnonzero(self.tem_gastos.any(axis=0))
+        return MatrizAnual(
+            self.politicos,
+            [self.anos[j] for j in colunas],
+            self.assiduidade[:, colunas],
+            self.pontos_producao[:, colunas],
+            self.total_gasto[:, colunas],
+            self.meses_mandato[:, colunas],
+            self.tem_gastos[:, colunas],
+            self.tem_gastos[:, colunas],
+        )
+
+    def brutos_do_ano(self, ano: int) -> list[dict]:
+        """Coluna de um ano no formato de dados brutos de calcular_score()/calcular_ranking()."""
+        if ano not in self.anos:
+            return []
+        j = self.anos.index(ano)
+        return [
+            {
+                "id":               p["id"],
+                "nome":             p["nome"],
+                "uf":               p["uf"],
+                "partido_sigla":    p["partido_sigla"],
+                "url_foto":         p["url_foto"],
+                "nota_assiduidade": self.assiduidade[i, j],
+                "pontos_producao":  self.pontos_producao[i, j],
+                "total_gasto":      self.total_gasto[i, j],
+                "meses_mandato":    self.meses_mandato[i, j],
+            }
+            for i, p in enumerate(self.politicos)
+            if self.tem_dados[i, j]
+        ]
+
+    def calcular(self) -> dict[str, np.ndarray]:
+        """
+        Score e notas de todas as células em uma única chamada a calcular_scores_lote().
+        Retorna arrays (n_politicos, n_anos), com NaN onde não há dados.
+        """
+        forma = self.tem_dados.shape
+        # ravel() é por linha: cada parlamentar repete a UF uma vez por ano
+        ufs = [p["uf"] for p in self.politicos for _ in self.anos]
+
+        lote = calcular_scores_lote(
+            self.assiduidade.ravel(),
+            self.pontos_producao.ravel(),
+            self.total_gasto.ravel(),
+            self.meses_mandato.ravel(),
+            ufs,
+        )
+
+        resultado = {}
+        for chave in ("score", "nota_assiduidade", "nota_producao", "nota_economia"):
+            matriz = lote[chave].reshape(forma)
+            resultado[chave] = np.where(self.tem_dados, matriz, np.nan)
+        return resultado
@@ -0,0 +1,206 @@
+"""
+performance_snapshot.py — Snapshots em memória do ranking de performance.
+
+Mantém, por processo:
+  - as entradas de calcular_scores_lote() de todos os parlamentares (mandato
+    inteiro) em colunas NumPy — a simulação com pesos do usuário é só computação;
+  - o ranking já ordenado (com posição e percentil) do mandato e de cada ano —
+    filtros e paginação viram fatias de lista, sem query por requisição;
+  - a matriz parlamentar × ano de scores (timeline da Câmara inteira).
+
+Segurança (OWASP):
+  - A04 / Insecure Design: recarga serializada por lock (sem "thundering herd" no banco)
+    e com TTL fixo — o espaço de parâmetros é ilimitado, o acesso ao banco não.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.repositories.ranking_repository import RankingRepository
+from backend.services.performance_calc import (
+    MatrizAnual,
+    calcular_ranking,
+    posicoes_e_percentis,
+    resultado_de_registro,
+)
+
+logger = logging.getLogger(__name__)
+
+# Recarrega o snapshot no máximo uma vez por hora (a ingestão roda diariamente)
+_SNAPSHOT_TTL = 3_600
+
+
+@dataclass(frozen=True)
+class PerformanceSnapshot:
+    """Colunas alinhadas por índice: a linha i de cada array é o mesmo parlamentar."""
+
+    ids: np.ndarray
+    nomes: list[str]
+    ufs: list[str | None]
+    partidos: list[str]
+    fotos: list[str | None]
+    assiduidade: np.ndarray
+    pontos_producao: np.ndarray
+    total_gasto: np.ndarray
+    meses_mandato: np.ndarray
+    carregado_em: float
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def de_registros(cls, registros, *, precalculado: bool) -> "PerformanceSnapshot":
+        """
+        Monta o snapshot a partir das linhas do repositório.
+        `precalculado` indica linhas de politico_performance (senão, dados brutos ao vivo).
+        """
+        col_assiduidade = "assiduidade_pct" if precalculado else "nota_assiduidade"
+        n = len(registros)
+        return cls(
+            ids=np.fromiter((r["id"] for r in registros), dtype=np.int64, count=n),
+            nomes=[r["nome"] for r in registros],
+            ufs=[r.get("uf") for r in registros],
+            partidos=[r["partido_sigla"] for r in registros],
+            fotos=[r.get("url_foto") for r in registros],
+            assiduidade=np.fromiter((float(r[col_assiduidade]) for r in registros), dtype=np.float64, count=n),
+            pontos_producao=np.fromiter((float(r["pontos_producao"]) for r in registros), dtype=np.float64, count=n),
+            total_gasto=np.fromiter((float(r["total_gasto"]) for r in registros), dtype=np.float64, count=n),
+            meses_mandato=np.fromiter((int(r["meses_mandato"]) for r in registros), dtype=np.int64, count=n),
+            carregado_em=time.monotonic(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Cache por processo
+# ---------------------------------------------------------------------------
+
+_snapshot: PerformanceSnapshot | None = None
+_rankings: dict[int | None, tuple[float, list[dict]]] = {}  # ano → (carregado_em, ranking)
+_timeline: tuple[float, dict] | None = None                  # (carregado_em, payload)
+_lock = asyncio.Lock()
+
+
+def _expirado(snapshot: PerformanceSnapshot | None) -> bool:
+    return snapshot is None or time.monotonic() - snapshot.carregado_em > _SNAPSHOT_TTL
+
+
+def _ranking_expirado(ano: int | None) -> bool:
+    return ano not in _rankings or time.monotonic() - _rankings[ano][0] > _SNAPSHOT_TTL
+
+
+async def obter_snapshot(repo: RankingRepository) -> PerformanceSnapshot:
+    """
+    Retorna o snapshot residente, recarregando do banco se expirou.
+    Só uma corrotina recarrega; as demais aguardam o lock e reaproveitam o resultado.
+    """
+    global _snapshot
+
+    if not _expirado(_snapshot):
+        return _snapshot
+
+    async with _lock:
+        if not _expirado(_snapshot):
+            return _snapshot
+
+        registros = await repo.get_ranking_performance_precalculado()
+        if registros:
+            novo = PerformanceSnapshot.de_registros(registros, precalculado=True)
+        else:
+            logger.warning("politico_performance vazia; snapshot montado a partir das tabelas brutas")
+            registros = await repo.get_ranking_performance_politicos()
+            novo = PerformanceSnapshot.de_registros(registros, precalculado=False)
+
+        _snapshot = novo
+        logger.info("Snapshot de performance carregado: %s parlamentares", len(novo))
+        return novo
+
+
+async def obter_ranking(repo: RankingRepository, ano: int | None = None) -> list[dict]:
+    """
+    Ranking completo (mandato ou ano), ordenado por score, no formato de
+    calcular_score() sem `_meta` e com `posicao` / `percentil` sobre a lista toda.
+
+    Sem dados pré-calculados, cai no cálculo ao vivo: o mandato pelas
+    subqueries do ranking geral, um ano pela matriz anual agrupada.
+    """
+    if not _ranking_expirado(ano):
+        return _rankings[ano][1]
+
+    async with _lock:
+        if not _ranking_expirado(ano):
+            return _rankings[ano][1]
+
+        registros = await repo.get_ranking_performance_precalculado(ano=ano)
+        if registros:
+            ranking = [resultado_de_registro(r) for r in registros]
+        elif ano is None:
+            logger.warning("politico_performance vazia; calculando ranking ao vivo")
+            ranking = calcular_ranking(await repo.get_ranking_performance_politicos())
+        else:
+            logger.warning("politico_performance sem o ano %s; calculando ranking ao vivo", ano)
+            matriz = MatrizAnual.montar(**await repo.get_performance_anual_agrupada(anos=[ano]))
+            ranking = calcular_ranking(matriz.brutos_do_ano(ano))
+
+        posicao, percentil = posicoes_e_percentis([p["score"] for p in ranking])
+        for p, pos, pct in zip(ranking, posicao.tolist(), percentil.tolist()):
+            p.pop("_meta", None)
+            p["posicao"] = pos
+            p["percentil"] = pct
+
+        _rankings[ano] = (time.monotonic(), ranking)
+        logger.info("Snapshot do ranking carregado: ano=%s, %s parlamentares", ano, len(ranking))
+        return ranking
+
+
+def _nulos(matriz: np.ndarray) -> list[list[float | None]]:
+    """Matriz com NaN → listas JSON com null."""
+    return [[None if np.isnan(v) else v for v in linha] for linha in matriz.tolist()]
+
+
+async def obter_timeline_matriz(repo: RankingRepository) -> dict:
+    """
+    Score e notas de todos os parlamentares em todos os anos, em formato colunar:
+    `ids`/`nomes`/`ufs`/`partidos` alinhados com as linhas de `score` e `notas`,
+    e cada linha com um valor por ano de `anos` (null = sem despesa no ano, como
+    na timeline individual).
+
+    Montado a partir de get_performance_anual_agrupada() (uma query por dimensão)
+    e mantido como um único objeto em memória.
+    """
+    global _timeline
+
+    if _timeline and time.monotonic() - _timeline[0] <= _SNAPSHOT_TTL:
+        return _timeline[1]
+
+    async with _lock:
+        if _timeline and time.monotonic() - _timeline[0] <= _SNAPSHOT_TTL:
+            return _timeline[1]
+
+        # Anos e células ancorados em despesas, como /politicos/{id}/timeline
+        matriz = MatrizAnual.montar(**await repo.get_performance_anual_agrupada()).ancorada_em_despesas()
+        calc = matriz.calcular()
+
+        payload = {
+            "anos":     matriz.anos,
+            "ids":      [p["id"] for p in matriz.politicos],
+            "nomes":    [p["nome"] for p in matriz.politicos],
+            "ufs":      [p["uf"] for p in matriz.politicos],
+            "partidos": [p["partido_sigla"] for p in matriz.politicos],
+            "score":    _nulos(calc["score"]),
+            "notas": {
+                "assiduidade": _nulos(calc["nota_assiduidade"]),
+                "producao":    _nulos(calc["nota_producao"]),
+                "economia":    _nulos(calc["nota_economia"]),
+            },
+        }
+
+        _timeline = (time.monotonic(), payload)
+        logger.info(
+            "Matriz de timeline carregada: %s parlamentares × %s anos",
+            len(payload["ids"]), len(payload["anos"]),
+        )
+        return payload
@@ -17,8 +17,9 @@ from fastapi import HTTPException, status
 
 from backend.repositories.politico_repository import PoliticoRepository
 from backend.repositories.ranking_repository import RankingRepository
-from backend.schemas import PoliticoResponse, AtividadeLegislativaResponse
-from backend.services.performance_calc import calcular_score, resolve_cota_mensal
+from backend.schemas import PoliticoResponse, PoliticoSimilar, AtividadeLegislativaResponse
+from backend.services.matriz_votos_snapshot import MatrizIndisponivel, obter_matriz_votos
+from backend.services.performance_calc import calcular_score, resolve_cota_mensal, resultado_de_registro
 from .ranking_service import RankingService
 import asyncio
 logger = logging.getLogger(__name__)
@@ -29,6 +30,7 @@ _MAX_LIMIT_VOTACOES  = 20
 _MAX_LIMIT_DESPESAS  = 20
 _MAX_LIMIT_RESUMO    = 60
 _MAX_LIMIT_ATIVIDADE = 100
+_MAX_LIMIT_SIMILARES = 50
 
 
 class PoliticoService:
@@ -179,6 +181,9 @@ class PoliticoService:
         Fórmula:
             score = assiduidade × 15% + economia × 40% + produção × 45%
 
+        `ranking` traz posição/percentil na Câmara e posições na UF e no partido,
+        lidos do índice gravado em politico_performance (sem varrer o ranking).
+
         Lança HTTP 404 se o político não existir.
         """
         politico = await self._repo.get_politico_repo(politico_id)
@@ -188,16 +193,35 @@ class PoliticoService:
                 detail="Político não encontrado.",
             )
 
-        raw_row = await self._ranking_repo.get_performance_data_by_id(
+        # 1º: linha pré-calculada pela ingestão; 2º: cálculo ao vivo (ano sem linha
+        # ou tabela ainda não populada) — ambos saem de calcular_score()
+        registro = await self._ranking_repo.get_performance_precalculada_by_id(
             politico_id, ano=ano
         )
-        if not raw_row:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Dados de performance não encontrados para este político.",
+        posicoes = None
+        if registro:
+            result = resultado_de_registro(registro)
+            if registro["posicao"] is not None:
+                posicoes = {
+                    "posicao":         registro["posicao"],
+                    "total":           registro["total_ranking"],
+                    "percentil":       registro["percentil"],
+                    "posicao_uf":      registro["posicao_uf"],
+                    "total_uf":        registro["total_uf"],
+                    "posicao_partido": registro["posicao_partido"],
+                    "total_partido":   registro["total_partido"],
+                }
+        else:
+            raw_row = await self._ranking_repo.get_performance_data_by_id(
+                politico_id, ano=ano
             )
+            if not raw_row:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Dados de performance não encontrados para este político.",
+                )
+            result = calcular_score(raw_row)
 
-        result = calcular_score(raw_row)
         meta   = result.pop("_meta")
 
         media_global = await RankingService(self._db).get_media_global_cached()
@@ -207,6 +231,8 @@ class PoliticoService:
             "ano":          ano,           # None = mandato inteiro
             "score_final":  result["score"],
             "media_global": round(media_global, 2),
+            # Posições pré-calculadas na ingestão (None no cálculo ao vivo)
+            "ranking":      posicoes,
             "detalhes": {
                 "nota_assiduidade": result["notas"]["assiduidade"],
                 "nota_economia":    result["notas"]["economia"],
@@ -378,3 +404,47 @@ class PoliticoService:
             offset_proposicoes=safe_op,
             ano=ano,
         )
+
+    # ------------------------------------------------------------------
+    # Similaridade de votos
+    # ------------------------------------------------------------------
+
+    async def get_politico_similares_service(
+        self,
+        politico_id: int,
+        *,
+        k: int = 10,
+        min_comuns: int = 20,
+    ) -> list[PoliticoSimilar]:
+        """
+        Top-k parlamentares que mais votaram igual a `politico_id` nas votações
+        nominais, pela matriz de votos em 2 bits (matriz_votos). Sem votos
+        registrados, lista vazia; político inexistente, 404; matriz ainda não
+        gravada pela ingestão, 503.
+        """
+        safe_k = min(abs(k), _MAX_LIMIT_SIMILARES)
+
+        try:
+            matriz = await obter_matriz_votos()
+        except MatrizIndisponivel:
+            logger.warning("Matriz de votos ainda nao gravada pela ingestao")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Dados de votos ainda não disponíveis.",
+            )
+        similares = matriz.similares(politico_id, k=safe_k, min_comuns=min_comuns)
+
+        if similares is None:
+            if not await self._repo.get_politico_repo(politico_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Político não encontrado.",
+                )
+            return []
+
+        resumo = await self._repo.get_politicos_resumo_repo([s["politico_id"] for s in similares])
+        return [
+            PoliticoSimilar(**resumo[s["politico_id"]], **s)
+            for s in similares
+            if s["politico_id"] in resumo
+        ]
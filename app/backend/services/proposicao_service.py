@@ -23,6 +23,7 @@ Segurança (OWASP):
 import logging
 
 from fastapi import HTTPException, status
+from fastapi_cache import FastAPICache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.repositories.proposicao_repository import ProposicaoRepository
@@ -31,6 +32,7 @@ from backend.schemas import (
     ProposicaoResponse,
     VotacaoDetalhe,
     VotacaoResponse,
+    VotosVotacaoResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,11 @@ logger = logging.getLogger(__name__)
 # Limites máximos — segunda linha de defesa (repositório também limita)
 _MAX_LIMIT_PROPOSICOES = 100
 _MAX_LIMIT_VOTACOES    = 100
+_MAX_LIMIT_VOTOS       = 513
+
+# Votos de votação já importada não mudam: 24h. Votação sem votos importados não entra no cache.
+_CACHE_VOTOS_PREFIXO = "quem-vota-cache::votos_votacao"
+_CACHE_VOTOS_TTL     = 86_400
 
 
 class ProposicaoService:
@@ -49,7 +56,8 @@ class ProposicaoService:
     """
 
     def __init__(self, db: AsyncSession) -> None:
-        self._repo = ProposicaoRepository(db)
+        self._repo  = ProposicaoRepository(db)
+        self._cache = FastAPICache.get_backend()
 
     # ------------------------------------------------------------------
     # Proposições — listagem
@@ -217,4 +225,85 @@ class ProposicaoService:
                 detail="Votação não encontrada.",
             )
 
-        return votacao
\ No newline at end of file
+        return votacao
+
+    # ------------------------------------------------------------------
+    # Votações — votos individuais
+    # ------------------------------------------------------------------
+
+    async def listar_votos_votacao_service(
+        self,
+        votacao_id: int,
+        *,
+        sigla_partido: str | None = None,
+        sigla_uf: str | None = None,
+        tipo_voto: str | None = None,
+        apos: int | None = None,
+        limit: int = 100,
+    ) -> VotosVotacaoResponse:
+        """
+        Lista como cada deputado votou em uma votação (paginação por cursor).
+
+        Parâmetros:
+          sigla_partido — partido no momento do voto ("PT", "PL"...)
+          sigla_uf      — UF do deputado ("SP", "RJ"...)
+          tipo_voto     — "Sim", "Não", "Abstenção", "Obstrução", "Art. 17"...
+          apos          — cursor: `proximo_cursor` da página anterior
+          limit         — máximo de itens (cap: 513, a Câmara inteira)
+
+        Lança HTTP 404 se a votação não existir e 400 se `apos` não votou nela.
+        Só votações com votos importados ficam em cache (24h): as demais ainda
+        vão receber votos e responderiam vazio até o TTL expirar.
+        """
+        safe_limit = min(abs(limit), _MAX_LIMIT_VOTOS)
+
+        partido_normalizado = sigla_partido.upper().strip() if sigla_partido else None
+        uf_normalizada      = sigla_uf.upper().strip() if sigla_uf else None
+        tipo_normalizado    = tipo_voto.strip() if tipo_voto else None
+
+        logger.info(
+            "Votos da votação id=%s | partido=%s uf=%s tipo_voto=%s apos=%s limit=%s",
+            votacao_id, partido_normalizado, uf_normalizada, tipo_normalizado, apos, safe_limit,
+        )
+
+        # Só há entrada para votação com votos importados e cursor já validado
+        chave = (
+            f"{_CACHE_VOTOS_PREFIXO}:{votacao_id}:{partido_normalizado}:{uf_normalizada}:"
+            f"{tipo_normalizado}:{apos}:{safe_limit}"
+        )
+        cached = await self._cache.get(chave)
+        if cached is not None:
+            return VotosVotacaoResponse.model_validate_json(cached)
+
+        votos_importados = await self._repo.get_votos_importados_repo(votacao_id)
+        if votos_importados is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Votação não encontrada.",
+            )
+
+        # Cursor fora da votação viraria uma página vazia silenciosa
+        if apos is not None and not await self._repo.politico_votou_repo(votacao_id, apos):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido: o político não votou nesta votação.",
+            )
+
+        votos = await self._repo.listar_votos_votacao_repo(
+            votacao_id,
+            sigla_partido=partido_normalizado,
+            sigla_uf=uf_normalizada,
+            tipo_voto=tipo_normalizado,
+            apos=apos,
+            limit=safe_limit,
+        )
+
+        if votos is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Votação não encontrada.",
+            )
+
+        if votos_importados:
+            await self._cache.set(chave, votos.model_dump_json(), expire=_CACHE_VOTOS_TTL)
+        return votos
@@ -9,11 +9,22 @@ Seguranca (OWASP):
 """
 
 import logging
+
+import numpy as np
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_cache import FastAPICache
 
+from backend.repositories.analitico_repository import AnaliticoRepository
 from backend.repositories.ranking_repository import RankingRepository
-from backend.services.performance_calc import calcular_score  # ← fonte única da verdade
+from backend.services.analitico import SnapshotIndisponivel
+from backend.services.performance_calc import (  # ← fonte única da verdade
+    calcular_estatisticas,
+    calcular_ranking,
+    calcular_scores_lote,
+    resultado_de_registro,
+)
+from backend.services.performance_snapshot import obter_ranking, obter_snapshot, obter_timeline_matriz
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +32,9 @@ logger = logging.getLogger(__name__)
 _MAX_LIMIT_RANKING   = 100
 _MAX_LIMIT_DISCURSOS = 500
 
+# Tamanho do "top" devolvido por /ranking/stats/geral
+_TOP_STATS_GERAL = 50
+
 # TTL do cache da media global (24h)
 _CACHE_MEDIA_GLOBAL_KEY = "media_global_score"
 _CACHE_MEDIA_GLOBAL_TTL = 86_400
@@ -31,6 +45,7 @@ class RankingService:
 
     def __init__(self, db: AsyncSession) -> None:
         self._repo  = RankingRepository(db)
+        self._analitico = AnaliticoRepository()
         self._cache = FastAPICache.get_backend()
 
     # ------------------------------------------------------------------
@@ -51,6 +66,127 @@ class RankingService:
             q=q, uf=uf, limit=safe_limit, offset=safe_offset
         )
 
+    # ------------------------------------------------------------------
+    # Ranking de assiduidade
+    # ------------------------------------------------------------------
+
+    async def get_ranking_assiduidade(
+        self,
+        *,
+        uf: str | None = None,
+        partido: str | None = None,
+        ano: int | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._repo.get_ranking_assiduidade(
+            uf=uf, partido=partido, ano=ano, limit=safe_limit, offset=safe_offset, order=order,
+        )
+
+    # ------------------------------------------------------------------
+    # Fidelidade partidária e coesão
+    # ------------------------------------------------------------------
+
+    async def get_ranking_fidelidade(
+        self,
+        *,
+        uf: str | None = None,
+        partido: str | None = None,
+        ano: int | None = None,
+        min_votos: int = 1,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._repo.get_ranking_fidelidade(
+            uf=uf, partido=partido, ano=ano, min_votos=max(min_votos, 1),
+            limit=safe_limit, offset=safe_offset, order=order,
+        )
+
+    async def get_ranking_coesao_partidos(
+        self,
+        *,
+        ano: int | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._repo.get_ranking_coesao_partidos(
+            ano=ano, limit=safe_limit, offset=safe_offset, order=order,
+        )
+
+    # ------------------------------------------------------------------
+    # Rankings do snapshot analítico (Parquet + DuckDB, fora do Postgres)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _do_snapshot(consulta):
+        """Executa a consulta analítica; sem snapshot exportado responde 503."""
+        try:
+            return await consulta
+        except SnapshotIndisponivel:
+            logger.warning("Snapshot analitico ainda nao exportado")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Dados analíticos ainda não disponíveis.",
+            )
+
+    async def get_ranking_despesas_categoria(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._do_snapshot(self._analitico.get_ranking_despesas_categoria(
+            ano=ano, uf=uf, partido=partido, limit=safe_limit, offset=safe_offset,
+        ))
+
+    async def get_ranking_autoria(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        sigla_tipo: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._do_snapshot(self._analitico.get_ranking_autoria(
+            ano=ano, uf=uf, partido=partido, sigla_tipo=sigla_tipo, limit=safe_limit, offset=safe_offset,
+        ))
+
+    async def get_ranking_participacao_votacoes(
+        self,
+        *,
+        ano: int | None = None,
+        uf: str | None = None,
+        partido: str | None = None,
+        min_votacoes: int = 1,
+        limit: int = 100,
+        offset: int = 0,
+        order: str = "desc",
+    ):
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+        return await self._do_snapshot(self._analitico.get_ranking_participacao_votacoes(
+            ano=ano, uf=uf, partido=partido, min_votacoes=max(min_votacoes, 1),
+            limit=safe_limit, offset=safe_offset, order=order,
+        ))
+
     # ------------------------------------------------------------------
     # Rankings de empresas
     # ------------------------------------------------------------------
@@ -76,13 +212,172 @@ class RankingService:
     async def get_ranking_performance_politicos(self) -> list[dict]:
         """
         Calcula e ordena o ranking de performance de todos os politicos.
-        O calculo do score usa performance_calc.calcular_score — mesma logica
-        que o endpoint individual /politicos/{id}/performance.
+        O calculo do score usa performance_calc (calcular_ranking = versao
+        vetorizada de calcular_score) — mesma logica que o endpoint individual
+        /politicos/{id}/performance.
+
+        Le da tabela politico_performance (pre-calculada na ingestao); so
+        reagrega as tabelas brutas se ela ainda estiver vazia.
         """
+        precalculado = await self._repo.get_ranking_performance_precalculado()
+        if precalculado:
+            return [resultado_de_registro(r) for r in precalculado]
+
+        logger.warning("politico_performance vazia; calculando ranking ao vivo")
         raw_data = await self._repo.get_ranking_performance_politicos()
-        ranking  = [calcular_score(dict(p)) for p in raw_data]
-        ranking.sort(key=lambda x: x["score"], reverse=True)
-        return ranking
+        # Versão vetorizada de calcular_score: mesmos números, já ordenado
+        return calcular_ranking(raw_data)
+
+    async def listar_ranking_performance(
+        self,
+        *,
+        uf: str | None = None,
+        partido: str | None = None,
+        ano: int | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        order: str = "desc",
+    ) -> list[dict]:
+        """
+        Fatia do ranking de performance servida do snapshot ordenado em memoria.
+
+        `posicao` e `percentil` sao sempre relativos a Camara inteira (do mandato
+        ou do `ano`), mesmo quando a lista e filtrada por UF/partido.
+        Sem `limit`, devolve a lista inteira (compatibilidade com clientes antigos).
+        """
+        ranking = await obter_ranking(self._repo, ano)
+
+        if uf:
+            uf = uf.upper()
+            ranking = [p for p in ranking if p["uf"] == uf]
+        if partido:
+            partido = partido.upper()
+            ranking = [p for p in ranking if (p["partido"] or "").upper() == partido]
+        if order == "asc":
+            ranking = ranking[::-1]
+
+        safe_offset = max(offset, 0)
+        if limit is None:
+            return ranking[safe_offset:]
+        safe_limit = min(abs(limit), _MAX_LIMIT_RANKING)
+        return ranking[safe_offset:safe_offset + safe_limit]
+
+    async def _get_estatisticas_mandato(self, ranking: list[dict] | None = None) -> list:
+        """
+        Estatisticas do mandato (geral/UF/partido) gravadas pela ingestao.
+        Se a tabela estiver vazia, calcula a partir do snapshot do ranking.
+        """
+        estatisticas = await self._repo.get_estatisticas_performance()
+        if estatisticas:
+            return estatisticas
+
+        ranking = ranking if ranking is not None else await obter_ranking(self._repo)
+        return calcular_estatisticas(
+            [p["score"] for p in ranking],
+            [p["uf"] for p in ranking],
+            [p["partido"] for p in ranking],
+        )
+
+    async def get_stats_performance(self) -> dict:
+        """
+        Media/mediana global, medias por UF e partido e top do ranking.
+        Estatisticas lidas de performance_estatisticas; top vem do snapshot.
+        """
+        ranking = await obter_ranking(self._repo)
+        estatisticas = await self._get_estatisticas_mandato(ranking)
+
+        geral = next((e for e in estatisticas if e["grupo"] == "geral"), None)
+        medias: dict[str, dict[str, float]] = {"uf": {}, "partido": {}}
+        for e in estatisticas:
+            if e["grupo"] in medias:
+                medias[e["grupo"]][e["chave"]] = round(e["media"], 2)
+
+        return {
+            "media_global": round(geral["media"], 2) if geral else 0.0,
+            "mediana_global": round(geral["mediana"], 2) if geral else 0.0,
+            "total_parlamentares": geral["total"] if geral else 0,
+            "media_por_uf": medias["uf"],
+            "media_por_partido": medias["partido"],
+            "top_3": ranking[:_TOP_STATS_GERAL],
+        }
+
+    async def get_timeline_matriz(self) -> dict:
+        """Timeline de performance da Camara inteira (payload colunar, ver performance_snapshot)."""
+        return await obter_timeline_matriz(self._repo)
+
+    async def simular_ranking_performance(
+        self,
+        *,
+        peso_assiduidade: float,
+        peso_economia: float,
+        peso_producao: float,
+        meta_producao_mes: float,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> dict:
+        """
+        Ranking "e se": recalcula o score de todos os parlamentares com pesos e
+        meta de produção escolhidos pelo usuário.
+
+        Os pesos são proporções (normalizados para somar 1). O cálculo roda sobre
+        o snapshot colunar residente (performance_snapshot) com calcular_scores_lote,
+        sem consultar o banco — não faz sentido cachear SQL para um espaço de
+        parâmetros ilimitado.
+        """
+        soma = peso_assiduidade + peso_economia + peso_producao
+        if soma <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Ao menos um dos pesos deve ser maior que zero.",
+            )
+        pesos = (peso_assiduidade / soma, peso_economia / soma, peso_producao / soma)
+
+        safe_limit  = min(abs(limit), _MAX_LIMIT_RANKING)
+        safe_offset = max(offset, 0)
+
+        snapshot = await obter_snapshot(self._repo)
+        lote = calcular_scores_lote(
+            snapshot.assiduidade,
+            snapshot.pontos_producao,
+            snapshot.total_gasto,
+            snapshot.meses_mandato,
+            snapshot.ufs,
+            pesos=pesos,
+            meta_producao_mes=meta_producao_mes,
+        )
+
+        # Só a página pedida vira dict
+        pagina = np.argsort(lote["posicao"])[safe_offset:safe_offset + safe_limit].tolist()
+
+        return {
+            "pesos": {
+                "assiduidade": round(pesos[0], 4),
+                "economia":    round(pesos[1], 4),
+                "producao":    round(pesos[2], 4),
+            },
+            "meta_producao_mes": meta_producao_mes,
+            "total":  len(snapshot),
+            "limit":  safe_limit,
+            "offset": safe_offset,
+            "itens": [
+                {
+                    "posicao":   int(lote["posicao"][i]),
+                    "percentil": float(lote["percentil"][i]),
+                    "id":        int(snapshot.ids[i]),
+                    "nome":      snapshot.nomes[i],
+                    "uf":        snapshot.ufs[i],
+                    "partido":   snapshot.partidos[i],
+                    "foto":      snapshot.fotos[i],
+                    "score":     float(lote["score"][i]),
+                    "notas": {
+                        "assiduidade": float(lote["nota_assiduidade"][i]),
+                        "producao":    float(lote["nota_producao"][i]),
+                        "economia":    float(lote["nota_economia"][i]),
+                    },
+                }
+                for i in pagina
+            ],
+        }
 
     # ------------------------------------------------------------------
     # Media global (com cache manual)
@@ -91,18 +386,24 @@ class RankingService:
     async def get_media_global_cached(self) -> float:
         """
         Retorna a media global dos scores com cache de 24h.
-        Evita recalcular o ranking completo a cada requisicao de performance individual.
+        Le a estatistica pre-calculada (uma linha); nao monta mais o ranking completo.
         """
         media = await self._cache.get(_CACHE_MEDIA_GLOBAL_KEY)
 
         if media is None:
-            ranking = await self.get_ranking_performance_politicos()
-            if not ranking:
-                return 0.0
-            media = sum(p["score"] for p in ranking) / len(ranking)
+            geral = await self._repo.get_estatistica_geral_performance()
+            if geral is not None:
+                media = geral["media"]
+            else:
+                # Tabela ainda vazia: recorre ao snapshot em memoria
+                estatisticas = await self._get_estatisticas_mandato()
+                media = next((e["media"] for e in estatisticas if e["grupo"] == "geral"), None)
+                if media is None:
+                    return 0.0
+
             await self._cache.set(
                 _CACHE_MEDIA_GLOBAL_KEY, media, expire=_CACHE_MEDIA_GLOBAL_TTL
             )
-            logger.info("Media global recalculada: %.2f", media)
+            logger.info("Media global recarregada: %.2f", media)
 
-        return float(media)
\ No newline at end of file
+        return float(media)
@@ -79,11 +79,22 @@ export interface InfoPerformance {
   readonly cota_utilizada_pct: number
 }
 
+export interface RankingPerformance {
+  readonly posicao: number
+  readonly total: number
+  readonly percentil: number
+  readonly posicao_uf: number | null
+  readonly total_uf: number | null
+  readonly posicao_partido: number | null
+  readonly total_partido: number | null
+}
+
 export interface PoliticoPerformance {
   readonly politico_id: number
   readonly ano: number | null
   readonly score_final: number
   readonly media_global: number
+  readonly ranking: RankingPerformance | null   // null = cálculo ao vivo (sem posições)
   readonly detalhes: NotasPerformance
   readonly info: InfoPerformance
 }
@@ -120,6 +131,21 @@ export interface TimelineEntrada {
   readonly info: TimelineInfoAno
 }
 
+// ─────────────────────────────────────────────────────────────────────────────
+// Similares — espelha a resposta de GET /politicos/{id}/similares
+// ─────────────────────────────────────────────────────────────────────────────
+
+export interface PoliticoSimilar {
+  readonly politico_id: number
+  readonly nome: string
+  readonly uf: string | null
+  readonly partido_sigla: string | null
+  readonly url_foto: string | null
+  readonly votacoes_comuns: number   // votações nominais em que ambos votaram
+  readonly votos_iguais: number
+  readonly concordancia_pct: number  // votos_iguais / votacoes_comuns × 100
+}
+
 // ─────────────────────────────────────────────────────────────────────────────
 // Parâmetros de busca com tipos estritos
 // ─────────────────────────────────────────────────────────────────────────────
@@ -323,4 +349,29 @@ export async function fetchPoliticoTimeline(
   const data = await get<TimelineEntrada[]>(`/politicos/${id}/timeline`, { signal })
   assertArray<TimelineEntrada>(data, "fetchPoliticoTimeline")
   return data
-}
\ No newline at end of file
+}
+
+/**
+ * Retorna os parlamentares que mais votam como o político (top-k por
+ * percentual de votos iguais nas votações nominais em comum).
+ *
+ * @param id        - ID inteiro positivo do político
+ * @param k         - Quantidade de parlamentares (1–50, padrão 10)
+ * @param minComuns - Mínimo de votações em comum (padrão 20)
+ * @param signal    - AbortSignal para cancelamento
+ */
+export async function fetchPoliticoSimilares(
+  id: number,
+  k = 10,
+  minComuns = 20,
+  signal?: AbortSignal,
+): Promise<PoliticoSimilar[]> {
+  assertPoliticoId(id)
+  const params = {
+    k: Math.min(Math.max(Math.trunc(k), 1), 50),
+    min_comuns: Math.max(Math.trunc(minComuns), 1),
+  }
+  const data = await get<PoliticoSimilar[]>(`/politicos/${id}/similares`, { params, signal })
+  assertArray<PoliticoSimilar>(data, "fetchPoliticoSimilares")
+  return data
+}
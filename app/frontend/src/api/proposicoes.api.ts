@@ -7,6 +7,7 @@
  *  - GET /proposicoes/{id}/votacoes     → votações de uma proposição
  *  - GET /votacoes/                     → lista paginada com filtros
  *  - GET /votacoes/{id}                 → detalhe + orientações por partido
+ *  - GET /votacoes/{id}/votos           → votos individuais (filtros + cursor)
  */
 
 import { api } from "./client"
@@ -75,6 +76,21 @@ export interface OrientacaoPartido {
   readonly orientacao_voto: string | null   // "Sim", "Não", "Libera", "Obstrução"
 }
 
+/** Placar de votos nominais (outros = Art. 17 e demais tipos) */
+export interface Placar {
+  readonly sim: number
+  readonly nao: number
+  readonly abstencao: number
+  readonly obstrucao: number
+  readonly outros: number
+  readonly total: number
+}
+
+/** Placar de um partido ou UF dentro de uma votação */
+export interface PlacarGrupo extends Placar {
+  readonly sigla: string | null
+}
+
 /**
  * Votação na listagem.
  * Já inclui campos da proposição desnormalizados para evitar um segundo request.
@@ -96,11 +112,32 @@ export interface VotacaoResponse {
   readonly proposicao_numero: number | null
   readonly proposicao_ano: number | null
   readonly proposicao_ementa: string | null
+  // Placar geral — null quando a votação não tem votos nominais
+  readonly placar: Placar | null
 }
 
-/** Votação no detalhe — herda tudo de VotacaoResponse + orientações por partido */
+/** Votação no detalhe — herda tudo de VotacaoResponse + orientações e placar por partido/UF */
 export interface VotacaoDetalhe extends VotacaoResponse {
   readonly orientacoes: OrientacaoPartido[]
+  readonly placar_por_partido: PlacarGrupo[]
+  readonly placar_por_uf: PlacarGrupo[]
+}
+
+/** Voto de um deputado em uma votação (partido/UF do momento do voto) */
+export interface VotoParlamentar {
+  readonly politico_id: number
+  readonly nome: string
+  readonly url_foto: string | null
+  readonly sigla_partido: string | null
+  readonly sigla_uf: string | null
+  readonly tipo_voto: string | null         // "Sim", "Não", "Abstenção", "Obstrução", "Art. 17"...
+}
+
+/** Página de votos de uma votação — próxima página: `apos = proximo_cursor` */
+export interface VotosVotacaoResponse {
+  readonly votacao_id: number
+  readonly itens: VotoParlamentar[]
+  readonly proximo_cursor: number | null    // null = última página
 }
 
 // ─────────────────────────────────────────────────────────────────────────────
@@ -124,6 +161,14 @@ export interface VotacoesFiltros {
   offset?: number
 }
 
+export interface VotosVotacaoFiltros {
+  partido?: string
+  uf?: string
+  tipo_voto?: string
+  apos?: number            // cursor: proximo_cursor da página anterior
+  limit?: number           // padrão: 100, máx: 513
+}
+
 // ─────────────────────────────────────────────────────────────────────────────
 // Funções de fetch — Proposições
 // ─────────────────────────────────────────────────────────────────────────────
@@ -184,4 +229,17 @@ export async function fetchVotacao(
 ): Promise<VotacaoDetalhe> {
   const { data } = await api.get<VotacaoDetalhe>(`/votacoes/${id}`, { signal })
   return data
-}
\ No newline at end of file
+}
+
+/** Lista como cada deputado votou em uma votação (paginação por cursor) */
+export async function fetchVotosVotacao(
+  id: number,
+  filtros?: VotosVotacaoFiltros,
+  signal?: AbortSignal,
+): Promise<VotosVotacaoResponse> {
+  const { data } = await api.get<VotosVotacaoResponse>(`/votacoes/${id}/votos`, {
+    params: filtros,
+    signal,
+  })
+  return data
+}
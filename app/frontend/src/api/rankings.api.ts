@@ -10,6 +10,68 @@ export interface RankingDespesaPolitico {
   total_gasto: number
 }
 
+export interface RankingAssiduidadePolitico {
+  politico_id: number
+  nome: string
+  uf: string | null
+  partido_sigla: string | null
+  url_foto: string | null
+  sessoes: number
+  presencas: number
+  ausencias: number
+  justificadas: number     // ausências com justificativa
+  assiduidade_pct: number  // presencas / sessoes × 100
+}
+
+export interface RankingFidelidadePolitico {
+  politico_id: number
+  nome: string
+  uf: string | null
+  partido_sigla: string | null
+  url_foto: string | null
+  votos_orientados: number  // votos com orientação do próprio partido
+  votos_fieis: number       // dos quais seguiram a orientação
+  fidelidade_pct: number    // votos_fieis / votos_orientados × 100
+}
+
+export interface RankingCoesaoPartido {
+  sigla_partido: string
+  votacoes: number
+  coesao_pct: number | null      // média do índice de Rice × 100 (100 = sempre unânime)
+  votos_orientados: number
+  votos_fieis: number
+  fidelidade_pct: number | null  // % dos votos dos membros que seguiram a orientação
+}
+
+// Rankings do snapshot analítico (503 enquanto a ingestão não exportou)
+export interface RankingDespesaCategoria {
+  tipo_despesa: string
+  total_gasto: number
+  documentos: number
+  parlamentares: number
+}
+
+export interface RankingAutoriaPolitico {
+  politico_id: number
+  nome: string
+  uf: string | null
+  partido_sigla: string | null
+  url_foto: string | null
+  proposicoes: number          // proposições de que é autor ou coautor
+  como_primeiro_autor: number  // das quais assina em primeiro lugar
+}
+
+export interface RankingParticipacaoVotacoes {
+  politico_id: number
+  nome: string
+  uf: string | null
+  partido_sigla: string | null
+  url_foto: string | null
+  votacoes: number          // votações nominais entre o primeiro e o último voto no período
+  votos: number             // das quais registrou voto
+  participacao_pct: number  // votos / votacoes × 100
+}
+
 export interface RankingEmpresaLucro {
   cnpj: string
   nome_fornecedor: string
@@ -44,11 +106,16 @@ export interface RankingPerformancePolitico {
   foto: string
   score: number
   notas: NotasPerformance
+  posicao: number       // 1 = melhor score (relativo à Câmara inteira)
+  percentil: number     // % de parlamentares com score menor ou igual
 }
 
 export interface StatsGeral {
   media_global: number
+  mediana_global: number
   total_parlamentares: number
+  media_por_uf: Record<string, number>
+  media_por_partido: Record<string, number>
   top_3: RankingPerformancePolitico[]
 }
 
@@ -68,6 +135,68 @@ export interface RankingLucroParams {
   offset?: number   // Paginação
 }
 
+export interface RankingPerformanceParams {
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  ano?: number              // Ranking de um ano específico (padrão: mandato)
+  limit?: number            // Quantidade de resultados (max 100; omitido = todos)
+  offset?: number           // Paginação
+  order?: "desc" | "asc"    // desc = melhores primeiro
+}
+
+export interface RankingAssiduidadeParams {
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  ano?: number              // Ranking de um ano específico (padrão: mandato)
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+  order?: "desc" | "asc"    // desc = mais assíduos primeiro
+}
+
+export interface RankingFidelidadeParams {
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  ano?: number              // Ranking de um ano específico (padrão: mandato)
+  min_votos?: number        // Mínimo de votos orientados (padrão: 10)
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+  order?: "desc" | "asc"    // desc = mais fiéis primeiro
+}
+
+export interface RankingCoesaoParams {
+  ano?: number              // Ranking de um ano específico (padrão: mandato)
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+  order?: "desc" | "asc"    // desc = mais coesos primeiro
+}
+
+export interface RankingDespesaCategoriaParams {
+  ano?: number              // Ano das despesas (padrão: todos)
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+}
+
+export interface RankingAutoriaParams {
+  ano?: number              // Ano de apresentação (padrão: todos)
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  sigla_tipo?: string       // Tipo da proposição (PL, PEC...)
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+}
+
+export interface RankingParticipacaoParams {
+  ano?: number              // Ranking de um ano específico (padrão: todos)
+  uf?: string               // Filtro por estado
+  partido?: string          // Filtro por partido
+  min_votacoes?: number     // Mínimo de votações no período (padrão: 10)
+  limit?: number            // Quantidade de resultados (max 100)
+  offset?: number           // Paginação
+  order?: "desc" | "asc"    // desc = mais participativos primeiro
+}
+
 export interface RankingDiscursoParams {
   limit?: number    // Quantidade de resultados (max 500)
   offset?: number   // Paginação
@@ -92,6 +221,96 @@ export async function getRankingDespesas(
   return data
 }
 
+/**
+ * Busca o ranking de políticos por assiduidade nas sessões
+ * Endpoint: GET /ranking/assiduidade
+ * Cache: 24 horas no backend
+ */
+export async function getRankingAssiduidade(
+  params?: RankingAssiduidadeParams
+): Promise<RankingAssiduidadePolitico[]> {
+  const { data } = await api.get<RankingAssiduidadePolitico[]>(
+    "/ranking/assiduidade",
+    { params }
+  )
+  return data
+}
+
+/**
+ * Busca o ranking de políticos por fidelidade à orientação do partido
+ * Endpoint: GET /ranking/fidelidade
+ * Cache: 24 horas no backend
+ */
+export async function getRankingFidelidade(
+  params?: RankingFidelidadeParams
+): Promise<RankingFidelidadePolitico[]> {
+  const { data } = await api.get<RankingFidelidadePolitico[]>(
+    "/ranking/fidelidade",
+    { params }
+  )
+  return data
+}
+
+/**
+ * Busca o ranking de partidos por coesão nas votações
+ * Endpoint: GET /ranking/coesao_partidos
+ * Cache: 24 horas no backend
+ */
+export async function getRankingCoesaoPartidos(
+  params?: RankingCoesaoParams
+): Promise<RankingCoesaoPartido[]> {
+  const { data } = await api.get<RankingCoesaoPartido[]>(
+    "/ranking/coesao_partidos",
+    { params }
+  )
+  return data
+}
+
+/**
+ * Busca o ranking de tipos de despesa da cota parlamentar
+ * Endpoint: GET /ranking/despesas_categoria
+ * Cache: 24 horas no backend (snapshot analítico)
+ */
+export async function getRankingDespesasCategoria(
+  params?: RankingDespesaCategoriaParams
+): Promise<RankingDespesaCategoria[]> {
+  const { data } = await api.get<RankingDespesaCategoria[]>(
+    "/ranking/despesas_categoria",
+    { params }
+  )
+  return data
+}
+
+/**
+ * Busca o ranking de políticos por proposições de sua autoria
+ * Endpoint: GET /ranking/autoria
+ * Cache: 24 horas no backend (snapshot analítico)
+ */
+export async function getRankingAutoria(
+  params?: RankingAutoriaParams
+): Promise<RankingAutoriaPolitico[]> {
+  const { data } = await api.get<RankingAutoriaPolitico[]>(
+    "/ranking/autoria",
+    { params }
+  )
+  return data
+}
+
+/**
+ * Busca o ranking de políticos por participação nas votações nominais
+ * Endpoint: GET /ranking/participacao_votacoes
+ * Cache: 24 horas no backend (snapshot analítico)
+ */
+export async function getRankingParticipacaoVotacoes(
+  params?: RankingParticipacaoParams
+): Promise<RankingParticipacaoVotacoes[]> {
+  const { data } = await api.get<RankingParticipacaoVotacoes[]>(
+    "/ranking/participacao_votacoes",
+    { params }
+  )
+  return data
+}
+
 /**
  * Busca o ranking de empresas que mais receberam recursos
  * Endpoint: GET /ranking/lucro_empresas
@@ -129,9 +348,12 @@ export async function getRankingDiscursos(
  * Endpoint: GET /ranking/performance_politicos
  * Cache: 24 horas no backend
  */
-export async function getRankingPerformance(): Promise<RankingPerformancePolitico[]> {
+export async function getRankingPerformance(
+  params?: RankingPerformanceParams
+): Promise<RankingPerformancePolitico[]> {
   const { data } = await api.get<RankingPerformancePolitico[]>(
-    "/ranking/performance_politicos"
+    "/ranking/performance_politicos",
+    { params }
   )
   return data
 }
@@ -1,6 +1,8 @@
 import requests
+import ijson
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configuração básica de log para você saber o que está acontecendo no ingest
 logging.basicConfig(level=logging.INFO)
@@ -25,27 +27,133 @@ def camara_get(path: str, params=None, tentativas=3):
             logger.warning(f"Erro em {url}. Tentando novamente em {wait}s...")
             time.sleep(wait)
 
-def camara_paginado(path: str, params=None):
+def _abrir_stream(url: str, params=None, tentativas=3):
+    """
+    Abre a resposta em modo stream, com as mesmas retentativas do `camara_get`.
+    As retentativas só valem até o primeiro byte: depois que os itens começam a
+    ser entregues, um erro de rede sobe para o chamador.
+    """
+    for tentativa in range(tentativas):
+        try:
+            r = requests.get(url, params=params, headers=HEADERS, timeout=30, stream=True)
+            r.raise_for_status()
+            r.raw.decode_content = True  # descompacta gzip antes do parser
+            return r
+        except requests.RequestException as e:
+            if tentativa == tentativas - 1:
+                logger.error(f"Erro definitivo em {url}: {e}")
+                raise
+            wait = 2 ** tentativa
+            logger.warning(f"Erro em {url}. Tentando novamente em {wait}s...")
+            time.sleep(wait)
+
+def _camara_stream_pagina(path: str, params=None):
+    """
+    Lê UMA página de forma incremental (ijson) e gera cada item de `dados`
+    assim que ele é parseado, sem montar o JSON inteiro na memória.
+    Ao terminar, retorna (via StopIteration) a lista de `links` da página:
+        links = yield from _camara_stream_pagina(path, params)
+    """
+    url = f"{API_BASE}{path}" if path.startswith("/") else path
+    r = _abrir_stream(url, params=params)
+
+    links = []
+    builder = None
+    alvo = None
+    profundidade = 0
+
+    try:
+        for prefix, event, value in ijson.parse(r.raw, use_float=True):
+            if builder is None:
+                if prefix not in ("dados.item", "links.item"):
+                    continue
+                builder = ijson.ObjectBuilder()
+                alvo = prefix
+
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                profundidade += 1
+            elif event in ("end_map", "end_array"):
+                profundidade -= 1
+
+            if profundidade == 0:
+                if alvo == "dados.item":
+                    yield builder.value
+                else:
+                    links.append(builder.value)
+                builder = None
+    finally:
+        r.close()
+
+    return links
+
+def camara_get_stream(path: str, params=None):
+    """
+    Versão em stream do `camara_get` para endpoints sem paginação
+    (ex: /votacoes/{id}/votos): gera os itens de `dados` um a um.
+    """
+    yield from _camara_stream_pagina(path, params)
+
+def camara_paginado(path: str, params=None, stream: bool = False):
     """
     Gerador que percorre todas as páginas de um endpoint.
     Útil para /votos, /deputados e /eventos.
+
+    Com `stream=True` cada página é parseada incrementalmente: os itens
+    começam a ser processados antes do download terminar e o pico de memória
+    fica limitado a um item por vez.
     """
     params = params or {}
     params.setdefault("itens", 100)
     params.setdefault("pagina", 1)
 
     while True:
-        dados = camara_get(path, params=params)
-        yield from dados.get("dados", [])
+        if stream:
+            links = yield from _camara_stream_pagina(path, params=params)
+        else:
+            dados = camara_get(path, params=params)
+            yield from dados.get("dados", [])
+            links = dados.get("links", [])
 
         # Verifica se existe link 'next' nos links da API
-        next_link = next((l["href"] for l in dados.get("links", []) if l["rel"] == "next"), None)
+        next_link = next((l["href"] for l in links if l["rel"] == "next"), None)
         if not next_link:
             break
         path = next_link # O link já vem completo
         params = None    # O link 'next' já contém os parâmetros
 
 
+def buscar_concorrente(funcao, chaves, max_workers: int = 8):
+    """
+    Aplica `funcao(chave)` em paralelo (threads) e gera `(chave, resultado)`
+    na ordem em que as respostas chegam.
+    Falhas definitivas (após as retentativas) geram `(chave, None)` para que o
+    chamador decida se pula ou tenta de novo na próxima execução.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {executor.submit(funcao, chave): chave for chave in chaves}
+        for futuro in as_completed(futuros):
+            chave = futuros[futuro]
+            try:
+                yield chave, futuro.result()
+            except Exception as e:
+                logger.warning(f"⚠️ Falha definitiva na requisição {chave}: {e}")
+                yield chave, None
+
+def camara_get_concorrente(requisicoes: dict, max_workers: int = 8):
+    """
+    Executa vários `camara_get` em paralelo.
+
+    `requisicoes` mapeia uma chave qualquer (ex: id da proposição) para
+    `(path, params)`. Gera `(chave, payload)`; falhas geram `(chave, None)`.
+    """
+    yield from buscar_concorrente(
+        lambda chave: camara_get(*requisicoes[chave]),
+        list(requisicoes),
+        max_workers=max_workers,
+    )
+
+
 def buscar_deputados():
     # Retorna todos os deputados atuais (paginado internamente)
     return camara_paginado("/deputados")
@@ -63,14 +171,26 @@ def buscar_eventos(data_inicio: str, data_fim: str):
         "ordem": "ASC", 
         "ordenarPor": "dataHoraInicio"
     }
-    return camara_paginado("/eventos", params=params)
+    return camara_paginado("/eventos", params=params, stream=True)
+
+def buscar_evento_detalhe(id_evento: int):
+    return camara_get(f"/eventos/{id_evento}").get("dados")
+
+def buscar_evento_deputados(id_evento: int):
+    return camara_get(f"/eventos/{id_evento}/deputados").get("dados", [])
+
+def buscar_evento_pauta(id_evento: int):
+    return camara_get(f"/eventos/{id_evento}/pauta").get("dados", [])
+
+def buscar_evento_votacoes(id_evento: int):
+    return camara_get(f"/eventos/{id_evento}/votacoes").get("dados", [])
 
 def buscar_votacao_detalhe(id_votacao: str):
     return camara_get(f"/votacoes/{id_votacao}").get("dados")
 
 def buscar_votacao_votos(id_votacao: str):
-    # Votos podem ser muitos, melhor usar o paginado
-    return camara_paginado(f"/votacoes/{id_votacao}/votos")
+    # Este endpoint NÃO aceita parâmetros de paginação: uma página só, lida em stream
+    return camara_get_stream(f"/votacoes/{id_votacao}/votos")
 
 def buscar_votacao_orientacoes(id_votacao: str):
     return camara_get(f"/votacoes/{id_votacao}/orientacoes").get("dados", [])
\ No newline at end of file
@@ -10,6 +10,8 @@ from sqlalchemy import (
     UniqueConstraint,
     Table,
     Boolean,
+    Float,
+    Index,
     ForeignKey
 )
 from sqlalchemy.orm import relationship
@@ -94,6 +96,8 @@ class Despesa(Base):
     # Fornecedor
     nome_fornecedor = Column(Text) # Fornecedores podem ter nomes gigantes
     cnpj_cpf_fornecedor = Column(String(20), index=True)
+    # Fornecedor canônico (CNPJ normalizado + aliases), atribuído na ingestão
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Valores
     valor_documento = Column(Numeric(12, 2))
@@ -181,17 +185,69 @@ class Evento(Base):
     url_evento = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
 
+    # Status das fases da ingestão (permite retomar de onde parou)
+    detalhado = Column(Boolean, default=False, server_default="false", nullable=False, index=True)
+    participantes_importados = Column(Boolean, default=False, server_default="false", nullable=False)
+    pauta_importada = Column(Boolean, default=False, server_default="false", nullable=False)
+    votacoes_importadas = Column(Boolean, default=False, server_default="false", nullable=False)
+
     orgaos = relationship(
         "Orgao",
         secondary="eventos_orgaos",
         back_populates="eventos"
     )
 
+    deputados = relationship(
+        "Politico",
+        secondary="eventos_deputados"
+    )
+
+    pauta = relationship(
+        "EventoPauta",
+        back_populates="evento"
+    )
+
     discursos = relationship(
         "Discurso",
         back_populates="evento"
     )
 
+eventos_deputados = Table(
+    "eventos_deputados",
+    Base.metadata,
+    Column("evento_id", Integer, ForeignKey("eventos.id", ondelete="CASCADE"), primary_key=True),
+    Column("politico_id", Integer, ForeignKey("politicos.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+class EventoPauta(Base):
+    __tablename__ = "eventos_pauta"
+
+    id = Column(Integer, primary_key=True)
+    evento_id = Column(Integer, ForeignKey("eventos.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    ordem = Column(Integer)
+    topico = Column(Text)
+    regime = Column(String(150))
+    situacao_item = Column(Text)
+
+    # Proposição em pauta (id da Câmara sempre; FK só se já estiver no banco)
+    id_camara_proposicao = Column(Integer, index=True)
+    proposicao_id = Column(Integer, ForeignKey("proposicoes.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    uri_votacao = Column(Text)
+
+    evento = relationship("Evento", back_populates="pauta")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "evento_id",
+            "ordem",
+            "id_camara_proposicao",
+            name="uq_evento_pauta_item",
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+
 class Orgao(Base):
     __tablename__ = "orgaos"
 
@@ -280,6 +336,8 @@ class Proposicao(Base):
 
     # Datas
     data_apresentacao = Column(DateTime)
+    # Última consulta a /proposicoes/{id}/temas (NULL = nunca consultada)
+    temas_buscados_em = Column(DateTime, nullable=True)
 
     # Links
     url_inteiro_teor = Column(Text)
@@ -398,6 +456,11 @@ class Tramitacao(Base):
 
     proposicao = relationship("Proposicao", back_populates="tramitacoes")
 
+    # A sequência é única dentro da proposição: permite inserir em lote com ON CONFLICT
+    __table_args__ = (
+        UniqueConstraint("proposicao_id", "sequencia", name="uq_tramitacao_sequencia"),
+    )
+
 class Votacao(Base):
     __tablename__ = "votacoes"
 
@@ -407,7 +470,7 @@ class Votacao(Base):
 
     proposicao_id = Column(Integer, ForeignKey("proposicoes.id", ondelete="CASCADE"), index=True)
     
-    data = Column(Date)
+    data = Column(Date, index=True)
     data_hora_registro = Column(DateTime)
 
     tipo_votacao = Column(String(50)) # Ex: "Nominal" ou "Simbólica"
@@ -415,6 +478,8 @@ class Votacao(Base):
     aprovacao = Column(Integer)  # 1 aprovado, 0 rejeitado, -1 indefinido
     votos_importados = Column(Boolean, default=False)
     indexada = Column(Boolean, default=False)
+    # False = votos/orientações mudaram desde o último cálculo de fidelidade e coesão
+    fidelidade_calculada = Column(Boolean, default=False)
     sigla_orgao = Column(String(20))
 
     evento_id = Column(Integer, ForeignKey("eventos.id", ondelete="SET NULL"), nullable=True)
@@ -425,6 +490,14 @@ class Votacao(Base):
     uri_evento = Column(Text)
     uri_orgao = Column(Text)
 
+    # Placar geral, calculado ao importar os votos (NULL = sem votos nominais)
+    placar_sim = Column(Integer, nullable=True)
+    placar_nao = Column(Integer, nullable=True)
+    placar_abstencao = Column(Integer, nullable=True)
+    placar_obstrucao = Column(Integer, nullable=True)
+    placar_outros = Column(Integer, nullable=True)  # Art. 17 e demais
+    placar_total = Column(Integer, nullable=True)
+
     # Relacionamentos
     votos = relationship("Voto", back_populates="votacao")
     orientacoes = relationship("OrientacaoVotacao", back_populates="votacao")
@@ -580,4 +653,331 @@ class Presenca(Base):
     # Evita duplicar a mesma sessão para o mesmo político no mesmo dia
     __table_args__ = (
         UniqueConstraint('politico_id', 'data', 'sessao_descricao', name='uq_presenca_sessao'),
-    )
\ No newline at end of file
+    )
+
+
+class PresencaResumo(Base):
+    """
+    Contadores de presença por (político, ano, mês), mantidos pela ingestão de presenças.
+    Fonte de todo cálculo de assiduidade: presencas / sessoes.
+
+    justificadas = ausências com justificativa; ausencias = demais ausências.
+    """
+    __tablename__ = "presenca_resumo"
+
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), primary_key=True)
+    ano = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)
+
+    sessoes = Column(Integer, nullable=False)
+    presencas = Column(Integer, nullable=False)
+    ausencias = Column(Integer, nullable=False)
+    justificadas = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_presenca_resumo_ano", "ano"),
+    )
+
+
+class PoliticoPerformance(Base):
+    """
+    Score de performance pré-calculado (saída de performance_calc.calcular_score).
+    Reconstruída ao final da ingestão; `ano` NULL = mandato inteiro.
+    """
+    __tablename__ = "politico_performance"
+
+    id = Column(Integer, primary_key=True)
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), nullable=False, index=True)
+    ano = Column(Integer, nullable=True)
+
+    # Dados brutos (entrada do cálculo)
+    assiduidade_pct = Column(Float, nullable=False)
+    pontos_producao = Column(Float, nullable=False)
+    total_gasto = Column(Float, nullable=False)
+    meses_mandato = Column(Integer, nullable=False)
+
+    # Resultado do cálculo
+    score = Column(Float, nullable=False)
+    nota_assiduidade = Column(Float, nullable=False)
+    nota_producao = Column(Float, nullable=False)
+    nota_economia = Column(Float, nullable=False)
+    cota_mensal = Column(Float, nullable=False)
+    cota_total = Column(Float, nullable=False)
+    cota_utilizada_pct = Column(Float, nullable=False)
+
+    # Índice de posições (mesmo ano): Câmara inteira, dentro da UF e do partido
+    posicao = Column(Integer, nullable=True)
+    percentil = Column(Float, nullable=True)
+    total_ranking = Column(Integer, nullable=True)
+    posicao_uf = Column(Integer, nullable=True)
+    total_uf = Column(Integer, nullable=True)
+    posicao_partido = Column(Integer, nullable=True)
+    total_partido = Column(Integer, nullable=True)
+
+    atualizado_em = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "politico_id",
+            "ano",
+            name="uq_politico_performance_ano",
+            postgresql_nulls_not_distinct=True
+        ),
+        Index("ix_politico_performance_ano_score", "ano", "score"),
+    )
+
+
+class PerformanceEstatistica(Base):
+    """
+    Estatísticas agregadas dos scores de politico_performance (média, mediana, total).
+    Reconstruída junto com politico_performance; lida em O(1) pela API.
+
+    grupo: "geral" (chave NULL), "uf" (chave = sigla da UF) ou "partido" (chave = sigla).
+    `ano` NULL = mandato inteiro.
+    """
+    __tablename__ = "performance_estatisticas"
+
+    id = Column(Integer, primary_key=True)
+    ano = Column(Integer, nullable=True)
+    grupo = Column(String(10), nullable=False)
+    chave = Column(String(50), nullable=True)
+
+    total = Column(Integer, nullable=False)
+    media = Column(Float, nullable=False)
+    mediana = Column(Float, nullable=False)
+
+    atualizado_em = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "ano",
+            "grupo",
+            "chave",
+            name="uq_performance_estatistica",
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+
+
+class DiscursoKeyword(Base):
+    """
+    Contagem de keywords dos discursos por parlamentar, já normalizadas
+    (maiúsculas, sem blacklist). Reconstruída na ingestão; lida pelo ranking de discursos.
+    """
+    __tablename__ = "discurso_keywords"
+
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), primary_key=True)
+    keyword = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class Fornecedor(Base):
+    """
+    Dimensão de fornecedores das despesas.
+    `chave` = CNPJ/CPF só com dígitos; sem documento, "NOCNPJ_" + nome normalizado.
+    Aliases conhecidos (ex: "TAM" → LATAM) são resolvidos na ingestão.
+    """
+    __tablename__ = "fornecedores"
+
+    id = Column(Integer, primary_key=True)
+    chave = Column(String(255), nullable=False, unique=True)
+    cnpj = Column(String(20), nullable=True)
+    nome = Column(Text, nullable=False)
+
+
+class FornecedorTotal(Base):
+    """Total recebido por fornecedor (agregado de despesas), reconstruído na ingestão."""
+    __tablename__ = "fornecedor_totais"
+
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id", ondelete="CASCADE"), primary_key=True)
+    total_recebido = Column(Numeric(14, 2), nullable=False)
+    total_despesas = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_fornecedor_totais_total", "total_recebido"),
+    )
+
+
+class DespesaMensal(Base):
+    """
+    Rollup das despesas por (político, ano, mês, tipo, fornecedor): soma e quantidade.
+    Mantido pela ingestão de despesas (reconstruído por político afetado); as
+    leituras agregadas de despesas escalam com meses, não com notas fiscais.
+    """
+    __tablename__ = "despesas_mensais"
+
+    id = Column(Integer, primary_key=True)
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), nullable=False)
+    ano = Column(Integer, nullable=False)
+    mes = Column(Integer, nullable=False)
+    tipo_despesa = Column(Text, nullable=True)
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id", ondelete="CASCADE"), nullable=True)
+
+    total = Column(Numeric(14, 2), nullable=False)
+    quantidade = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "politico_id",
+            "ano",
+            "mes",
+            "tipo_despesa",
+            "fornecedor_id",
+            name="uq_despesa_mensal",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_despesas_mensais_ano", "ano"),
+    )
+
+
+class DespesaTopResumo(Base):
+    """
+    Top fornecedores e top categorias de despesa por político, pré-calculados
+    a partir de despesas_mensais junto com o rollup (resumo do perfil).
+
+    tipo: "fornecedor" (com categoria_principal) ou "categoria".
+    `ano` NULL = mandato inteiro.
+    """
+    __tablename__ = "despesa_top_resumo"
+
+    id = Column(Integer, primary_key=True)
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), nullable=False)
+    ano = Column(Integer, nullable=True)
+    tipo = Column(String(10), nullable=False)
+    posicao = Column(Integer, nullable=False)
+
+    nome = Column(Text, nullable=False)
+    total = Column(Numeric(14, 2), nullable=False)
+    categoria_principal = Column(Text, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "politico_id",
+            "ano",
+            "tipo",
+            "posicao",
+            name="uq_despesa_top_resumo",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+class PoliticoVotoFeed(Base):
+    """
+    Fato desnormalizado voto × parlamentar, já com a data da votação.
+    Preenchido na importação dos votos; os feeds paginados do perfil viram
+    varredura de índice (politico_id, data) e o total, contagem pelo mesmo índice.
+    A proposição é buscada só para as linhas da página (pode ser vinculada depois).
+    """
+    __tablename__ = "politico_votos_feed"
+
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), primary_key=True)
+    votacao_id = Column(Integer, ForeignKey("votacoes.id", ondelete="CASCADE"), primary_key=True)
+    data = Column(Date, nullable=True)
+    tipo_voto = Column(String(20))
+    # Seguiu a orientação do próprio partido? NULL = sem orientação aplicável
+    fiel = Column(Boolean, nullable=True)
+
+    __table_args__ = (
+        Index("ix_politico_votos_feed_data", "politico_id", "data", "votacao_id"),
+    )
+
+
+class VotacaoPlacar(Base):
+    """
+    Placar de uma votação por partido e por UF (sigla do voto no momento da votação),
+    calculado junto com o placar geral ao importar os votos.
+
+    grupo: "partido" ou "uf"; `chave` = sigla (NULL quando o voto veio sem ela).
+    """
+    __tablename__ = "votacao_placar"
+
+    id = Column(Integer, primary_key=True)
+    votacao_id = Column(Integer, ForeignKey("votacoes.id", ondelete="CASCADE"), nullable=False, index=True)
+    grupo = Column(String(10), nullable=False)
+    chave = Column(String(30), nullable=True)
+
+    sim = Column(Integer, nullable=False)
+    nao = Column(Integer, nullable=False)
+    abstencao = Column(Integer, nullable=False)
+    obstrucao = Column(Integer, nullable=False)
+    outros = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+
+
+class CoesaoVotacao(Base):
+    """
+    Comportamento de cada partido em uma votação (injest_fidelidade).
+    Unidade do cálculo incremental: regravada só para as votações novas/alteradas.
+
+    votos:  votos Sim/Não/Abstenção/Obstrução dos membros (Art. 17 e demais ficam de fora);
+    rice:   índice de Rice |sim - não| / (sim + não), NULL sem votos Sim/Não;
+    orientados / fieis: votos com orientação do partido e quantos a seguiram.
+    """
+    __tablename__ = "coesao_votacao"
+
+    votacao_id = Column(Integer, ForeignKey("votacoes.id", ondelete="CASCADE"), primary_key=True)
+    sigla_partido = Column(String(30), primary_key=True)
+    ano = Column(Integer, nullable=True, index=True)
+
+    orientacao = Column(String(20), nullable=True)
+    votos = Column(Integer, nullable=False)
+    sim = Column(Integer, nullable=False)
+    nao = Column(Integer, nullable=False)
+    votos_orientados = Column(Integer, nullable=False)
+    votos_fieis = Column(Integer, nullable=False)
+    rice = Column(Float, nullable=True)
+
+
+class FidelidadePolitico(Base):
+    """
+    Fidelidade partidária por parlamentar: % dos votos com orientação do
+    partido em que o voto seguiu a orientação. `ano` NULL = mandato inteiro.
+    Agregada de politico_votos_feed.fiel.
+    """
+    __tablename__ = "fidelidade_politico"
+
+    id = Column(Integer, primary_key=True)
+    politico_id = Column(Integer, ForeignKey("politicos.id", ondelete="CASCADE"), nullable=False)
+    ano = Column(Integer, nullable=True)
+
+    votos_orientados = Column(Integer, nullable=False)
+    votos_fieis = Column(Integer, nullable=False)
+    fidelidade_pct = Column(Float, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "politico_id",
+            "ano",
+            name="uq_fidelidade_politico",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_fidelidade_politico_ano", "ano", "fidelidade_pct"),
+    )
+
+
+class CoesaoPartido(Base):
+    """
+    Coesão (média do índice de Rice nas votações, em %) e fidelidade média
+    dos membros por partido. `ano` NULL = mandato inteiro. Agregada de coesao_votacao.
+    """
+    __tablename__ = "coesao_partido"
+
+    id = Column(Integer, primary_key=True)
+    sigla_partido = Column(String(30), nullable=False)
+    ano = Column(Integer, nullable=True)
+
+    votacoes = Column(Integer, nullable=False)
+    coesao_pct = Column(Float, nullable=True)
+    votos_orientados = Column(Integer, nullable=False)
+    votos_fieis = Column(Integer, nullable=False)
+    fidelidade_pct = Column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "sigla_partido",
+            "ano",
+            name="uq_coesao_partido",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
@@ -9,15 +9,24 @@ from injest_banco.db.models import (
     Partido,
     Politico,
     Evento,
+    EventoPauta,
+    eventos_deputados,
+    eventos_orgaos,
     ProposicaoAutor,
     Proposicao,
+    Tema,
+    Tramitacao,
+    proposicoes_temas,
     VerbaGabinete,
     Votacao,
     OrientacaoVotacao,
     Voto,
+    VotacaoPlacar,
+    PoliticoVotoFeed,
     Despesa
 )
 
+from sqlalchemy import case, delete, func, literal, select, tuple_, update
 from sqlalchemy.dialects.postgresql import insert
 
 logging.basicConfig(level=logging.INFO)
@@ -182,38 +191,57 @@ def carregar_eventos_indexados(db):
     eventos = db.query(Evento).all()
     return {e.id_camara: e for e in eventos}
 
-def upsert_evento_index(db, cache: dict, d: dict):
-    id_camara = d["id"]
-
-    evento = cache.get(id_camara)
-
-    # ⚠️ eventos da listagem SEM data não entram
-    data_inicio = parse_datetime(d.get("dataHoraInicio"))
-    if not data_inicio:
-        return
+def upsert_eventos_index(db: Session, itens: list[dict]) -> int:
+    """
+    Upsert em lote do índice de eventos (listagem de /eventos).
+    Situação e horários são atualizados: eventos são cancelados/remarcados.
+    Retorna a quantidade de linhas inseridas ou atualizadas.
+    """
+    rows = {}
+    for d in itens:
+        # ⚠️ eventos da listagem SEM data não entram
+        data_inicio = parse_datetime(d.get("dataHoraInicio"))
+        if not data_inicio:
+            continue
 
-    if evento:
-        return
+        # Dedup dentro do lote: o ON CONFLICT DO UPDATE não aceita a mesma chave duas vezes
+        rows[d["id"]] = {
+            "id_camara": d["id"],
+            "uri": d.get("uri"),
+            "data_hora_inicio": data_inicio,
+            "data_hora_fim": parse_datetime(d.get("dataHoraFim")),
+            "situacao": d.get("situacao"),
+            "descricao_tipo": d.get("descricaoTipo"),
+            "descricao": d.get("descricao"),
+            "local_externo": d.get("localExterno"),
+            "url_evento": d.get("urlRegistro"),
+        }
 
-    evento = Evento(
-        id_camara=id_camara,
-        uri=d.get("uri"),
-        data_hora_inicio=data_inicio,
-        data_hora_fim=parse_datetime(d.get("dataHoraFim")),
-        situacao=d.get("situacao"),
-        descricao_tipo=d.get("descricaoTipo"),
-        local_externo=d.get("localExterno"),
-    )
+    rows = list(rows.values())
+    afetadas = 0
+    for i in range(0, len(rows), 1000):
+        stmt = insert(Evento).values(rows[i:i + 1000])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_camara"],
+            set_={
+                "data_hora_inicio": stmt.excluded.data_hora_inicio,
+                "data_hora_fim": stmt.excluded.data_hora_fim,
+                "situacao": stmt.excluded.situacao,
+                "descricao_tipo": stmt.excluded.descricao_tipo,
+                "descricao": stmt.excluded.descricao,
+                "local_externo": stmt.excluded.local_externo,
+            }
+        )
+        afetadas += db.execute(stmt).rowcount
 
-    db.add(evento)
-    cache[id_camara] = evento
+    return afetadas
 
 def upsert_evento_detalhado(db, evento: Evento, d: dict):
     evento.uri = d.get("uri")
     evento.situacao = d.get("situacao")
     evento.descricao_tipo = d.get("descricaoTipo")
     evento.descricao = d.get("descricao")
-    evento.url_evento = d.get("url")
+    evento.url_evento = d.get("urlRegistro") or d.get("url")
 
     local = d.get("localCamara") or {}
 
@@ -231,50 +259,84 @@ def upsert_evento_detalhado(db, evento: Evento, d: dict):
 
     evento.detalhado = True
 
-def upsert_evento_deputados(db, evento: Evento, deputados: dict):
-    dados = deputados.get("dados", [])
-
-    for d in dados:
-        politico = (
-            db.query(Politico)
-            .filter(Politico.id_camara == d["id"])
-            .first()
-        )
-
-        if not politico:
-            continue
-
-        if politico not in evento.deputados:
-            evento.deputados.append(politico)
-
-    evento.participantes_importados = True
-
-# # def upsert_evento_pauta(db, evento: Evento, pauta: dict):
-#     itens = pauta.get("dados", [])
-
-#     for item in itens:
-#         pauta_evento = EventoPauta(
-#             evento_id=evento.id,
-#             descricao=item.get("descricao"),
-#             ordem=item.get("ordem"),
-#         )
-#         db.add(pauta_evento)
-
-#     evento.pauta_importada = True
+def inserir_eventos_orgaos(db: Session, rows: list[dict]) -> int:
+    """Vínculos evento–órgão em lote (`{"evento_id", "orgao_id"}`)."""
+    if not rows:
+        return 0
+    stmt = insert(eventos_orgaos).values(rows).on_conflict_do_nothing()
+    return db.execute(stmt).rowcount
+
+def inserir_eventos_deputados(db: Session, rows: list[dict]) -> int:
+    """Participantes em lote (`{"evento_id", "politico_id"}`), idempotente pela PK."""
+    inseridas = 0
+    for i in range(0, len(rows), 5000):
+        stmt = insert(eventos_deputados).values(rows[i:i + 5000]).on_conflict_do_nothing()
+        inseridas += db.execute(stmt).rowcount
+    return inseridas
+
+def pauta_para_row(evento_id: int, d: dict, cache_proposicoes: dict[int, int]) -> dict:
+    """Converte um item de /eventos/{id}/pauta em linha de `eventos_pauta`."""
+    prop = d.get("proposicao_") or d.get("proposicao") or {}
+    id_camara_prop = prop.get("id")
+
+    return {
+        "evento_id": evento_id,
+        "ordem": d.get("ordem"),
+        "topico": d.get("topico"),
+        "regime": d.get("regime"),
+        "situacao_item": d.get("situacaoItem"),
+        "id_camara_proposicao": id_camara_prop,
+        "proposicao_id": cache_proposicoes.get(id_camara_prop),
+        "uri_votacao": d.get("uriVotacao"),
+    }
 
-def upsert_evento_votacoes(db, evento: Evento, payload: dict):
-    votacoes = payload.get("dados", [])
+def inserir_eventos_pauta(db: Session, rows: list[dict]) -> int:
+    """Itens de pauta em lote; reprocessar o mesmo evento não duplica."""
+    inseridas = 0
+    for i in range(0, len(rows), 1000):
+        stmt = insert(EventoPauta).values(rows[i:i + 1000])
+        stmt = stmt.on_conflict_do_nothing(constraint="uq_evento_pauta_item")
+        inseridas += db.execute(stmt).rowcount
+    return inseridas
 
-    for v in votacoes:
-        votacao = Votacao(
-            evento_id=evento.id,
-            id_camara=v["id"],
-            descricao=v.get("descricao"),
-            data=parse_datetime(v.get("dataHoraRegistro")),
+def upsert_evento_votacoes(db: Session, rows: list[dict]) -> int:
+    """
+    Índice de votações vindas de /eventos/{id}/votacoes, em lote.
+    Se a votação já existe (ex: veio pela proposição), só completamos os
+    vínculos que estavam vazios — nunca sobrescrevemos um vínculo existente.
+    """
+    rows = list({r["id_camara"]: r for r in rows}.values())
+    afetadas = 0
+    for i in range(0, len(rows), 1000):
+        stmt = insert(Votacao).values(rows[i:i + 1000])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_camara"],
+            set_={
+                "evento_id": func.coalesce(Votacao.evento_id, stmt.excluded.evento_id),
+                "proposicao_id": func.coalesce(Votacao.proposicao_id, stmt.excluded.proposicao_id),
+                "sigla_orgao": func.coalesce(Votacao.sigla_orgao, stmt.excluded.sigla_orgao),
+            }
         )
-        db.add(votacao)
-
-    evento.votacoes_importadas = True
+        afetadas += db.execute(stmt).rowcount
+    return afetadas
+
+def votacao_evento_para_row(evento_id: int, d: dict, cache_proposicoes: dict[int, int]) -> dict:
+    """Converte um item de /eventos/{id}/votacoes em linha de `votacoes`."""
+    return {
+        "id_camara": d["id"],
+        "evento_id": evento_id,
+        "proposicao_id": cache_proposicoes.get(extract_id_from_uri(d.get("uriProposicaoObjeto"))),
+        "descricao": d.get("descricao"),
+        "data": parse_datetime(d.get("data")),
+        "data_hora_registro": parse_datetime(d.get("dataHoraRegistro")),
+        "aprovacao": d.get("aprovacao"),
+        "sigla_orgao": d.get("siglaOrgao"),
+        "uri": d.get("uri"),
+        "uri_evento": d.get("uriEvento"),
+        "uri_orgao": d.get("uriOrgao"),
+        "indexada": True,
+        "votos_importados": False,
+    }
 
 
 
@@ -342,6 +404,8 @@ def upsert_votacao_orientacoes(db: Session, votacao: Votacao, payload: dict):
             cod_tipo_lideranca=d.get("codTipoLideranca"),
         )
         db.add(orientacao)
+        # Orientação nova muda a fidelidade dos votos: recalcular (injest_fidelidade)
+        votacao.fidelidade_calculada = False
 
     votacao.orientacoes_importadas = True
 
@@ -397,8 +461,90 @@ def upsert_votacao_votos(db: Session, votacao: Votacao, payload: dict, cache_pol
     
     # Fazemos um flush para garantir que os erros de constraint apareçam aqui se houverem
     db.flush()
+    inserir_feed_votacao(db, votacao.id)
+    atualizar_placar(db, votacao.id)
     logger.info(f"📊 {votos_inseridos} votos inseridos para a votação {votacao.id_camara}")
     votacao.votos_importados = True
+    if votos_inseridos:
+        votacao.fidelidade_calculada = False
+
+
+def inserir_feed_votacao(db: Session, votacao_id: int):
+    """
+    Replica os votos da votação em politico_votos_feed (com a data da votação).
+    Reimportar a mesma votação atualiza data e voto, sem duplicar.
+    """
+    stmt = insert(PoliticoVotoFeed).from_select(
+        ["politico_id", "votacao_id", "data", "tipo_voto"],
+        select(Voto.politico_id, Voto.votacao_id, Votacao.data, Voto.tipo_voto)
+        .join(Votacao, Votacao.id == Voto.votacao_id)
+        .where(Voto.votacao_id == votacao_id),
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["politico_id", "votacao_id"],
+            set_={"data": stmt.excluded.data, "tipo_voto": stmt.excluded.tipo_voto},
+        )
+    )
+
+# Votos com coluna própria no placar (tipo_voto → coluna); o resto vai para "outros"
+_TIPOS_PLACAR = {"Sim": "sim", "Não": "nao", "Abstenção": "abstencao", "Obstrução": "obstrucao"}
+_COLUNAS_PLACAR = [*_TIPOS_PLACAR.values(), "outros", "total"]
+
+
+def _contagens_placar():
+    """Contagens do placar, rotuladas e na ordem de _COLUNAS_PLACAR."""
+    return [
+        *(func.count(Voto.id).filter(Voto.tipo_voto == t).label(c) for t, c in _TIPOS_PLACAR.items()),
+        func.count(Voto.id)
+        .filter(Voto.tipo_voto.is_(None) | Voto.tipo_voto.not_in(list(_TIPOS_PLACAR)))
+        .label("outros"),
+        func.count(Voto.id).label("total"),
+    ]
+
+
+def atualizar_placar(db: Session, votacao_id: int | None = None):
+    """
+    Recalcula o placar geral (colunas placar_* de votacoes) e o placar por
+    partido/UF (votacao_placar) de uma votação — ou de todas, sem `votacao_id`.
+    Duas instruções no banco, sem trazer votos para o Python.
+    """
+    # ── Por partido e por UF: GROUPING SETS numa passagem ─────────────
+    por_partido = func.grouping(Voto.sigla_partido) == 0
+    por_grupo = (
+        select(
+            Voto.votacao_id,
+            case((por_partido, literal("partido")), else_=literal("uf")),
+            case((por_partido, Voto.sigla_partido), else_=Voto.sigla_uf),
+            *_contagens_placar(),
+        )
+        .group_by(func.grouping_sets(
+            tuple_(Voto.votacao_id, Voto.sigla_partido),
+            tuple_(Voto.votacao_id, Voto.sigla_uf),
+        ))
+    )
+
+    # ── Geral ─────────────────────────────────────────────────────────
+    geral = select(Voto.votacao_id, *_contagens_placar()).group_by(Voto.votacao_id)
+
+    apagar = delete(VotacaoPlacar)
+    if votacao_id is not None:
+        por_grupo = por_grupo.where(Voto.votacao_id == votacao_id)
+        geral = geral.where(Voto.votacao_id == votacao_id)
+        apagar = apagar.where(VotacaoPlacar.votacao_id == votacao_id)
+
+    db.execute(apagar)
+    db.execute(
+        insert(VotacaoPlacar).from_select(["votacao_id", "grupo", "chave", *_COLUNAS_PLACAR], por_grupo)
+    )
+
+    geral = geral.subquery()
+    db.execute(
+        update(Votacao)
+        .where(Votacao.id == geral.c.votacao_id)
+        .values({f"placar_{c}": geral.c[c] for c in _COLUNAS_PLACAR})
+    )
+
 
 def carregar_partidos_por_sigla(db: Session) -> dict[str, Partido]:
     """
@@ -439,8 +585,13 @@ def upsert_despesa(db: Session, politico_id: int, d: dict, cod_doc: str):
     despesa.valor_liquido = d.get("valorLiquido")
     despesa.valor_glosa = d.get("valorGlosa")
     despesa.url_documento = d.get("urlDocumento")
-    despesa.nome_fornecedor = d.get("nomeFornecedor")
-    despesa.cnpj_cpf_fornecedor = d.get("cnpjCpfFornecedor")
+    # Fornecedor mudou: o canônico é resolvido de novo por atribuir_fornecedores (só NULL)
+    nome_fornecedor = d.get("nomeFornecedor")
+    cnpj_cpf_fornecedor = d.get("cnpjCpfFornecedor")
+    if (despesa.nome_fornecedor, despesa.cnpj_cpf_fornecedor) != (nome_fornecedor, cnpj_cpf_fornecedor):
+        despesa.fornecedor_id = None
+    despesa.nome_fornecedor = nome_fornecedor
+    despesa.cnpj_cpf_fornecedor = cnpj_cpf_fornecedor
     despesa.cod_lote = d.get("codLote")
 
     return True
@@ -513,6 +664,83 @@ def upsert_proposicao_autor(db: Session, prop_id: int, auth_data: dict, cache_po
     
     db.execute(stmt)
 
+def tramitacao_para_row(prop_id: int, d: dict) -> dict:
+    """Converte um item de /proposicoes/{id}/tramitacoes em linha da tabela."""
+    return {
+        "proposicao_id": prop_id,
+        "data_hora": parse_datetime(d.get("dataHora")),
+        "sequencia": d.get("sequencia"),
+        "sigla_orgao": d.get("siglaOrgao"),
+        "uri_orgao": d.get("uriOrgao"),
+        "uri_ultimo_relator": d.get("uriUltimoRelator"),
+        "regime": d.get("regime"),
+        "descricao_tramitacao": d.get("descricaoTramitacao"),
+        "cod_tipo_tramitacao": d.get("codTipoTramitacao"),
+        "descricao_situacao": d.get("descricaoSituacao"),
+        "cod_situacao": d.get("codSituacao"),
+        "despacho": d.get("despacho"),
+        "url": d.get("url"),
+        "ambito": d.get("ambito"),
+        "apreciacao": d.get("apreciacao"),
+    }
+
+def inserir_tramitacoes(db: Session, rows: list[dict]) -> int:
+    """
+    Insert em lote com ON CONFLICT (proposicao_id, sequencia) DO NOTHING.
+    Retorna a quantidade de linhas efetivamente inseridas.
+    """
+    inseridas = 0
+    # Fatias de 1000 linhas: mantém o statement bem abaixo do limite de parâmetros do Postgres
+    for i in range(0, len(rows), 1000):
+        stmt = insert(Tramitacao).values(rows[i:i + 1000])
+        stmt = stmt.on_conflict_do_nothing(constraint="uq_tramitacao_sequencia")
+        inseridas += db.execute(stmt).rowcount
+
+    return inseridas
+
+def upsert_tramitacoes(db: Session, prop_id: int, dados: list[dict]) -> int:
+    """
+    Insere apenas as tramitações ainda não salvas da proposição.
+    A chave natural é a `sequencia` devolvida pela API (única por proposição).
+    Retorna a quantidade de novas tramitações inseridas.
+    """
+    rows = [
+        tramitacao_para_row(prop_id, d)
+        for d in dados
+        if d.get("sequencia") is not None
+    ]
+    return inserir_tramitacoes(db, rows)
+
+def upsert_temas(db: Session, temas: dict[int, str]) -> dict[int, int]:
+    """
+    Upsert em lote de temas `{cod_tema: nome}` (ON CONFLICT em cod_tema).
+    Retorna o mapa completo `{cod_tema: temas.id}` já gravado no banco.
+    """
+    if temas:
+        stmt = insert(Tema).values([
+            {"cod_tema": cod, "tema": nome} for cod, nome in temas.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cod_tema"],
+            set_={"tema": stmt.excluded.tema},
+        )
+        db.execute(stmt)
+
+    return {cod: id_ for cod, id_ in db.query(Tema.cod_tema, Tema.id).all()}
+
+def inserir_proposicoes_temas(db: Session, rows: list[dict]) -> int:
+    """
+    Vínculos proposição–tema em lote (`{"proposicao_id", "tema_id"}`).
+    A PK composta torna o ON CONFLICT DO NOTHING idempotente.
+    """
+    inseridas = 0
+    for i in range(0, len(rows), 5000):
+        stmt = insert(proposicoes_temas).values(rows[i:i + 5000])
+        stmt = stmt.on_conflict_do_nothing()
+        inseridas += db.execute(stmt).rowcount
+
+    return inseridas
+
 def vincular_votacao_a_proposicao(db: Session, votacao: Votacao, id_proposicao_camara: int):
     """
     Busca a proposição pelo ID da Câmara e vincula à votação local.
@@ -0,0 +1,203 @@
+"""
+Pós-processamento: exporta o snapshot analítico em Parquet
+(backend/services/analitico.py), consultado pela API com DuckDB.
+
+Cada tabela é lida do Postgres em streaming (lotes de LOTE_LINHAS) e gravada
+particionada por ano (`<tabela>/ano=AAAA/part-N.parquet`). A exportação vai
+para uma pasta temporária e só então substitui a anterior; o manifesto com as
+contagens indica a versão nova para a API.
+
+Linhas sem ano (despesa sem ano, votação sem data, presença sem data,
+proposição sem ano) ficam de fora — as consultas analíticas são sempre por
+período.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import Integer, extract, func, select
+
+from backend.services.analitico import (
+    ARQUIVO_MANIFESTO,
+    PASTA_ANALITICO,
+    TABELA_POLITICOS,
+)
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Despesa, Politico, Presenca, Proposicao, ProposicaoAutor, Votacao, Voto
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Linhas por lote lido do banco (= por row group gravado)
+LOTE_LINHAS = 100_000
+
+_DINHEIRO = pa.decimal128(12, 2)
+
+# ---------------------------------------------------------------------------
+# Tabelas exportadas: consulta (colunas na ordem do schema) + schema Arrow
+# ---------------------------------------------------------------------------
+
+def _consultas() -> dict[str, tuple]:
+    ano_votacao = extract("year", Votacao.data).cast(Integer)
+    ano_presenca = extract("year", Presenca.data).cast(Integer)
+    ano_proposicao = func.coalesce(Proposicao.ano, extract("year", Proposicao.data_apresentacao).cast(Integer))
+
+    return {
+        "despesas": (
+            select(
+                Despesa.politico_id, Despesa.mes, Despesa.data_documento, Despesa.tipo_despesa,
+                Despesa.fornecedor_id, Despesa.cnpj_cpf_fornecedor,
+                Despesa.valor_documento, Despesa.valor_liquido, Despesa.valor_glosa,
+                Despesa.ano,
+            )
+            .where(Despesa.ano.is_not(None)),
+            pa.schema([
+                ("politico_id", pa.int32()), ("mes", pa.int16()), ("data_documento", pa.date32()),
+                ("tipo_despesa", pa.string()), ("fornecedor_id", pa.int32()), ("cnpj_cpf_fornecedor", pa.string()),
+                ("valor_documento", _DINHEIRO), ("valor_liquido", _DINHEIRO), ("valor_glosa", _DINHEIRO),
+                ("ano", pa.int16()),
+            ]),
+        ),
+        "votos": (
+            select(
+                Voto.votacao_id, Voto.politico_id, Voto.tipo_voto,
+                func.upper(func.trim(Voto.sigla_partido)), Voto.sigla_uf, Votacao.data,
+                ano_votacao,
+            )
+            .join(Votacao, Votacao.id == Voto.votacao_id)
+            .where(Votacao.data.is_not(None)),
+            pa.schema([
+                ("votacao_id", pa.int32()), ("politico_id", pa.int32()), ("tipo_voto", pa.string()),
+                ("sigla_partido", pa.string()), ("sigla_uf", pa.string()), ("data", pa.date32()),
+                ("ano", pa.int16()),
+            ]),
+        ),
+        "presencas": (
+            select(
+                Presenca.politico_id, Presenca.data, Presenca.qtde_sessoes_dia, Presenca.frequencia_dia,
+                Presenca.sessao_descricao, Presenca.frequencia_sessao,
+                ano_presenca,
+            )
+            .where(Presenca.politico_id.is_not(None)),
+            pa.schema([
+                ("politico_id", pa.int32()), ("data", pa.date32()), ("qtde_sessoes_dia", pa.int16()),
+                ("frequencia_dia", pa.string()), ("sessao_descricao", pa.string()),
+                ("frequencia_sessao", pa.string()),
+                ("ano", pa.int16()),
+            ]),
+        ),
+        # Só autorias de deputados (comissões, Executivo etc. não têm politico_id)
+        "proposicoes_autores": (
+            select(
+                ProposicaoAutor.proposicao_id, ProposicaoAutor.politico_id, ProposicaoAutor.ordem_assinatura,
+                ProposicaoAutor.proponente, Proposicao.sigla_tipo,
+                ano_proposicao,
+            )
+            .join(Proposicao, Proposicao.id == ProposicaoAutor.proposicao_id)
+            .where(ProposicaoAutor.politico_id.is_not(None), ano_proposicao.is_not(None)),
+            pa.schema([
+                ("proposicao_id", pa.int32()), ("politico_id", pa.int32()), ("ordem_assinatura", pa.int16()),
+                ("proponente", pa.bool_()), ("sigla_tipo", pa.string()),
+                ("ano", pa.int16()),
+            ]),
+        ),
+    }
+
+
+_POLITICOS = (
+    select(Politico.id, Politico.nome, Politico.uf, Politico.partido_sigla, Politico.url_foto),
+    pa.schema([
+        ("id", pa.int32()), ("nome", pa.string()), ("uf", pa.string()),
+        ("partido_sigla", pa.string()), ("url_foto", pa.string()),
+    ]),
+)
+
+
+# ---------------------------------------------------------------------------
+# Gravação
+# ---------------------------------------------------------------------------
+
+def _lotes(db, stmt, schema: pa.Schema, contador: list[int]):
+    """RecordBatches do resultado em streaming (colunas na ordem do schema)."""
+    resultado = db.execute(stmt.execution_options(yield_per=LOTE_LINHAS))
+    for linhas in resultado.partitions():
+        colunas = list(zip(*linhas))
+        contador[0] += len(linhas)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, schema)],
+            schema=schema,
+        )
+
+
+def _exportar_particionada(db, nome: str, stmt, schema: pa.Schema, pasta: str) -> int:
+    destino = os.path.join(pasta, nome)
+    contador = [0]
+    ds.write_dataset(
+        _lotes(db, stmt, schema, contador),
+        destino,
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field("ano")]), flavor="hive"),
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=LOTE_LINHAS,
+        existing_data_behavior="error",
+    )
+    if not contador[0]:
+        # Tabela vazia: um arquivo sem linhas mantém a view consultável
+        os.makedirs(os.path.join(destino, "ano=0"), exist_ok=True)
+        pq.write_table(schema.empty_table(), os.path.join(destino, "ano=0", "part-0.parquet"))
+    return contador[0]
+
+
+def _trocar(nova: str, atual: str) -> None:
+    """Substitui a pasta do snapshot pela recém-exportada."""
+    antiga = atual + ".antigo"
+    shutil.rmtree(antiga, ignore_errors=True)
+    if os.path.exists(atual):
+        os.replace(atual, antiga)
+    os.replace(nova, atual)
+    shutil.rmtree(antiga, ignore_errors=True)
+
+
+def exportar_analitico(pasta: str = PASTA_ANALITICO):
+    """Exporta despesas, votos, presenças, autorias e a dimensão de políticos para Parquet."""
+    nova = pasta.rstrip(os.sep) + ".novo"
+    shutil.rmtree(nova, ignore_errors=True)
+    os.makedirs(nova)
+
+    linhas: dict[str, int] = {}
+    logger.info("📦 Exportando snapshot analítico (Parquet)...")
+    try:
+        with SessionLocal() as db:
+            for nome, (stmt, schema) in _consultas().items():
+                linhas[nome] = _exportar_particionada(db, nome, stmt, schema, nova)
+                logger.info(f"   {nome}: {linhas[nome]} linhas")
+
+            stmt, schema = _POLITICOS
+            contador = [0]
+            pq.write_table(
+                pa.Table.from_batches(list(_lotes(db, stmt, schema, contador)), schema=schema),
+                os.path.join(nova, f"{TABELA_POLITICOS}.parquet"),
+            )
+            linhas[TABELA_POLITICOS] = contador[0]
+
+        # Manifesto por último: a API só considera a versão nova quando ele existe
+        with open(os.path.join(nova, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as f:
+            json.dump({"exportado_em": datetime.now(timezone.utc).isoformat(), "linhas": linhas}, f)
+        _trocar(nova, pasta)
+    except Exception as e:
+        shutil.rmtree(nova, ignore_errors=True)
+        logger.error(f"❌ Erro ao exportar snapshot analítico: {e}")
+        raise
+
+    logger.info(f"✅ Snapshot analítico exportado em {pasta}: {sum(linhas.values())} linhas.")
+
+
+if __name__ == "__main__":
+    exportar_analitico()
@@ -3,6 +3,7 @@ from injest_banco.db.database import SessionLocal
 from injest_banco.db.models import Politico
 from injest_banco.api_camara import camara_paginado
 from injest_banco.db_upsert import upsert_despesa
+from injest_banco.injest_despesas_mensais import atualizar_despesas_mensais
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,6 +11,8 @@ logger = logging.getLogger(__name__)
 def injest_despesas(anos=[2025, 2026]):
     db = SessionLocal()
     politicos = db.query(Politico).all()
+    # Políticos com despesas gravadas nesta execução (rollup mensal é refeito só para eles)
+    politicos_alterados = set()
     
     for p in politicos:
         try:
@@ -21,7 +24,7 @@ def injest_despesas(anos=[2025, 2026]):
                 params = {"ano": ano, "ordem": "desc", "ordenarPor": "mes"}
 
                 count = 0
-                for d_em_dados in camara_paginado(endpoint, params=params):
+                for d_em_dados in camara_paginado(endpoint, params=params, stream=True):
                     cod_doc = str(d_em_dados.get("codDocumento", "")).strip()
                     
                     # Se já processamos esse documento agora ou se ele é inválido, pula
@@ -37,10 +40,13 @@ def injest_despesas(anos=[2025, 2026]):
                 
                 db.commit() 
                 if count > 0:
+                    politicos_alterados.add(p.id)
                     logger.info(f"✅ {count} despesas para {p.nome} em {ano}")
 
         except Exception as e:
             db.rollback()
             logger.error(f"❌ Erro ao processar {p.nome}: {e}")
             continue 
-    db.close()
\ No newline at end of file
+    db.close()
+
+    atualizar_despesas_mensais(politicos_alterados)
\ No newline at end of file
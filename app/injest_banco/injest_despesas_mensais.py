@@ -0,0 +1,209 @@
+"""
+Pós-processamento das despesas: rollup `despesas_mensais` e `despesa_top_resumo`.
+
+1. `despesas_mensais`: uma linha por (político, ano, mês, tipo de despesa,
+   fornecedor) com soma e quantidade de notas.
+2. `despesa_top_resumo`: top fornecedores (com a categoria principal) e top
+   categorias de cada político, por ano e no mandato inteiro — calculados
+   sobre o rollup, o resumo do perfil vira uma leitura pela chave.
+
+A ingestão de despesas reconstrói só os políticos que tiveram despesas
+gravadas na execução (DELETE + INSERT ... SELECT, tudo no banco), então o
+custo é proporcional ao que mudou. Com o rollup vazio, reconstrói tudo.
+
+Depende de `fornecedor_id` já atribuído (injest_fornecedores.atribuir_fornecedores).
+"""
+
+import logging
+
+from sqlalchemy import Integer, delete, func, literal, null, select
+from sqlalchemy.dialects.postgresql import insert
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Despesa, DespesaMensal, DespesaTopResumo, Fornecedor
+from injest_banco.injest_fornecedores import atribuir_fornecedores
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Políticos por instrução (limita o tamanho do IN)
+LOTE_POLITICOS = 500
+# Itens de cada top (fornecedores / categorias) no resumo do perfil
+TOP_RESUMO = 10
+
+_COLUNAS_TOP = ["politico_id", "ano", "tipo", "posicao", "nome", "total", "categoria_principal"]
+
+
+def _reconstruir(db, politico_ids: list[int] | None) -> None:
+    """Regrava o rollup dos políticos informados (todos quando `politico_ids` é None)."""
+    apagar = delete(DespesaMensal)
+    agregado = (
+        select(
+            Despesa.politico_id,
+            Despesa.ano,
+            Despesa.mes,
+            Despesa.tipo_despesa,
+            Despesa.fornecedor_id,
+            func.coalesce(func.sum(Despesa.valor_liquido), 0),
+            func.count(Despesa.id),
+        )
+        .group_by(
+            Despesa.politico_id,
+            Despesa.ano,
+            Despesa.mes,
+            Despesa.tipo_despesa,
+            Despesa.fornecedor_id,
+        )
+    )
+    if politico_ids is not None:
+        apagar = apagar.where(DespesaMensal.politico_id.in_(politico_ids))
+        agregado = agregado.where(Despesa.politico_id.in_(politico_ids))
+
+    db.execute(apagar)
+    db.execute(
+        insert(DespesaMensal).from_select(
+            ["politico_id", "ano", "mes", "tipo_despesa", "fornecedor_id", "total", "quantidade"],
+            agregado,
+        )
+    )
+
+
+def _top_categorias(politico_ids: list[int] | None, por_ano: bool):
+    """SELECT das top categorias por político (e por ano, ou no mandato inteiro)."""
+    chave = [DespesaMensal.politico_id] + ([DespesaMensal.ano] if por_ano else [])
+    agregado = (
+        select(*chave, DespesaMensal.tipo_despesa, func.sum(DespesaMensal.total).label("total"))
+        # Sem tipo informado não há categoria para exibir
+        .where(DespesaMensal.tipo_despesa.is_not(None))
+        .group_by(*chave, DespesaMensal.tipo_despesa)
+    )
+    if politico_ids is not None:
+        agregado = agregado.where(DespesaMensal.politico_id.in_(politico_ids))
+    agregado = agregado.subquery()
+
+    particao = [agregado.c.politico_id] + ([agregado.c.ano] if por_ano else [])
+    ranqueado = select(
+        agregado.c.politico_id,
+        (agregado.c.ano if por_ano else null().cast(Integer)).label("ano"),
+        literal("categoria").label("tipo"),
+        func.row_number()
+        .over(partition_by=particao, order_by=(agregado.c.total.desc(), agregado.c.tipo_despesa))
+        .label("posicao"),
+        agregado.c.tipo_despesa.label("nome"),
+        agregado.c.total,
+        null().label("categoria_principal"),
+    ).subquery()
+
+    return select(*ranqueado.c).where(ranqueado.c.posicao <= TOP_RESUMO)
+
+
+def _top_fornecedores(politico_ids: list[int] | None, por_ano: bool):
+    """
+    SELECT dos top fornecedores por político (e por ano, ou no mandato inteiro),
+    cada um com a categoria principal: o tipo de despesa com mais notas daquele
+    fornecedor para o político (empate desfeito pelo nome do tipo).
+    """
+    chave = [DespesaMensal.politico_id] + ([DespesaMensal.ano] if por_ano else [])
+    por_tipo = (
+        select(
+            *chave,
+            DespesaMensal.fornecedor_id,
+            DespesaMensal.tipo_despesa,
+            func.sum(DespesaMensal.total).label("total"),
+            func.sum(DespesaMensal.quantidade).label("qtd"),
+        )
+        .where(DespesaMensal.fornecedor_id.is_not(None))
+        .group_by(*chave, DespesaMensal.fornecedor_id, DespesaMensal.tipo_despesa)
+    )
+    if politico_ids is not None:
+        por_tipo = por_tipo.where(DespesaMensal.politico_id.in_(politico_ids))
+    por_tipo = por_tipo.subquery()
+
+    particao = [por_tipo.c.politico_id] + ([por_tipo.c.ano] if por_ano else [])
+    por_fornecedor = select(
+        *particao,
+        por_tipo.c.fornecedor_id,
+        por_tipo.c.tipo_despesa.label("categoria_principal"),
+        func.sum(por_tipo.c.total)
+        .over(partition_by=[*particao, por_tipo.c.fornecedor_id])
+        .label("total"),
+        func.row_number()
+        .over(
+            partition_by=[*particao, por_tipo.c.fornecedor_id],
+            order_by=(por_tipo.c.qtd.desc(), por_tipo.c.tipo_despesa),
+        )
+        .label("rn"),
+    ).subquery()
+
+    particao = [por_fornecedor.c.politico_id] + ([por_fornecedor.c.ano] if por_ano else [])
+    ranqueado = (
+        select(
+            por_fornecedor.c.politico_id,
+            (por_fornecedor.c.ano if por_ano else null().cast(Integer)).label("ano"),
+            literal("fornecedor").label("tipo"),
+            func.row_number()
+            .over(partition_by=particao, order_by=(por_fornecedor.c.total.desc(), Fornecedor.id))
+            .label("posicao"),
+            Fornecedor.nome,
+            por_fornecedor.c.total,
+            por_fornecedor.c.categoria_principal,
+        )
+        .join(Fornecedor, Fornecedor.id == por_fornecedor.c.fornecedor_id)
+        .where(por_fornecedor.c.rn == 1)
+    ).subquery()
+
+    return select(*ranqueado.c).where(ranqueado.c.posicao <= TOP_RESUMO)
+
+
+def _reconstruir_tops(db, politico_ids: list[int] | None) -> None:
+    """Regrava despesa_top_resumo (mandato e por ano) dos políticos informados."""
+    apagar = delete(DespesaTopResumo)
+    if politico_ids is not None:
+        apagar = apagar.where(DespesaTopResumo.politico_id.in_(politico_ids))
+    db.execute(apagar)
+
+    for montar in (_top_fornecedores, _top_categorias):
+        for por_ano in (False, True):
+            db.execute(
+                insert(DespesaTopResumo).from_select(_COLUNAS_TOP, montar(politico_ids, por_ano))
+            )
+
+
+def atualizar_despesas_mensais(politico_ids: set[int] | None = None):
+    """
+    Atribui fornecedores às despesas novas e reconstrói o rollup e os tops dos
+    políticos informados numa única transação. Sem `politico_ids`, reconstrói as tabelas inteiras.
+
+    Rollup vazio (primeira execução após a migração) também reconstrói tudo:
+    as leituras de despesas vêm só dele, inclusive de quem não teve despesa nova.
+    """
+    with SessionLocal() as db:
+        if politico_ids is not None and db.execute(select(DespesaMensal.id).limit(1)).first() is None:
+            logger.info("📆 despesas_mensais vazia: reconstruindo para todos os políticos.")
+            politico_ids = None
+        if politico_ids is not None and not politico_ids:
+            return
+
+        logger.info("📆 Atualizando rollup mensal de despesas...")
+        try:
+            atribuir_fornecedores(db)
+            if politico_ids is None:
+                _reconstruir(db, None)
+                _reconstruir_tops(db, None)
+            else:
+                ids = sorted(politico_ids)
+                for i in range(0, len(ids), LOTE_POLITICOS):
+                    _reconstruir(db, ids[i:i + LOTE_POLITICOS])
+                    _reconstruir_tops(db, ids[i:i + LOTE_POLITICOS])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao atualizar despesas_mensais/despesa_top_resumo: {e}")
+            raise
+
+        alvo = "todos os políticos" if politico_ids is None else f"{len(politico_ids)} políticos"
+        logger.info(f"✅ Rollup mensal de despesas atualizado ({alvo}).")
+
+
+if __name__ == "__main__":
+    atualizar_despesas_mensais()
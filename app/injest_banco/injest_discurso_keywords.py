@@ -0,0 +1,92 @@
+"""
+Pós-processamento: reconstrói a tabela `discurso_keywords`.
+
+As keywords dos discursos chegam como texto livre ("A, B; C"). A normalização
+(split, maiúsculas, blacklist, tamanho mínimo) é feita aqui uma única vez e o
+resultado fica agregado por (politico_id, keyword) — o ranking de discursos só
+lê o top 20 de cada parlamentar, sem trafegar o texto dos discursos.
+"""
+
+import logging
+from collections import Counter
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Discurso, DiscursoKeyword
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Termos genéricos de processo legislativo que não dizem nada sobre o tema
+BLACKLIST_KEYWORDS: frozenset = frozenset({
+    "ORIENTACAO DE BANCADA", "REQUERIMENTO DE URGENCIA", "ENCAMINHAMENTO DE VOTACAO",
+    "DISCUSSAO", "QUESTAO DE ORDEM", "VOTO FAVORAVEL", "VOTO CONTRARIO",
+    "FAVORAVEL", "CONTRARIO", "REQUERIMENTO DE DESTAQUE DE VOTACAO EM SEPARADO",
+    "SUBSTITUTIVO", "SEGUNDO TURNO", "PAUTA (PROCESSO LEGISLATIVO)", "DISPOSITIVO LEGAL",
+    "EMENDA DE PLENARIO", "PARECER (PROPOSICAO LEGISLATIVA)", "PARECER DO RELATOR",
+    "RELATOR", "PROJETO DE LEI DE CONVERSAO", "REQUERIMENTO", "APROVACAO", "ALTERACAO",
+    "PROPOSTA DE EMENDA A CONSTITUICAO", "PROJETO DE LEI COMPLEMENTAR",
+    "PROJETO DE LEI ORDINARIA", "MEDIDA PROVISORIA", "PROJETO DE LEI DO CONGRESSO NACIONAL",
+    "MPV 1095/2021", "DEPUTADO FEDERAL", "PRESIDENTE DA REPUBLICA",
+    "EX-PRESIDENTE DA REPUBLICA", "GOVERNO FEDERAL", "GOVERNO", "GOVERNO ESTADUAL",
+    "GOVERNADOR", "CONGRESSO NACIONAL", "SENADO FEDERAL", "SUPREMO TRIBUNAL FEDERAL (STF)",
+    "PODER JUDICIARIO", "BASE DE APOIO POLITICO", "MINORIA PARLAMENTAR",
+    "MAIORIA PARLAMENTAR", "OPOSICAO POLITICA", "VEREADOR",
+    "PARTIDO LIBERAL (PL)", "PARTIDO DOS TRABALHADORES (PT)", "PARTIDO NOVO (NOVO)",
+    "FEDERACAO PSOL REDE", "FEDERACAO BRASIL DA ESPERANCA (FE BRASIL)", "BLOCO PARLAMENTAR",
+    "CRITICA", "DEFESA", "HOMENAGEM", "MANIFESTACAO", "ATUACAO",
+    "ATUACAO PARLAMENTAR", "ANIVERSARIO DE EMANCIPACAO POLITICA", "CRIACAO",
+})
+
+# Keywords mais curtas que isto são descartadas (siglas soltas, ruído)
+TAMANHO_MINIMO = 4
+
+
+def normalizar_keywords(texto: str | None) -> list[str]:
+    """Separa por vírgula/ponto e vírgula, normaliza para maiúsculas e aplica a blacklist."""
+    if not texto:
+        return []
+    tags = (t.strip().upper() for t in texto.replace(";", ",").split(","))
+    return [t for t in tags if len(t) >= TAMANHO_MINIMO and t not in BLACKLIST_KEYWORDS]
+
+
+def atualizar_discurso_keywords():
+    """
+    Reconstrói `discurso_keywords` numa única transação.
+    Os discursos são lidos em streaming (só politico_id + keywords).
+    """
+    with SessionLocal() as db:
+        logger.info("🗣️ Agregando keywords dos discursos...")
+
+        contagens: dict[int, Counter] = {}
+        stmt = (
+            select(Discurso.politico_id, Discurso.keywords)
+            .where(Discurso.keywords.is_not(None))
+            .execution_options(yield_per=5000)
+        )
+        for politico_id, keywords in db.execute(stmt):
+            contagens.setdefault(politico_id, Counter()).update(normalizar_keywords(keywords))
+
+        rows = [
+            {"politico_id": politico_id, "keyword": keyword, "count": count}
+            for politico_id, contagem in contagens.items()
+            for keyword, count in contagem.items()
+        ]
+
+        try:
+            db.execute(delete(DiscursoKeyword))
+            for i in range(0, len(rows), 5000):
+                db.execute(insert(DiscursoKeyword).values(rows[i:i + 5000]))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao gravar discurso_keywords: {e}")
+            raise
+
+        logger.info(f"✅ {len(rows)} keywords agregadas para {len(contagens)} parlamentares.")
+
+
+if __name__ == "__main__":
+    atualizar_discurso_keywords()
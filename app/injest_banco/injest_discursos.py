@@ -9,6 +9,7 @@ from sqlalchemy.dialects.postgresql import insert
 
 from injest_banco.db.database import SessionLocal
 from injest_banco.db.models import Politico, Discurso
+from injest_banco.injest_discurso_keywords import atualizar_discurso_keywords
 
 API_BASE = "https://dadosabertos.camara.leg.br/api/v2"
 HEADERS = {"accept": "application/json"}
@@ -158,6 +159,9 @@ def runner_ingestao_discursos(
     finally:
         db.close()
 
+    # Mantém o agregado do ranking de discursos em dia com o que acabou de entrar
+    atualizar_discurso_keywords()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Ingestão de discursos parlamentares"
@@ -1,8 +1,13 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
+from sqlalchemy import func, update
+
 from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Evento, Orgao, Politico, Proposicao
 from injest_banco.api_camara import (
+    buscar_concorrente,
     buscar_eventos,
     buscar_evento_detalhe,
     buscar_evento_deputados,
@@ -10,213 +15,227 @@ from injest_banco.api_camara import (
     buscar_evento_votacoes,
 )
 from injest_banco.db_upsert import (
-    carregar_eventos_indexados,
-    upsert_evento_index,
+    upsert_eventos_index,
     upsert_evento_detalhado,
-    upsert_evento_deputados,
-    upsert_evento_pauta,
+    inserir_eventos_orgaos,
+    inserir_eventos_deputados,
+    pauta_para_row,
+    inserir_eventos_pauta,
+    votacao_evento_para_row,
     upsert_evento_votacoes,
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concorrência limitada: a API da Câmara começa a devolver 429/503 acima disso
+MAX_WORKERS = 8
+# Eventos por transação nas fases 2–5
+LOTE = 200
+
 
 # =========================
 # FASE 1 — ÍNDICE DE EVENTOS
 # =========================
-def ingestar_eventos_index():
-    db = SessionLocal()
-
-    try:
-        cache = carregar_eventos_indexados(db)
-        logger.info("📦 Cache carregado com %s eventos", len(cache))
-
-        fim = date.today()
-        inicio = fim - timedelta(days=365 * 4)
-
-        janela = timedelta(days=60)
-
-        atual = inicio
-        while atual < fim:
-            data_inicio = atual.isoformat()
-            data_fim = min(atual + janela, fim).isoformat()
+def _janelas(inicio: date, fim: date, dias: int):
+    """Janelas [inicio, fim] sem sobreposição."""
+    atual = inicio
+    while atual <= fim:
+        janela_fim = min(atual + timedelta(days=dias - 1), fim)
+        yield atual, janela_fim
+        atual = janela_fim + timedelta(days=1)
+
+
+def ingestar_eventos_index(anos: int = 4, reconstruir: bool = False, dias_janela: int = 60):
+    """
+    Indexa a listagem de /eventos em janelas baixadas em paralelo.
+
+    Sem `reconstruir`, retoma a partir do evento mais recente já indexado
+    (com 30 dias de folga para pegar remarcações/cancelamentos).
+    """
+    fim = date.today()
+    inicio = fim - timedelta(days=365 * anos)
+
+    with SessionLocal() as db:
+        if not reconstruir:
+            ultimo = db.query(func.max(Evento.data_hora_inicio)).scalar()
+            if ultimo:
+                inicio = max(inicio, ultimo.date() - timedelta(days=30))
+
+        janelas = list(_janelas(inicio, fim, dias_janela))
+        logger.info("🔎 Indexando eventos %s → %s em %s janelas", inicio, fim, len(janelas))
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futuros = {
+                executor.submit(lambda j: list(buscar_eventos(j[0].isoformat(), j[1].isoformat())), j): j
+                for j in janelas
+            }
+
+            # Escrita no thread principal: uma transação por janela
+            for futuro in as_completed(futuros):
+                janela_inicio, janela_fim = futuros[futuro]
+                try:
+                    itens = futuro.result()
+                    total += upsert_eventos_index(db, itens)
+                    db.commit()
+                    logger.info("📦 %s → %s: %s eventos", janela_inicio, janela_fim, len(itens))
+                except Exception as e:
+                    db.rollback()
+                    logger.error("❌ Janela %s → %s falhou: %s", janela_inicio, janela_fim, e)
+
+        logger.info("✅ Índice de eventos concluído (%s linhas)", total)
 
-            logger.info("🔎 Buscando eventos %s → %s", data_inicio, data_fim)
 
-            pagina = 1
-            while True:
-                payload = buscar_eventos(
-                    data_inicio=data_inicio,
-                    data_fim=data_fim,
-                    pagina=pagina,
-                    itens=1000,
+# =========================
+# EXECUTOR GENÉRICO DAS FASES 2–5
+# =========================
+def _executar_fase(nome: str, flag, buscar, gravar, exige_detalhe: bool = True):
+    """
+    Roda uma fase sobre os eventos com `flag` = False.
+
+    - `buscar(id_camara)` é chamado em paralelo (concorrência limitada);
+    - `gravar(db, respostas)` recebe `{evento_id: dados}` do lote e faz as
+      escritas em massa;
+    - só os eventos que responderam têm a flag marcada, então uma execução
+      interrompida retoma exatamente dos pendentes.
+    """
+    with SessionLocal() as db:
+        query = db.query(Evento.id, Evento.id_camara).filter(flag.is_(False))
+        if exige_detalhe:
+            query = query.filter(Evento.detalhado.is_(True))
+
+        pendentes = query.order_by(Evento.id).all()
+        logger.info("%s %s eventos pendentes", nome, len(pendentes))
+
+        concluidos = 0
+        for i in range(0, len(pendentes), LOTE):
+            bloco = dict(pendentes[i:i + LOTE])  # {evento_id: id_camara}
+            por_id_camara = {id_camara: evento_id for evento_id, id_camara in bloco.items()}
+
+            respostas = {
+                por_id_camara[id_camara]: dados
+                for id_camara, dados in buscar_concorrente(buscar, por_id_camara, max_workers=MAX_WORKERS)
+                if dados is not None
+            }
+            if not respostas:
+                continue
+
+            try:
+                gravar(db, respostas)
+                db.execute(
+                    update(Evento)
+                    .where(Evento.id.in_(list(respostas)))
+                    .values({flag.key: True})
                 )
-
-                dados = payload.get("dados", [])
-                if not dados:
-                    break
-
-                for evento in dados:
-                    upsert_evento_index(db, cache, evento)
-
                 db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error("❌ %s lote %s falhou: %s", nome, i // LOTE + 1, e)
+                continue
 
-                if not any(l["rel"] == "next" for l in payload.get("links", [])):
-                    break
-
-                pagina += 1
+            concluidos += len(respostas)
+            logger.info("%s %s/%s eventos processados", nome, concluidos, len(pendentes))
 
-            atual += janela
-
-        logger.info("✅ Índice de eventos concluído")
-
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+        logger.info("✅ %s concluída", nome)
 
 
 # =========================
 # FASE 2 — DETALHE DO EVENTO
 # =========================
 def ingestar_eventos_detalhados():
-    db = SessionLocal()
-
-    try:
-        eventos = db.query(Evento).filter(Evento.detalhado.is_(False)).all()
-        logger.info("📅 %s eventos para detalhar", len(eventos))
+    with SessionLocal() as db:
+        cache_orgaos = {id_camara: id_ for id_camara, id_ in db.query(Orgao.id_camara, Orgao.id).all()}
 
+    def gravar(db, respostas):
+        eventos = db.query(Evento).filter(Evento.id.in_(list(respostas))).all()
+        vinculos = []
         for evento in eventos:
-            logger.info("📅 Detalhando evento %s", evento.id_camara)
-
-            detalhe = buscar_evento_detalhe(evento.id_camara)
+            detalhe = respostas[evento.id]
             upsert_evento_detalhado(db, evento, detalhe)
 
-            db.commit()
+            for o in detalhe.get("orgaos") or []:
+                orgao_id = cache_orgaos.get(o.get("id"))
+                if orgao_id:
+                    vinculos.append({"evento_id": evento.id, "orgao_id": orgao_id})
 
-        logger.info("✅ Detalhamento concluído")
+        db.flush()
+        inserir_eventos_orgaos(db, vinculos)
 
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    _executar_fase("📅 Detalhes:", Evento.detalhado, buscar_evento_detalhe, gravar, exige_detalhe=False)
 
 
 # =========================
 # FASE 3 — DEPUTADOS
 # =========================
 def ingestar_eventos_deputados():
-    db = SessionLocal()
-
-    try:
-        eventos = db.query(Evento).filter(
-            Evento.detalhado.is_(True),
-            Evento.participantes_importados.is_(False),
-        ).all()
-
-        logger.info("👥 %s eventos sem deputados", len(eventos))
+    with SessionLocal() as db:
+        cache_politicos = {id_camara: id_ for id_camara, id_ in db.query(Politico.id_camara, Politico.id).all()}
 
-        for evento in eventos:
-            deputados = buscar_evento_deputados(evento.id_camara)
-            upsert_evento_deputados(db, evento, deputados)
-            db.commit()
-
-        logger.info("✅ Deputados importados")
+    def gravar(db, respostas):
+        rows = [
+            {"evento_id": evento_id, "politico_id": cache_politicos[d["id"]]}
+            for evento_id, dados in respostas.items()
+            for d in dados
+            if d.get("id") in cache_politicos  # não cria político fantasma
+        ]
+        inserir_eventos_deputados(db, rows)
 
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    _executar_fase("👥 Deputados:", Evento.participantes_importados, buscar_evento_deputados, gravar)
 
 
 # =========================
 # FASE 4 — PAUTA
 # =========================
 def ingestar_eventos_pauta():
-    db = SessionLocal()
-
-    try:
-        eventos = db.query(Evento).filter(
-            Evento.detalhado.is_(True),
-            Evento.pauta_importada.is_(False),
-        ).all()
-
-        logger.info("📑 %s eventos sem pauta", len(eventos))
-
-        for evento in eventos:
-            pauta = buscar_evento_pauta(evento.id_camara)
-            upsert_evento_pauta(db, evento, pauta)
-            db.commit()
+    with SessionLocal() as db:
+        cache_proposicoes = {id_camara: id_ for id_camara, id_ in db.query(Proposicao.id_camara, Proposicao.id).all()}
 
-        logger.info("✅ Pautas importadas")
+    def gravar(db, respostas):
+        rows = [
+            pauta_para_row(evento_id, d, cache_proposicoes)
+            for evento_id, dados in respostas.items()
+            for d in dados
+        ]
+        inserir_eventos_pauta(db, rows)
 
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    _executar_fase("📑 Pauta:", Evento.pauta_importada, buscar_evento_pauta, gravar)
 
 
 # =========================
 # FASE 5 — VOTAÇÕES
 # =========================
 def ingestar_eventos_votacoes():
-    db = SessionLocal()
-
-    try:
-        eventos = db.query(Evento).filter(
-            Evento.detalhado.is_(True),
-            Evento.votacoes_importadas.is_(False),
-        ).all()
-
-        logger.info("🗳️ %s eventos sem votações", len(eventos))
-
-        for evento in eventos:
-            votacoes = buscar_evento_votacoes(evento.id_camara)
-            upsert_evento_votacoes(db, evento, votacoes)
-            db.commit()
-
-        logger.info("✅ Votações importadas")
-
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-
-# =========================
-# MAIN
-# =========================
-if __name__ == "__main__":
-    ingestar_eventos_index()
+    """
+    Indexa as votações de cada evento. Os votos nominais ficam a cargo de
+    `injest_votacoes`: as votações entram aqui com `votos_importados` = False.
+    """
+    with SessionLocal() as db:
+        cache_proposicoes = {id_camara: id_ for id_camara, id_ in db.query(Proposicao.id_camara, Proposicao.id).all()}
+
+    def gravar(db, respostas):
+        rows = [
+            votacao_evento_para_row(evento_id, d, cache_proposicoes)
+            for evento_id, dados in respostas.items()
+            for d in dados
+            if d.get("id")
+        ]
+        upsert_evento_votacoes(db, rows)
+
+    _executar_fase("🗳️ Votações:", Evento.votacoes_importadas, buscar_evento_votacoes, gravar)
+
+
+def executar_pipeline_eventos(anos: int = 4, reconstruir: bool = False):
+    """Roda as cinco fases em ordem; cada uma retoma dos pendentes."""
+    ingestar_eventos_index(anos=anos, reconstruir=reconstruir)
     ingestar_eventos_detalhados()
     ingestar_eventos_deputados()
     ingestar_eventos_pauta()
     ingestar_eventos_votacoes()
 
 
-
-def ingestar_votacoes_eventos():
-    db = SessionLocal()
-
-    try:
-        eventos = db.query(Evento).filter(Evento.detalhado.is_(True)).all()
-
-        for evento in eventos:
-            payload = buscar_evento_votacoes(evento.id_camara)
-
-            for d in payload.get("dados", []):
-                upsert_votacao_index(db, evento, d)
-
-            db.commit()
-
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    executar_pipeline_eventos()
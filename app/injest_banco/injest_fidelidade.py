@@ -0,0 +1,298 @@
+"""
+Pós-processamento das votações: fidelidade partidária e coesão dos partidos.
+
+Para cada votação ainda não processada (`votacoes.fidelidade_calculada` False):
+  1. votos e orientações viram códigos int8 em arrays NumPy e o motor de
+     `fidelidade_calc` marca cada voto (fiel / infiel / sem orientação) e conta,
+     por (votação, partido), Sim/Não, votos fiéis e o índice de Rice;
+  2. o resultado vai para `politico_votos_feed.fiel` e `coesao_votacao`;
+  3. `fidelidade_politico` e `coesao_partido` (mandato e por ano) são
+     reagregadas só para os parlamentares e partidos envolvidos.
+
+Reimportar votos ou orientações de uma votação volta a flag para False, então
+cada execução custa proporcionalmente às votações novas/alteradas.
+"""
+
+import logging
+
+import numpy as np
+from sqlalchemy import (
+    Boolean, Float, Integer, Numeric, cast, column, delete, extract, func, or_, select, tuple_, update, values,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.services.fidelidade_calc import (  # ← fonte única da verdade
+    SEM_ORIENTACAO,
+    calcular_coesao,
+    calcular_fidelidade,
+    codificar,
+    codigo_voto,
+    siglas_orientacao,
+)
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import (
+    CoesaoPartido,
+    CoesaoVotacao,
+    FidelidadePolitico,
+    OrientacaoVotacao,
+    PoliticoVotoFeed,
+    Votacao,
+    Voto,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Votações por lote de cálculo (~500 votos cada)
+LOTE_VOTACOES = 500
+# Políticos/partidos por instrução de reagregação (limita o tamanho do IN)
+LOTE_AGREGACAO = 500
+
+
+# ---------------------------------------------------------------------------
+# 1-2. Cálculo por votação
+# ---------------------------------------------------------------------------
+
+def _orientacoes(db, votacao_ids: list[int]) -> dict[tuple[int, str], int]:
+    """
+    `{(votacao_id, sigla_partido): código}` das orientações dos lotes.
+    A orientação do próprio partido prevalece sobre a da federação.
+    """
+    rows = db.execute(
+        select(
+            OrientacaoVotacao.votacao_id,
+            OrientacaoVotacao.sigla_partido_bloco,
+            OrientacaoVotacao.orientacao_voto,
+        ).where(OrientacaoVotacao.votacao_id.in_(votacao_ids))
+    ).all()
+
+    mapa: dict[tuple[int, str], int] = {}
+    # Federações primeiro; a orientação individual sobrescreve
+    for r in sorted(rows, key=lambda r: len(siglas_orientacao(r.sigla_partido_bloco)), reverse=True):
+        for sigla in siglas_orientacao(r.sigla_partido_bloco):
+            mapa[(r.votacao_id, sigla)] = codigo_voto(r.orientacao_voto)
+    return mapa
+
+
+def calcular_votacoes(db, votacao_ids: list[int]) -> tuple[set[int], set[str]]:
+    """
+    Recalcula fidelidade dos votos e coesão por partido das votações informadas
+    e marca como calculadas as que tiveram o `fiel` gravado no feed (votação
+    com votos mas ainda sem linhas no feed continua pendente). Não faz commit.
+    Retorna os (politico_ids, partidos) cujos agregados precisam ser refeitos.
+    """
+    sigla = func.upper(func.trim(Voto.sigla_partido))
+    votos = db.execute(
+        select(Voto.votacao_id, Voto.politico_id, sigla.label("partido"), Voto.tipo_voto)
+        .where(Voto.votacao_id.in_(votacao_ids))
+    ).all()
+    anos = dict(
+        db.execute(
+            select(Votacao.id, extract("year", Votacao.data).cast(Integer))
+            .where(Votacao.id.in_(votacao_ids))
+        ).all()
+    )
+    mapa_orientacao = _orientacoes(db, votacao_ids)
+
+    # ── Arrays int8 + índice de grupo (votação × partido) ─────────────
+    grupos: dict[tuple[int, str], int] = {}
+    grupo = np.fromiter(
+        (grupos.setdefault((v.votacao_id, v.partido), len(grupos)) for v in votos),
+        dtype=np.int64, count=len(votos),
+    )
+    voto = codificar([v.tipo_voto for v in votos])
+    orientacao = np.fromiter(
+        (mapa_orientacao.get((v.votacao_id, v.partido), 0) for v in votos),
+        dtype=np.int8, count=len(votos),
+    )
+
+    fiel = calcular_fidelidade(voto, orientacao)
+    coesao = calcular_coesao(grupo, voto, fiel, len(grupos))
+
+    # ── Feed: fiel por voto (UPDATE ... FROM (VALUES ...) em lotes) ───
+    flags = [None if f == SEM_ORIENTACAO else bool(f) for f in fiel.tolist()]
+    linhas_feed = [(v.politico_id, v.votacao_id, f) for v, f in zip(votos, flags)]
+    # Votação sem nenhum voto não tem o que gravar no feed: já conta como calculada
+    calculadas = set(votacao_ids) - {v.votacao_id for v in votos}
+    for i in range(0, len(linhas_feed), 5000):
+        mapa = values(
+            column("politico_id", Integer), column("votacao_id", Integer), column("fiel", Boolean),
+            name="mapa",
+        ).data(linhas_feed[i:i + 5000])
+        calculadas.update(
+            db.execute(
+                update(PoliticoVotoFeed)
+                .where(
+                    PoliticoVotoFeed.politico_id == mapa.c.politico_id,
+                    PoliticoVotoFeed.votacao_id == mapa.c.votacao_id,
+                )
+                .values(fiel=mapa.c.fiel)
+                .returning(PoliticoVotoFeed.votacao_id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+
+    # ── coesao_votacao: regrava as linhas das votações ────────────────
+    partidos = set(
+        db.execute(
+            delete(CoesaoVotacao)
+            .where(CoesaoVotacao.votacao_id.in_(votacao_ids))
+            .returning(CoesaoVotacao.sigla_partido)
+        ).scalars()
+    )
+
+    codigo_para_nome = {codigo_voto(n): n for n in ("Sim", "Não", "Abstenção", "Obstrução")}
+    colunas = {k: arr.tolist() for k, arr in coesao.items()}
+    linhas_coesao = [
+        {
+            "votacao_id":       votacao_id,
+            "sigla_partido":    partido,
+            "ano":              anos.get(votacao_id),
+            "orientacao":       codigo_para_nome.get(mapa_orientacao.get((votacao_id, partido))),
+            "votos":            colunas["votos"][g],
+            "sim":              colunas["sim"][g],
+            "nao":              colunas["nao"][g],
+            "votos_orientados": colunas["votos_orientados"][g],
+            "votos_fieis":      colunas["votos_fieis"][g],
+            "rice":             None if np.isnan(colunas["rice"][g]) else colunas["rice"][g],
+        }
+        for (votacao_id, partido), g in grupos.items()
+        if partido and colunas["votos"][g] > 0
+    ]
+    for i in range(0, len(linhas_coesao), 1000):
+        db.execute(insert(CoesaoVotacao).values(linhas_coesao[i:i + 1000]))
+
+    if calculadas:
+        db.execute(
+            update(Votacao).where(Votacao.id.in_(calculadas)).values(fidelidade_calculada=True)
+        )
+
+    partidos.update(linha["sigla_partido"] for linha in linhas_coesao)
+    return {v.politico_id for v in votos}, partidos
+
+
+# ---------------------------------------------------------------------------
+# 3. Agregados por período (GROUPING SETS: por ano e mandato inteiro)
+# ---------------------------------------------------------------------------
+
+def _pct(parte, todo):
+    """parte / todo em %, com 2 casas (NULL quando todo = 0)."""
+    return func.round(cast(parte.cast(Float) * 100 / func.nullif(todo, 0), Numeric), 2)
+
+
+def _por_periodo(stmt, chave, ano):
+    """
+    GROUPING SETS ((chave, ano), (chave)): o conjunto sem ano é o mandato
+    inteiro; linhas anuais com ano NULL (votação sem data) são descartadas.
+    """
+    return (
+        stmt.group_by(func.grouping_sets(tuple_(chave, ano), tuple_(chave)))
+        .having(or_(func.grouping(ano) == 1, ano.is_not(None)))
+    )
+
+
+def reconstruir_fidelidade_politicos(db, politico_ids: list[int] | None) -> None:
+    """Regrava fidelidade_politico dos políticos informados (todos quando None)."""
+    ano = extract("year", PoliticoVotoFeed.data).cast(Integer)
+    orientados = func.count(PoliticoVotoFeed.fiel)
+    fieis = func.count(PoliticoVotoFeed.fiel).filter(PoliticoVotoFeed.fiel.is_(True))
+
+    agregado = _por_periodo(
+        select(PoliticoVotoFeed.politico_id, ano, orientados, fieis, _pct(fieis, orientados))
+        .where(PoliticoVotoFeed.fiel.is_not(None)),
+        PoliticoVotoFeed.politico_id,
+        ano,
+    )
+    apagar = delete(FidelidadePolitico)
+    if politico_ids is not None:
+        agregado = agregado.where(PoliticoVotoFeed.politico_id.in_(politico_ids))
+        apagar = apagar.where(FidelidadePolitico.politico_id.in_(politico_ids))
+
+    db.execute(apagar)
+    db.execute(
+        insert(FidelidadePolitico).from_select(
+            ["politico_id", "ano", "votos_orientados", "votos_fieis", "fidelidade_pct"],
+            agregado,
+        )
+    )
+
+
+def reconstruir_coesao_partidos(db, partidos: list[str] | None) -> None:
+    """Regrava coesao_partido dos partidos informados (todos quando None)."""
+    orientados = func.sum(CoesaoVotacao.votos_orientados)
+    fieis = func.sum(CoesaoVotacao.votos_fieis)
+
+    agregado = _por_periodo(
+        select(
+            CoesaoVotacao.sigla_partido,
+            CoesaoVotacao.ano,
+            func.count(),
+            func.round(cast(func.avg(CoesaoVotacao.rice) * 100, Numeric), 2),
+            orientados,
+            fieis,
+            _pct(fieis, orientados),
+        ),
+        CoesaoVotacao.sigla_partido,
+        CoesaoVotacao.ano,
+    )
+    apagar = delete(CoesaoPartido)
+    if partidos is not None:
+        agregado = agregado.where(CoesaoVotacao.sigla_partido.in_(partidos))
+        apagar = apagar.where(CoesaoPartido.sigla_partido.in_(partidos))
+
+    db.execute(apagar)
+    db.execute(
+        insert(CoesaoPartido).from_select(
+            ["sigla_partido", "ano", "votacoes", "coesao_pct", "votos_orientados", "votos_fieis", "fidelidade_pct"],
+            agregado,
+        )
+    )
+
+
+def atualizar_fidelidade(completo: bool = False):
+    """
+    Processa as votações pendentes e reagrega os envolvidos numa única transação.
+    `completo=True` marca todas as votações como pendentes e reconstrói as tabelas inteiras.
+    """
+    with SessionLocal() as db:
+        logger.info("🤝 Calculando fidelidade partidária e coesão...")
+        try:
+            if completo:
+                db.execute(update(Votacao).values(fidelidade_calculada=False))
+
+            pendentes = db.execute(
+                select(Votacao.id)
+                .where(Votacao.votos_importados.is_(True), Votacao.fidelidade_calculada.is_not(True))
+                .order_by(Votacao.id)
+            ).scalars().all()
+
+            politicos: set[int] = set()
+            partidos: set[str] = set()
+            for i in range(0, len(pendentes), LOTE_VOTACOES):
+                p, s = calcular_votacoes(db, pendentes[i:i + LOTE_VOTACOES])
+                politicos |= p
+                partidos |= s
+
+            if completo:
+                reconstruir_fidelidade_politicos(db, None)
+                reconstruir_coesao_partidos(db, None)
+            else:
+                ids, siglas = sorted(politicos), sorted(partidos)
+                for i in range(0, len(ids), LOTE_AGREGACAO):
+                    reconstruir_fidelidade_politicos(db, ids[i:i + LOTE_AGREGACAO])
+                for i in range(0, len(siglas), LOTE_AGREGACAO):
+                    reconstruir_coesao_partidos(db, siglas[i:i + LOTE_AGREGACAO])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao calcular fidelidade/coesão: {e}")
+            raise
+
+        logger.info(
+            f"✅ Fidelidade atualizada: {len(pendentes)} votações, "
+            f"{len(politicos)} parlamentares, {len(partidos)} partidos."
+        )
+
+
+if __name__ == "__main__":
+    atualizar_fidelidade()
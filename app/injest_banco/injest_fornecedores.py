@@ -0,0 +1,156 @@
+"""
+Pós-processamento das despesas: dimensão `fornecedores` e agregado `fornecedor_totais`.
+
+1. Cada combinação (cnpj, nome) ainda sem `fornecedor_id` é resolvida para um
+   fornecedor canônico: aliases conhecidos primeiro, depois CNPJ/CPF só com
+   dígitos e, sem documento, o nome normalizado.
+2. `fornecedor_totais` é reconstruída com um único INSERT ... SELECT.
+
+Com isso o ranking de empresas é uma leitura indexada e paginada exatamente.
+"""
+
+import logging
+import re
+
+from sqlalchemy import Integer, String, Text, column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Despesa, Fornecedor, FornecedorTotal
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nomes (já normalizados) que a Câmara registra de formas diferentes para a mesma empresa
+ALIASES_FORNECEDOR: dict = {
+    "TAM":                     {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
+    "LATAM AIRLINES BRASIL":   {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
+    "LATAM LINHAS AEREAS S.A": {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
+    "CIA AEREA - TAM":         {"cnpj": "02012862000160", "nome": "LATAM AIRLINES"},
+    "GOL":                     {"cnpj": "07575651000159", "nome": "GOL"},
+    "GOL LINHAS AEREAS":       {"cnpj": "07575651000159", "nome": "GOL"},
+    "AZUL":                    {"cnpj": "09296295000160", "nome": "AZUL"},
+    "AZUL LINHAS AEREAS":      {"cnpj": "09296295000160", "nome": "AZUL"},
+}
+
+
+def normalizar_nome(nome: str | None) -> str:
+    return (nome or "").strip().upper()
+
+
+def normalizar_documento(documento: str | None) -> str:
+    """CNPJ/CPF só com dígitos ("" quando ausente)."""
+    return re.sub(r"\D", "", documento or "")
+
+
+def resolver_fornecedor(documento: str | None, nome: str | None) -> dict:
+    """`{"chave", "cnpj", "nome"}` canônicos para um par (documento, nome) da despesa."""
+    nome_normalizado = normalizar_nome(nome)
+
+    alias = ALIASES_FORNECEDOR.get(nome_normalizado)
+    if alias:
+        return {"chave": alias["cnpj"], "cnpj": alias["cnpj"], "nome": alias["nome"]}
+
+    cnpj = normalizar_documento(documento)
+    if cnpj:
+        return {"chave": cnpj, "cnpj": cnpj, "nome": nome_normalizado}
+    return {"chave": f"NOCNPJ_{nome_normalizado}"[:255], "cnpj": None, "nome": nome_normalizado}
+
+
+def atribuir_fornecedores(db) -> int:
+    """
+    Resolve o fornecedor das despesas com `fornecedor_id` NULL.
+    Trabalha por par distinto (cnpj, nome), não por despesa. Retorna quantos pares foram resolvidos.
+    """
+    # NULL e "" são equivalentes para a resolução; o COALESCE permite o join do UPDATE
+    cnpj_expr = func.coalesce(Despesa.cnpj_cpf_fornecedor, "")
+    nome_expr = func.coalesce(func.upper(func.trim(Despesa.nome_fornecedor)), "")
+
+    pares = db.execute(
+        select(
+            cnpj_expr.label("cnpj"),
+            nome_expr.label("nome"),
+            func.sum(Despesa.valor_liquido).label("total"),
+        )
+        .where(Despesa.fornecedor_id.is_(None))
+        .group_by(cnpj_expr, nome_expr)
+    ).all()
+
+    if not pares:
+        return 0
+
+    # Nome canônico de cada chave = o do par com maior valor (o mais representativo)
+    resolvidos = [(p, resolver_fornecedor(p.cnpj, p.nome)) for p in pares]
+    novos: dict[str, dict] = {}
+    for _, fornecedor in sorted(resolvidos, key=lambda x: x[0].total or 0, reverse=True):
+        novos.setdefault(fornecedor["chave"], fornecedor)
+
+    # Fornecedores já existentes mantêm o nome atual
+    rows = list(novos.values())
+    for i in range(0, len(rows), 1000):
+        db.execute(insert(Fornecedor).values(rows[i:i + 1000]).on_conflict_do_nothing(index_elements=["chave"]))
+
+    ids: dict[str, int] = {}
+    chaves = list(novos)
+    for i in range(0, len(chaves), 5000):
+        ids.update(
+            db.execute(
+                select(Fornecedor.chave, Fornecedor.id).where(Fornecedor.chave.in_(chaves[i:i + 5000]))
+            ).all()
+        )
+
+    # UPDATE ... FROM (VALUES ...) em lotes: uma instrução por lote, não por par
+    mapa_rows = [(par.cnpj, par.nome, ids[f["chave"]]) for par, f in resolvidos]
+    for i in range(0, len(mapa_rows), 5000):
+        mapa = values(
+            column("cnpj", String), column("nome", Text), column("fornecedor_id", Integer),
+            name="mapa",
+        ).data(mapa_rows[i:i + 5000])
+        db.execute(
+            update(Despesa)
+            .where(
+                Despesa.fornecedor_id.is_(None),
+                cnpj_expr == mapa.c.cnpj,
+                nome_expr == mapa.c.nome,
+            )
+            .values(fornecedor_id=mapa.c.fornecedor_id)
+        )
+
+    return len(pares)
+
+
+def reconstruir_totais(db) -> None:
+    """Reconstrói `fornecedor_totais` no banco (INSERT ... SELECT, sem trafegar linhas)."""
+    db.execute(delete(FornecedorTotal))
+    db.execute(
+        insert(FornecedorTotal).from_select(
+            ["fornecedor_id", "total_recebido", "total_despesas"],
+            select(
+                Despesa.fornecedor_id,
+                func.coalesce(func.sum(Despesa.valor_liquido), 0),
+                func.count(Despesa.id),
+            )
+            .where(Despesa.fornecedor_id.is_not(None))
+            .group_by(Despesa.fornecedor_id),
+        )
+    )
+
+
+def atualizar_fornecedores():
+    """Atribui fornecedores às despesas novas e reconstrói os totais numa única transação."""
+    with SessionLocal() as db:
+        logger.info("🏢 Resolvendo fornecedores das despesas novas...")
+        try:
+            pares = atribuir_fornecedores(db)
+            reconstruir_totais(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao atualizar fornecedores: {e}")
+            raise
+
+        logger.info(f"✅ Fornecedores atualizados ({pares} pares cnpj/nome novos).")
+
+
+if __name__ == "__main__":
+    atualizar_fornecedores()
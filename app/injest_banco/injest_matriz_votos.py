@@ -0,0 +1,65 @@
+"""
+Pós-processamento das votações: matriz parlamentar × votação em 2 bits
+(backend/services/matriz_votos.py), usada pela busca de parlamentares similares.
+
+Incremental: abre a matriz gravada, busca só os votos das votações que
+ainda não são colunas dela e grava a nova versão (troca atômica do arquivo).
+Votos acrescentados depois a uma votação já presente só entram com `completo=True`.
+"""
+
+import logging
+
+import numpy as np
+from sqlalchemy import select
+
+from backend.services.matriz_votos import MatrizVotos, codigos_2bits
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Voto
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Votações por consulta de votos (limita o tamanho do IN)
+LOTE_VOTACOES = 500
+
+
+def atualizar_matriz_votos(completo: bool = False):
+    """Acrescenta as votações novas à matriz gravada (ou a reconstrói inteira)."""
+    matriz = None if completo else MatrizVotos.carregar(mmap=False)
+    if matriz is None:
+        logger.info("🧬 Montando matriz de votos do zero...")
+        matriz = MatrizVotos.vazia()
+
+    with SessionLocal() as db:
+        com_votos = np.array(db.execute(select(Voto.votacao_id).distinct()).scalars().all(), dtype=np.int64)
+        pendentes = np.setdiff1d(com_votos, matriz.votacao_ids).tolist()
+        if not pendentes:
+            logger.info("✅ Matriz de votos já atualizada.")
+            return
+
+        colunas = 0
+        for i in range(0, len(pendentes), LOTE_VOTACOES):
+            votos = db.execute(
+                select(Voto.votacao_id, Voto.politico_id, Voto.tipo_voto)
+                .where(Voto.votacao_id.in_(pendentes[i:i + LOTE_VOTACOES]))
+            ).all()
+            colunas += matriz.acrescentar(
+                np.fromiter((v.votacao_id for v in votos), dtype=np.int64, count=len(votos)),
+                np.fromiter((v.politico_id for v in votos), dtype=np.int64, count=len(votos)),
+                codigos_2bits([v.tipo_voto for v in votos]),
+            )
+
+    try:
+        matriz.salvar()
+    except OSError as e:
+        logger.error(f"❌ Erro ao gravar a matriz de votos: {e}")
+        raise
+
+    logger.info(
+        f"✅ Matriz de votos: +{colunas} votações "
+        f"({len(matriz.politico_ids)} parlamentares × {matriz.n_votacoes} votações, {matriz.bits.nbytes} bytes)."
+    )
+
+
+if __name__ == "__main__":
+    atualizar_matriz_votos()
@@ -0,0 +1,293 @@
+"""
+Pós-processamento: reconstrói as tabelas `politico_performance` e
+`performance_estatisticas` (média/mediana geral, por UF e por partido).
+
+Roda ao final da ingestão. Agrega presenças (a partir de presenca_resumo),
+produção e despesas (a partir de despesas_mensais, reconstruída antes na
+ingestão de despesas) uma única vez (com GROUPING SETS: mandato inteiro e por
+ano na mesma passagem) e grava a saída de `performance_calc`
+(calcular_scores_lote, versão vetorizada e idêntica de calcular_score — o
+mesmo cálculo usado pela API) para que o ranking não precise reagregar as
+tabelas brutas a cada cache miss.
+
+As expressões espelham as subqueries de `backend/repositories/ranking_repository.py`.
+"""
+
+import logging
+
+import numpy as np
+from sqlalchemy import Float, Numeric, String, case, cast, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.services.performance_calc import (  # ← fonte única da verdade
+    calcular_estatisticas,
+    calcular_scores_lote,
+    posicoes_e_percentis,
+    posicoes_por_grupo,
+)
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import (
+    DespesaMensal,
+    PerformanceEstatistica,
+    Politico,
+    PoliticoPerformance,
+    PresencaResumo,
+    Proposicao,
+    ProposicaoAutor,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Chave usada para o mandato inteiro (ano NULL na tabela)
+MANDATO = None
+
+
+def _agrupar(query, coluna_politico, coluna_ano) -> dict[tuple, object]:
+    """
+    Aplica GROUPING SETS ((politico, ano), (politico)) na query informada.
+    Retorna `{(politico_id, ano | None): row}`.
+
+    `grouping(ano)` separa as linhas do mandato inteiro (1) das anuais (0),
+    já que o próprio ano pode ser NULL em alguns registros (ex: proposições).
+    """
+    stmt = (
+        query
+        .add_columns(
+            coluna_politico.label("politico_id"),
+            coluna_ano.label("ano"),
+            func.grouping(coluna_ano).label("total"),
+        )
+        .filter(coluna_politico.is_not(None))
+        .group_by(func.grouping_sets(tuple_(coluna_politico, coluna_ano), tuple_(coluna_politico)))
+    )
+
+    resultado = {}
+    for r in stmt.all():
+        if r.total:
+            resultado[(r.politico_id, MANDATO)] = r
+        elif r.ano is not None:
+            resultado[(r.politico_id, int(r.ano))] = r
+    return resultado
+
+
+def carregar_dados_brutos(db) -> dict[tuple, dict]:
+    """
+    Dados brutos no formato esperado por calcular_score(), para o mandato
+    inteiro de todos os parlamentares e para cada ano com atividade.
+    Chave: `(politico_id, ano | None)`.
+    """
+    presenca = _agrupar(
+        db.query(
+            func.coalesce(
+                func.round(
+                    cast(
+                        (
+                            func.sum(PresencaResumo.presencas).cast(Float)
+                            / func.nullif(func.sum(PresencaResumo.sessoes), 0)
+                        )
+                        * 100,
+                        Numeric,
+                    ),
+                    2,
+                ),
+                0,
+            ).label("nota_assiduidade"),
+        ),
+        PresencaResumo.politico_id,
+        PresencaResumo.ano,
+    )
+
+    producao = _agrupar(
+        db.query(
+            # CAST para float8: a API (asyncpg) envia os pesos como double, o psycopg2
+            # como numeric — sem o cast as somas difeririam na última casa
+            func.sum(
+                cast(
+                    case(
+                        (
+                            Proposicao.sigla_tipo.in_(["PEC", "PL", "PLC", "PLP"]),
+                            case((ProposicaoAutor.proponente == True, 1.0), else_=0.2),
+                        ),
+                        (
+                            Proposicao.sigla_tipo.in_(["PDC", "PRC", "MPV"]),
+                            case((ProposicaoAutor.proponente == True, 0.5), else_=0.1),
+                        ),
+                        else_=case((ProposicaoAutor.proponente == True, 0.05), else_=0.01),
+                    ),
+                    Float,
+                )
+            ).label("pontos_producao"),
+        )
+        .select_from(ProposicaoAutor)
+        .join(Proposicao, Proposicao.id == ProposicaoAutor.proposicao_id),
+        ProposicaoAutor.politico_id,
+        Proposicao.ano,
+    )
+
+    gastos = _agrupar(
+        db.query(
+            func.sum(DespesaMensal.total).label("total_gasto"),
+            func.count(
+                func.distinct(DespesaMensal.ano.cast(String) + "-" + DespesaMensal.mes.cast(String))
+            ).label("meses_mandato"),
+        ),
+        DespesaMensal.politico_id,
+        DespesaMensal.ano,
+    )
+
+    politicos = db.query(
+        Politico.id, Politico.nome, Politico.uf, Politico.partido_sigla, Politico.url_foto
+    ).all()
+
+    # Mandato inteiro: todos os parlamentares (como no ranking ao vivo).
+    # Por ano: apenas os anos em que há algum dado para o parlamentar.
+    anos_por_politico: dict[int, set] = {p.id: {MANDATO} for p in politicos}
+    for fonte in (presenca, producao, gastos):
+        for politico_id, ano in fonte:
+            if politico_id in anos_por_politico:
+                anos_por_politico[politico_id].add(ano)
+
+    brutos = {}
+    for p in politicos:
+        for ano in anos_por_politico[p.id]:
+            chave = (p.id, ano)
+            r_p, r_r, r_g = presenca.get(chave), producao.get(chave), gastos.get(chave)
+            brutos[chave] = {
+                "id":               p.id,
+                "nome":             p.nome,
+                "uf":               p.uf,
+                "partido_sigla":    p.partido_sigla,
+                "url_foto":         p.url_foto,
+                # Mesmos COALESCEs do repositório
+                "nota_assiduidade": r_p.nota_assiduidade if r_p and r_p.nota_assiduidade is not None else 0,
+                "pontos_producao":  r_r.pontos_producao if r_r and r_r.pontos_producao is not None else 0,
+                "total_gasto":      r_g.total_gasto if r_g and r_g.total_gasto is not None else 0,
+                "meses_mandato":    r_g.meses_mandato if r_g and r_g.meses_mandato is not None else 1,
+            }
+
+    return brutos
+
+
+def calcular_linhas(brutos: dict[tuple, dict]) -> list[dict]:
+    """Roda o cálculo vetorizado sobre todos os dados brutos e monta as linhas da tabela."""
+    chaves = list(brutos)
+    valores = [brutos[c] for c in chaves]
+
+    lote = calcular_scores_lote(
+        [v["nota_assiduidade"] for v in valores],
+        [v["pontos_producao"] for v in valores],
+        [v["total_gasto"] for v in valores],
+        [int(v["meses_mandato"]) for v in valores],
+        [v["uf"] for v in valores],
+    )
+    colunas = {k: arr.tolist() for k, arr in lote.items()}
+
+    return [
+        {
+            "politico_id":        politico_id,
+            "ano":                ano,
+            "assiduidade_pct":    float(valores[i]["nota_assiduidade"]),
+            "pontos_producao":    float(valores[i]["pontos_producao"]),
+            "total_gasto":        colunas["total_gasto"][i],
+            "meses_mandato":      colunas["meses_mandato"][i],
+            "score":              colunas["score"][i],
+            "nota_assiduidade":   colunas["nota_assiduidade"][i],
+            "nota_producao":      colunas["nota_producao"][i],
+            "nota_economia":      colunas["nota_economia"][i],
+            "cota_mensal":        colunas["cota_mensal"][i],
+            "cota_total":         colunas["cota_total"][i],
+            "cota_utilizada_pct": colunas["cota_utilizada_pct"][i],
+        }
+        for i, (politico_id, ano) in enumerate(chaves)
+    ]
+
+
+def calcular_posicoes(brutos: dict[tuple, dict], rows: list[dict]) -> None:
+    """
+    Preenche o índice de posições de cada linha (in-place): posição e percentil
+    na Câmara, posição na UF e no partido — sempre comparando o mesmo ano
+    (ou o mandato inteiro). Sem UF/partido, a posição correspondente fica NULL.
+    """
+    if not rows:
+        return
+
+    score = np.array([r["score"] for r in rows])
+    ids   = np.array([r["politico_id"] for r in rows])
+    anos  = [r["ano"] for r in rows]
+    ufs      = [brutos[(r["politico_id"], r["ano"])]["uf"] for r in rows]
+    partidos = [brutos[(r["politico_id"], r["ano"])]["partido_sigla"] for r in rows]
+
+    posicao, total = posicoes_por_grupo(score, ids, anos)
+    posicao_uf, total_uf = posicoes_por_grupo(score, ids, list(zip(anos, ufs)))
+    posicao_partido, total_partido = posicoes_por_grupo(score, ids, list(zip(anos, partidos)))
+
+    percentil = np.empty(len(rows))
+    for ano in set(anos):
+        idx = np.flatnonzero([a == ano for a in anos])
+        percentil[idx] = posicoes_e_percentis(score[idx])[1]
+
+    for i, row in enumerate(rows):
+        row["posicao"]         = int(posicao[i])
+        row["percentil"]       = float(percentil[i])
+        row["total_ranking"]   = int(total[i])
+        row["posicao_uf"]      = int(posicao_uf[i]) if ufs[i] else None
+        row["total_uf"]        = int(total_uf[i]) if ufs[i] else None
+        row["posicao_partido"] = int(posicao_partido[i]) if partidos[i] else None
+        row["total_partido"]   = int(total_partido[i]) if partidos[i] else None
+
+
+def calcular_estatisticas_linhas(brutos: dict[tuple, dict], rows: list[dict]) -> list[dict]:
+    """Linhas de performance_estatisticas (geral, por UF e por partido) para o mandato e cada ano."""
+    por_ano: dict[int | None, list[dict]] = {}
+    for row in rows:
+        por_ano.setdefault(row["ano"], []).append(row)
+
+    estatisticas = []
+    for ano, linhas in por_ano.items():
+        dados = [brutos[(r["politico_id"], ano)] for r in linhas]
+        estatisticas.extend(
+            {"ano": ano, **e}
+            for e in calcular_estatisticas(
+                [r["score"] for r in linhas],
+                [d["uf"] for d in dados],
+                [d["partido_sigla"] for d in dados],
+            )
+        )
+    return estatisticas
+
+
+def atualizar_performance():
+    """
+    Reconstrói `politico_performance` e `performance_estatisticas` numa única transação.
+    Leitores continuam vendo a versão anterior até o commit (MVCC).
+    """
+    with SessionLocal() as db:
+        logger.info("🧮 Agregando dados brutos de performance...")
+        brutos = carregar_dados_brutos(db)
+
+        rows = calcular_linhas(brutos)
+        calcular_posicoes(brutos, rows)
+        estatisticas = calcular_estatisticas_linhas(brutos, rows)
+
+        try:
+            db.execute(delete(PoliticoPerformance))
+            for i in range(0, len(rows), 1000):
+                db.execute(insert(PoliticoPerformance).values(rows[i:i + 1000]))
+
+            db.execute(delete(PerformanceEstatistica))
+            for i in range(0, len(estatisticas), 1000):
+                db.execute(insert(PerformanceEstatistica).values(estatisticas[i:i + 1000]))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao gravar politico_performance: {e}")
+            raise
+
+        mandatos = sum(1 for r in rows if r["ano"] is None)
+        logger.info(f"✅ Performance recalculada: {mandatos} mandatos, {len(rows) - mandatos} linhas anuais.")
+        logger.info(f"📊 {len(estatisticas)} estatísticas (geral/UF/partido) gravadas.")
+
+
+if __name__ == "__main__":
+    atualizar_performance()
@@ -0,0 +1,34 @@
+"""
+Carga completa do placar das votações (colunas placar_* de `votacoes` e `votacao_placar`).
+
+No dia a dia o placar é calculado ao importar os votos de cada votação
+(db_upsert.upsert_votacao_votos → atualizar_placar); este script serve para o
+backfill inicial ou para recalcular tudo do zero.
+"""
+
+import logging
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db_upsert import atualizar_placar
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reconstruir_placares():
+    """Recalcula o placar de todas as votações numa única transação."""
+    with SessionLocal() as db:
+        logger.info("🧮 Recalculando placar de todas as votações...")
+        try:
+            atualizar_placar(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao recalcular placares: {e}")
+            raise
+
+        logger.info("✅ Placar das votações recalculado.")
+
+
+if __name__ == "__main__":
+    reconstruir_placares()
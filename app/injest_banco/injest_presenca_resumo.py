@@ -0,0 +1,98 @@
+"""
+Pós-processamento das presenças: contadores `presenca_resumo` por (político, ano, mês).
+
+A ingestão diária regrava só o mês do dia processado (DELETE + INSERT ... SELECT
+na mesma transação das presenças), então o custo não cresce com o histórico.
+Todo cálculo de assiduidade (ranking, perfil, timeline, performance) lê daqui.
+
+Classificação de cada sessão:
+  - presença:    frequencia_sessao = "Presença";
+  - justificada: demais sessões com "justificad" na frequência ou justificativa preenchida;
+  - ausência:    o restante.
+"""
+
+import logging
+from datetime import date
+
+from sqlalchemy import Integer, and_, delete, extract, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Presenca, PresencaResumo
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_COLUNAS = ["politico_id", "ano", "mes", "sessoes", "presencas", "ausencias", "justificadas"]
+
+
+def _contadores():
+    """Colunas agregadas (sessoes, presencas, ausencias, justificadas) sobre `presencas`."""
+    presente = Presenca.frequencia_sessao == "Presença"
+    justificada = and_(
+        ~presente,
+        or_(
+            Presenca.frequencia_sessao.ilike("%justificad%"),
+            func.coalesce(func.trim(Presenca.justificativa), "") != "",
+        ),
+    )
+    return [
+        func.count(Presenca.id),
+        func.count(Presenca.id).filter(presente),
+        func.count(Presenca.id).filter(~presente, ~justificada),
+        func.count(Presenca.id).filter(justificada),
+    ]
+
+
+def reconstruir_presenca_resumo(db, meses: set[tuple[int, int]] | None = None) -> None:
+    """
+    Regrava os contadores dos meses `(ano, mes)` informados (todos quando None).
+    Não faz commit: roda dentro da transação de quem chamou.
+    """
+    ano = extract("year", Presenca.data).cast(Integer)
+    mes = extract("month", Presenca.data).cast(Integer)
+
+    agregado = (
+        select(Presenca.politico_id, ano, mes, *_contadores())
+        .where(Presenca.politico_id.is_not(None))
+        .group_by(Presenca.politico_id, ano, mes)
+    )
+    apagar = delete(PresencaResumo)
+
+    if meses is not None:
+        if not meses:
+            return
+        # Intervalo de datas (usa o índice de presencas.data) por mês
+        agregado = agregado.where(or_(*(
+            and_(
+                Presenca.data >= date(a, m, 1),
+                Presenca.data < (date(a + 1, 1, 1) if m == 12 else date(a, m + 1, 1)),
+            )
+            for a, m in meses
+        )))
+        apagar = apagar.where(or_(*(
+            and_(PresencaResumo.ano == a, PresencaResumo.mes == m) for a, m in meses
+        )))
+
+    db.execute(apagar)
+    db.execute(insert(PresencaResumo).from_select(_COLUNAS, agregado))
+
+
+def atualizar_presenca_resumo():
+    """Reconstrói `presenca_resumo` inteira numa única transação."""
+    with SessionLocal() as db:
+        logger.info("🗓️ Reconstruindo presenca_resumo...")
+        try:
+            reconstruir_presenca_resumo(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao reconstruir presenca_resumo: {e}")
+            raise
+
+        total = db.query(func.count()).select_from(PresencaResumo).scalar()
+        logger.info(f"✅ presenca_resumo reconstruída ({total} linhas político/mês).")
+
+
+if __name__ == "__main__":
+    atualizar_presenca_resumo()
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from injest_banco.db.database import SessionLocal
 from injest_banco.db.models import Politico, Presenca
+from injest_banco.injest_presenca_resumo import reconstruir_presenca_resumo
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -133,6 +134,8 @@ def injest_presencas_dia(data_alvo: str):
             db.execute(stmt)
             count += 1
 
+    # Contadores do mês do dia processado, na mesma transação das presenças
+    reconstruir_presenca_resumo(db, {(data_sessao.year, data_sessao.month)})
     db.commit()
     logger.info(f"✅ Processadas {count} presenças para o dia {data_alvo}")
     db.close()
@@ -1,30 +1,131 @@
 from injest_banco.api_camara import camara_get, camara_paginado, buscar_votacao_votos, buscar_votacao_orientacoes
 
-import logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+import os
+from datetime import date, datetime, timedelta
 
 from injest_banco.db.database import SessionLocal
-from injest_banco.db.models import Proposicao # Importamos o modelo para fazer a query do cache
+from injest_banco.db.models import Proposicao, Votacao # Importamos os modelos para fazer as queries de cache
 from injest_banco.db_upsert import (
     upsert_proposicao, upsert_proposicao_autor, upsert_votacao_index,
-    upsert_votacao_orientacoes, upsert_votacao_votos, carregar_por_id_camara
+    upsert_votacao_orientacoes, upsert_votacao_votos, carregar_por_id_camara,
+    upsert_tramitacoes
 )
 
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Arquivo de controle do modo "refresh" (mesma ideia do last_date.txt das presenças)
+PROGRESS_FILE_PROPOSICOES = "last_date_proposicoes.txt"
+
+# A API aceita intervalos grandes, mas janelas menores deixam a paginação estável
+JANELA_DIAS = 30
+
+
+# ==========================================
+# Helpers de rede e de banco
+# ==========================================
+
+def _buscar_dados_proposicao(id_camara_prop: int, votacoes_completas_db: set[str] | None = None) -> dict:
+    """
+    FASE 1: BUSCA NA REDE (APIs) - Sem mexer no DB.
+
+    Votações já marcadas como `votos_importados` no banco não são baixadas de
+    novo: apenas o resumo é mantido para garantir o vínculo com a proposição.
+    """
+    votacoes_completas_db = votacoes_completas_db or set()
+
+    autores_data = camara_get(f"/proposicoes/{id_camara_prop}/autores").get("dados", [])
+    vots_vinc_data = camara_get(f"/proposicoes/{id_camara_prop}/votacoes").get("dados", [])
+    tramitacoes_data = camara_get(f"/proposicoes/{id_camara_prop}/tramitacoes").get("dados", [])
+
+    votacoes = []
+    for v_vinc in vots_vinc_data:
+        id_vot = v_vinc['id']
+
+        if id_vot in votacoes_completas_db:
+            votacoes.append({"resumo": v_vinc, "orientacoes": None, "votos": None})
+            continue
+
+        try:
+            # Buscamos tudo da API antes de abrir a transação
+            orientacoes = buscar_votacao_orientacoes(id_vot)
+            votos_gen = buscar_votacao_votos(id_vot)
+
+            votacoes.append({
+                "resumo": v_vinc,
+                "orientacoes": orientacoes,
+                "votos": list(votos_gen)
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao baixar dados da votação {id_vot}: {e}")
+            continue
+
+    return {
+        "autores": autores_data,
+        "votacoes": votacoes,
+        "tramitacoes": tramitacoes_data,
+    }
+
+
+def _salvar_proposicao(db, p_resumo: dict, dados: dict, cache_politicos: dict) -> Proposicao:
+    """
+    FASE 2: TRANSAÇÃO NO BANCO (Super rápida!)
+    Proposição, autores, votações e tramitações entram no mesmo commit.
+    """
+    # 1. Salva a Proposição
+    prop_db = upsert_proposicao(db, p_resumo)
+    db.flush() # Aqui a transação começa!
+
+    # 2. Autores (ON CONFLICT: reprocessar é seguro)
+    for auth in dados["autores"]:
+        upsert_proposicao_autor(db, prop_db.id, auth, cache_politicos)
+
+    # 3. Votações vinculadas
+    for vot_data in dados["votacoes"]:
+        vot_obj = upsert_votacao_index(db, None, vot_data["resumo"], proposicao_id=prop_db.id)
+        db.flush()
+
+        # Votação já completa no banco: só garantimos o vínculo acima
+        if vot_data["votos"] is None:
+            continue
+
+        upsert_votacao_orientacoes(db, vot_obj, {"dados": vot_data["orientacoes"]})
+        upsert_votacao_votos(db, vot_obj, {"dados": vot_data["votos"]}, cache_politicos)
+
+    # 4. Tramitações (somente as sequências que ainda não temos)
+    novas = upsert_tramitacoes(db, prop_db.id, dados["tramitacoes"])
+    if novas:
+        logger.info(f"📜 {novas} novas tramitações para a prop {prop_db.id_camara}")
+
+    db.commit() # Transação fechada em milissegundos!
+    return prop_db
+
+
+def _carregar_votacoes_completas(db) -> set[str]:
+    """IDs (da Câmara) das votações cujos votos já foram importados."""
+    return {
+        v[0] for v in db.query(Votacao.id_camara)
+        .filter(Votacao.votos_importados.is_(True))
+        .all()
+    }
+
+
+# ==========================================
+# Modo carga: só proposições novas
+# ==========================================
+
 def injest_proposicoes(anos=[2025, 2026]):
     with SessionLocal() as db:
         cache_politicos = carregar_por_id_camara(db)
-        
+
         # 🚀 O CACHE: Busca todos os IDs de proposições já salvos no banco
         # Fazemos uma query que traz apenas a coluna id_camara para economizar RAM
         logger.info("🔍 Montando cache de proposições já existentes...")
         existing_props = {p[0] for p in db.query(Proposicao.id_camara).all()}
         logger.info(f"📦 Cache montado! {len(existing_props)} proposições prontas para serem puladas.")
-        
+        votacoes_completas_db = _carregar_votacoes_completas(db)
+
         for ano in anos:
             logger.info(f"📅 Iniciando busca de proposições do ano {ano}...")
             params = {"ano": ano, "ordem": "DESC", "ordenarPor": "id"}
@@ -36,61 +137,112 @@ def injest_proposicoes(anos=[2025, 2026]):
                 if id_camara_prop in existing_props:
                     continue
 
-                # ==========================================
-                # FASE 1: BUSCA NA REDE (APIs) - Sem mexer no DB
-                # ==========================================
-                autores_data = camara_get(f"/proposicoes/{id_camara_prop}/autores").get("dados", [])
-                vots_vinc_data = camara_get(f"/proposicoes/{id_camara_prop}/votacoes").get("dados", [])
-                
-                votacoes_completas = []
-                for v_vinc in vots_vinc_data:
-                    id_vot = v_vinc['id']
-                    try:
-                        # Buscamos tudo da API antes de abrir a transação
-                        orientacoes = buscar_votacao_orientacoes(id_vot)
-                        votos_gen = buscar_votacao_votos(id_vot)
-                        
-                        votacoes_completas.append({
-                            "resumo": v_vinc,
-                            "orientacoes": orientacoes,
-                            "votos": list(votos_gen) 
-                        })
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro ao baixar dados da votação {id_vot}: {e}")
-                        continue
+                try:
+                    dados = _buscar_dados_proposicao(id_camara_prop, votacoes_completas_db)
+                except Exception as e_api:
+                    logger.warning(f"⚠️ Erro ao baixar dados da prop {id_camara_prop}: {e_api}")
+                    continue
 
-                # ==========================================
-                # FASE 2: TRANSAÇÃO NO BANCO (Super rápida!)
-                # ==========================================
                 try:
-                    # 1. Salva a Proposição
-                    prop_db = upsert_proposicao(db, p_resumo)
-                    db.flush() # Aqui a transação começa!
-
-                    # 2. Autores
-                    for auth in autores_data:
-                        upsert_proposicao_autor(db, prop_db.id, auth, cache_politicos)
-
-                    # 3. Votações vinculadas
-                    for vot_data in votacoes_completas:
-                        vot_obj = upsert_votacao_index(db, None, vot_data["resumo"])
-                        vot_obj.proposicao_id = prop_db.id 
-                        db.flush()
-
-                        upsert_votacao_orientacoes(db, vot_obj, {"dados": vot_data["orientacoes"]})
-                        upsert_votacao_votos(db, vot_obj, {"dados": vot_data["votos"]}, cache_politicos)
-
-                    db.commit() # Transação fechada em milissegundos!
-                    
-                    existing_props.add(id_camara_prop)
+                    _salvar_proposicao(db, p_resumo, dados, cache_politicos)
                     logger.info(f"✅ Prop {p_resumo['siglaTipo']} {p_resumo['numero']} salva e comitada rapidamente.")
 
                 except Exception as e_db:
                     logger.error(f"❌ Erro ao salvar dados no DB para prop {id_camara_prop}: {e_db}")
                     db.rollback() # Limpa a transação em caso de erro
 
-                db.commit()
-                
                 # Adiciona ao cache em memória para caso venha repetido na paginação
                 existing_props.add(id_camara_prop)
-                print(f"✅ Prop {p_resumo['siglaTipo']} {p_resumo['numero']} - OK")
\ No newline at end of file
+
+
+# ==========================================
+# Modo refresh: só proposições que tramitaram
+# ==========================================
+
+def get_last_refresh_date(dias_padrao: int = 7) -> date:
+    """Lê a última data sincronizada ou volta `dias_padrao` dias a partir de hoje."""
+    if os.path.exists(PROGRESS_FILE_PROPOSICOES):
+        with open(PROGRESS_FILE_PROPOSICOES, "r") as f:
+            data_str = f.read().strip()
+            if data_str:
+                return datetime.strptime(data_str, "%d/%m/%Y").date()
+
+    return date.today() - timedelta(days=dias_padrao)
+
+def save_refresh_progress(data: date):
+    """Salva a data final da última janela sincronizada."""
+    with open(PROGRESS_FILE_PROPOSICOES, "w") as f:
+        f.write(data.strftime("%d/%m/%Y"))
+
+def injest_proposicoes_atualizadas(data_inicio: date | None = None, data_fim: date | None = None):
+    """
+    Re-sincroniza apenas proposições com atividade no período.
+
+    O filtro `dataInicio`/`dataFim` de /proposicoes devolve as proposições que
+    tiveram tramitação no intervalo, então não precisamos recarregar tudo para
+    descobrir autores novos, votações novas ou mudanças de situação.
+    Sem datas explícitas, retoma a partir do último refresh salvo.
+    """
+    usar_progresso = data_inicio is None
+    data_inicio = data_inicio or get_last_refresh_date()
+    data_fim = data_fim or date.today()
+
+    logger.info(f"🔄 Refresh de proposições com tramitação entre {data_inicio} e {data_fim}")
+
+    with SessionLocal() as db:
+        cache_politicos = carregar_por_id_camara(db)
+        votacoes_completas_db = _carregar_votacoes_completas(db)
+
+        # Uma proposição pode aparecer em mais de uma janela: sincronizamos só uma vez
+        sincronizadas: set[int] = set()
+        total = 0
+
+        janela_inicio = data_inicio
+        while janela_inicio <= data_fim:
+            janela_fim = min(janela_inicio + timedelta(days=JANELA_DIAS - 1), data_fim)
+
+            params = {
+                "dataInicio": janela_inicio.isoformat(),
+                "dataFim": janela_fim.isoformat(),
+                "ordem": "ASC",
+                "ordenarPor": "id",
+            }
+            logger.info(f"📅 Janela {janela_inicio} → {janela_fim}")
+
+            try:
+                for p_resumo in camara_paginado("/proposicoes", params=params):
+                    id_camara_prop = p_resumo['id']
+                    if id_camara_prop in sincronizadas:
+                        continue
+
+                    try:
+                        dados = _buscar_dados_proposicao(id_camara_prop, votacoes_completas_db)
+                    except Exception as e_api:
+                        # Falha de rede numa proposição não derruba a janela inteira
+                        logger.warning(f"⚠️ Erro ao baixar dados da prop {id_camara_prop}: {e_api}")
+                        continue
+
+                    try:
+                        _salvar_proposicao(db, p_resumo, dados, cache_politicos)
+                        total += 1
+                    except Exception as e_db:
+                        logger.error(f"❌ Erro ao atualizar prop {id_camara_prop}: {e_db}")
+                        db.rollback()
+                        continue
+
+                    sincronizadas.add(id_camara_prop)
+                    votacoes_completas_db.update(
+                        v["resumo"]["id"] for v in dados["votacoes"]
+                    )
+
+            except Exception as e:
+                # Não salvamos o progresso: a janela será refeita na próxima execução
+                logger.error(f"❌ Erro na janela {janela_inicio} → {janela_fim}: {e}")
+                break
+
+            if usar_progresso:
+                save_refresh_progress(janela_fim)
+
+            janela_inicio = janela_fim + timedelta(days=1)
+
+    logger.info(f"🏁 Refresh concluído: {total} proposições re-sincronizadas.")
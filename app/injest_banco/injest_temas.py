@@ -0,0 +1,106 @@
+import logging
+
+from sqlalchemy import func, update
+
+from injest_banco.api_camara import camara_get, camara_get_concorrente
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Proposicao
+from injest_banco.db_upsert import upsert_temas, inserir_proposicoes_temas
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def carregar_temas_referencia(db) -> dict[int, int]:
+    """
+    Baixa a tabela de referência de temas (/referencias/proposicoes/codTema)
+    uma única vez e grava em lote. Retorna `{cod_tema: temas.id}`.
+    """
+    dados = camara_get("/referencias/proposicoes/codTema").get("dados", [])
+
+    temas = {
+        int(t["cod"]): t.get("nome")
+        for t in dados
+        if str(t.get("cod", "")).isdigit()
+    }
+
+    mapa = upsert_temas(db, temas)
+    db.commit()
+    logger.info(f"📚 {len(temas)} temas de referência sincronizados.")
+    return mapa
+
+
+def injest_temas(lote: int = 500, max_workers: int = 8):
+    """
+    Vincula proposições a temas.
+
+    Só consulta /proposicoes/{id}/temas para proposições ainda não consultadas
+    (`temas_buscados_em` NULL), então pode rodar a cada ingestão sem refazer o
+    trabalho — inclusive para as que a API devolve sem nenhum tema.
+    """
+    with SessionLocal() as db:
+        mapa_temas = carregar_temas_referencia(db)
+
+        pendentes = (
+            db.query(Proposicao.id, Proposicao.id_camara)
+            .filter(Proposicao.temas_buscados_em.is_(None))
+            .all()
+        )
+        logger.info(f"📦 {len(pendentes)} proposições com temas pendentes.")
+
+        total_vinculos = 0
+
+        for i in range(0, len(pendentes), lote):
+            bloco = pendentes[i:i + lote]
+            requisicoes = {
+                prop_id: (f"/proposicoes/{id_camara}/temas", None)
+                for prop_id, id_camara in bloco
+            }
+
+            respostas = {}
+            for prop_id, payload in camara_get_concorrente(requisicoes, max_workers=max_workers):
+                if payload:
+                    respostas[prop_id] = payload.get("dados", [])
+
+            # Temas que não estavam na referência (raro) entram antes dos vínculos
+            novos = {
+                t["codTema"]: t.get("tema")
+                for dados in respostas.values()
+                for t in dados
+                if t.get("codTema") is not None and t["codTema"] not in mapa_temas
+            }
+
+            try:
+                if novos:
+                    mapa_temas = upsert_temas(db, novos)
+
+                rows = [
+                    {"proposicao_id": prop_id, "tema_id": mapa_temas[t["codTema"]]}
+                    for prop_id, dados in respostas.items()
+                    for t in dados
+                    if t.get("codTema") in mapa_temas
+                ]
+                inseridos = inserir_proposicoes_temas(db, rows)
+                # Só as que responderam: falhas de rede voltam na próxima execução
+                if respostas:
+                    db.execute(
+                        update(Proposicao)
+                        .where(Proposicao.id.in_(list(respostas)))
+                        .values(temas_buscados_em=func.now())
+                    )
+                db.commit()
+            except Exception as e:
+                logger.error(f"❌ Erro ao salvar lote de temas: {e}")
+                db.rollback()
+                continue
+
+            total_vinculos += inseridos
+            logger.info(
+                f"✅ Lote {i // lote + 1}: {len(bloco)} proposições, {inseridos} vínculos."
+            )
+
+        logger.info(f"🏁 Temas concluídos: {total_vinculos} novos vínculos.")
+
+
+if __name__ == "__main__":
+    injest_temas()
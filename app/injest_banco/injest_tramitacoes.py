@@ -0,0 +1,143 @@
+import logging
+import unicodedata
+from sqlalchemy import func
+
+from injest_banco.api_camara import camara_get_concorrente
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import Proposicao, Tramitacao
+from injest_banco.db_upsert import tramitacao_para_row, inserir_tramitacoes
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Situações que encerram a tramitação: proposições nelas não são mais consultadas
+SITUACOES_FINAIS = (
+    "arquivada",
+    "transformado em norma juridica",
+    "transformada em norma juridica",
+    "transformado em nova proposicao",
+    "vetado totalmente",
+    "retirado pelo autor",
+    "perdeu a eficacia",
+    "prejudicada",
+)
+
+
+def _normalizar(texto: str | None) -> str:
+    """Minúsculas e sem acentos, para comparar descrições da API."""
+    if not texto:
+        return ""
+    sem_acento = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return sem_acento.lower().strip()
+
+
+def _situacao_final(descricao: str | None) -> bool:
+    return _normalizar(descricao).startswith(SITUACOES_FINAIS)
+
+
+def carregar_watermarks(db) -> dict[int, dict]:
+    """
+    Última tramitação salva de cada proposição, numa única query:
+    { proposicao_id: {"sequencia": int, "data_hora": datetime, "situacao": str} }
+    """
+    ultima = (
+        db.query(
+            Tramitacao.proposicao_id,
+            func.max(Tramitacao.sequencia).label("sequencia"),
+        )
+        .group_by(Tramitacao.proposicao_id)
+        .subquery()
+    )
+
+    rows = (
+        db.query(
+            Tramitacao.proposicao_id,
+            Tramitacao.sequencia,
+            Tramitacao.data_hora,
+            Tramitacao.descricao_situacao,
+        )
+        .join(
+            ultima,
+            (Tramitacao.proposicao_id == ultima.c.proposicao_id)
+            & (Tramitacao.sequencia == ultima.c.sequencia),
+        )
+        .all()
+    )
+
+    return {
+        r.proposicao_id: {
+            "sequencia": r.sequencia,
+            "data_hora": r.data_hora,
+            "situacao": r.descricao_situacao,
+        }
+        for r in rows
+    }
+
+
+def injest_tramitacoes(anos: list[int] | None = None, lote: int = 200, max_workers: int = 8):
+    """
+    Busca /proposicoes/{id}/tramitacoes em paralelo para as proposições ativas.
+
+    - Proposições cuja última situação é final (arquivada, virou norma...) são puladas.
+    - Para as demais, pedimos apenas a partir da data da última tramitação salva
+      (`dataInicio`) e inserimos só o que vem depois da maior `sequencia` conhecida.
+    - Re-execuções sem novidades fazem apenas requisições leves e nenhum insert.
+    """
+    with SessionLocal() as db:
+        logger.info("🔍 Carregando watermarks de tramitação...")
+        watermarks = carregar_watermarks(db)
+
+        query = db.query(Proposicao.id, Proposicao.id_camara)
+        if anos:
+            query = query.filter(Proposicao.ano.in_(anos))
+
+        ativas = [
+            (prop_id, id_camara)
+            for prop_id, id_camara in query.all()
+            if not _situacao_final(watermarks.get(prop_id, {}).get("situacao"))
+        ]
+        logger.info(f"📦 {len(ativas)} proposições ativas ({len(watermarks)} com histórico salvo).")
+
+        total_inseridas = 0
+
+        for i in range(0, len(ativas), lote):
+            bloco = ativas[i:i + lote]
+
+            requisicoes = {}
+            for prop_id, id_camara in bloco:
+                wm = watermarks.get(prop_id)
+                params = None
+                if wm and wm["data_hora"]:
+                    params = {"dataInicio": wm["data_hora"].date().isoformat()}
+                requisicoes[prop_id] = (f"/proposicoes/{id_camara}/tramitacoes", params)
+
+            rows = []
+            for prop_id, payload in camara_get_concorrente(requisicoes, max_workers=max_workers):
+                if not payload:
+                    continue
+
+                seq_max = watermarks.get(prop_id, {}).get("sequencia") or 0
+                rows.extend(
+                    tramitacao_para_row(prop_id, d)
+                    for d in payload.get("dados", [])
+                    if d.get("sequencia") is not None and d["sequencia"] > seq_max
+                )
+
+            try:
+                inseridas = inserir_tramitacoes(db, rows)
+                db.commit()
+            except Exception as e:
+                logger.error(f"❌ Erro ao salvar lote de tramitações: {e}")
+                db.rollback()
+                continue
+
+            total_inseridas += inseridas
+            logger.info(
+                f"✅ Lote {i // lote + 1}: {len(bloco)} proposições, {inseridas} novas tramitações."
+            )
+
+        logger.info(f"🏁 Tramitações concluídas: {total_inseridas} novas entradas.")
+
+
+if __name__ == "__main__":
+    injest_tramitacoes()
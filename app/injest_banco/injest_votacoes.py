@@ -4,7 +4,8 @@ from injest_banco.db.database import SessionLocal
 from injest_banco.db.models import Votacao, Evento
 from injest_banco.api_camara import (
     camara_get,
-    camara_paginado
+    camara_paginado,
+    buscar_votacao_votos
 )
 from injest_banco.db_upsert import (
     carregar_por_id_camara,
@@ -107,10 +108,10 @@ def injest_votacoes(dias_atras=15):
                 upsert_votacao_orientacoes(db, votacao_obj, orientacoes_payload)
 
                 # 7. Importar Votos Individuais 
-                # Mudança: Usamos camara_get porque este endpoint NÃO aceita parâmetros de paginação
+                # Este endpoint NÃO aceita parâmetros de paginação: lemos a página única em stream
                 logger.info(f"📥 Baixando votos da votação {id_votacao_api}...")
                 # No momento de baixar os votos
-                votos_payload = camara_get(f"/votacoes/{id_votacao_api}/votos")
+                votos_payload = {"dados": list(buscar_votacao_votos(id_votacao_api))}
 
                 if votos_payload and len(votos_payload.get("dados", [])) > 0:
                     # É NOMINAL - Processa normalmente
@@ -0,0 +1,53 @@
+"""
+Carga completa de `politico_votos_feed` a partir de votos × votações.
+
+No dia a dia a tabela é mantida na importação dos votos
+(db_upsert.inserir_feed_votacao); este script serve para o backfill inicial
+ou para reconstruir o feed do zero (ex: após correção de datas de votações).
+
+As linhas recriadas vêm com `fiel` NULL, então todas as votações voltam a
+`fidelidade_calculada` False na mesma transação e a próxima execução de
+injest_fidelidade regrava o feed.
+"""
+
+import logging
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from injest_banco.db.database import SessionLocal
+from injest_banco.db.models import PoliticoVotoFeed, Votacao, Voto
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reconstruir_feed_votos():
+    """
+    Reconstrói `politico_votos_feed` inteira numa única transação (INSERT ... SELECT)
+    e marca a fidelidade de todas as votações para recálculo.
+    """
+    with SessionLocal() as db:
+        logger.info("🗳️ Reconstruindo politico_votos_feed...")
+        try:
+            db.execute(delete(PoliticoVotoFeed))
+            db.execute(
+                insert(PoliticoVotoFeed).from_select(
+                    ["politico_id", "votacao_id", "data", "tipo_voto"],
+                    select(Voto.politico_id, Voto.votacao_id, Votacao.data, Voto.tipo_voto)
+                    .join(Votacao, Votacao.id == Voto.votacao_id),
+                )
+            )
+            db.execute(update(Votacao).values(fidelidade_calculada=False))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro ao reconstruir politico_votos_feed: {e}")
+            raise
+
+        total = db.query(func.count()).select_from(PoliticoVotoFeed).scalar()
+        logger.info(f"✅ politico_votos_feed reconstruída ({total} votos).")
+
+
+if __name__ == "__main__":
+    reconstruir_feed_votos()
@@ -15,13 +15,22 @@ logger = logging.getLogger(__name__)
 from injest_banco.backfill_politicos_detalhes import rodar_backfill_detalhes
 from injest_banco.backfill_votacoes_orfas import rodar_backfill_votacoes
 from injest_banco.injest_fotos import baixar_e_converter_fotos
-from injest_banco.injest_proposicoes import injest_proposicoes
+from injest_banco.injest_proposicoes import injest_proposicoes, injest_proposicoes_atualizadas
+from injest_banco.injest_tramitacoes import injest_tramitacoes
+from injest_banco.injest_temas import injest_temas
 from injest_banco.injest_partidos import injest_partidos
 from injest_banco.injest_camara import injest_politicos
 from injest_banco.injest_votacoes import injest_votacoes
+from injest_banco.injest_eventos import executar_pipeline_eventos
 from injest_banco.injest_despesas import injest_despesas
 from injest_banco.injest_presencas import injest_presencas_ano, injest_presencas_dia
 from injest_banco.injest_verba_gabinete import injest_verbas_gabinete
+from injest_banco.injest_fornecedores import atualizar_fornecedores
+from injest_banco.injest_performance import atualizar_performance
+from injest_banco.injest_discurso_keywords import atualizar_discurso_keywords
+from injest_banco.injest_fidelidade import atualizar_fidelidade
+from injest_banco.injest_matriz_votos import atualizar_matriz_votos
+from injest_banco.injest_analitico import exportar_analitico
 
 def executar_pipeline():
     logger.info("🚀 Iniciando Pipeline de Ingestão de Dados...")
@@ -58,14 +67,44 @@ def executar_pipeline():
         # 3. Proposições (Importante rodar antes das votações se quiser vincular contextos)
         logger.info("--- Passo 3: Proposições ---")
         injest_proposicoes(anos=[2025, 2026])
+        # Refresh: re-sincroniza autores, votações e tramitações das que tramitaram desde o último run
+        injest_proposicoes_atualizadas()
+
+        logger.info("--- Passo 3: Tramitações ---")
+        injest_tramitacoes()
+
+        logger.info("--- Passo 3: Temas ---")
+        injest_temas()
         
+        # 3. Eventos (índice, detalhes, participantes, pauta e votações) — retomável
+        logger.info("--- Passo 3: Eventos ---")
+        executar_pipeline_eventos(anos=4)
+
         # 3. Votações (Dependem dos Políticos)
         logger.info("--- Passo 3: Votações ---")
         injest_votacoes(dias_atras=365)  # Você pode ajustar o período conforme necessário
+        # Fidelidade partidária e coesão — só as votações novas/alteradas
+        atualizar_fidelidade()
+        # Matriz de votos em 2 bits (parlamentares similares) — só as votações novas
+        atualizar_matriz_votos()
         
         # 4. Despesas (Dependem dos Políticos)
         logger.info("--- Passo 4: Despesas ---")
         injest_despesas(anos=[2025, 2026])
+        # Fornecedor canônico das despesas novas + totais do ranking de empresas
+        atualizar_fornecedores()
+
+        # 5. Pós-processamento: score pré-calculado (depende de presenças, proposições e despesas)
+        logger.info("--- Passo 5: Performance ---")
+        atualizar_performance()
+
+        # 5. Pós-processamento: keywords dos discursos agregadas para o ranking
+        logger.info("--- Passo 5: Keywords dos discursos ---")
+        atualizar_discurso_keywords()
+
+        # 6. Snapshot analítico em Parquet (rankings via DuckDB, fora do Postgres) — por último
+        logger.info("--- Passo 6: Snapshot analítico ---")
+        exportar_analitico()
 
         logger.info("✨ Sincronização Completa com Sucesso!")
         